@@ -3,9 +3,9 @@ import json
 from contextlib import contextmanager
 from typing import Optional, Type
 
-from feeluown.consts import STATE_FILE
+from feeluown.consts import STATE_FILE, STANDBY_CACHE_FILE
 from feeluown.utils.request import Request
-from feeluown.library import Library
+from feeluown.library import Library, StandbyCache
 from feeluown.utils.dispatch import Signal
 from feeluown.library import (
     Resolver,
@@ -65,7 +65,9 @@ class App:
         self.task_mgr = TaskManager(self)
         # Library.
         self.library = Library(
-            config.PROVIDERS_STANDBY, config.ENABLE_AI_STANDBY_MATCHER
+            config.PROVIDERS_STANDBY,
+            config.ENABLE_AI_STANDBY_MATCHER,
+            config.STANDBY_TIMEOUT,
         )
         self.coll_mgr = CollectionManager(self)
         self.ai = None
@@ -103,6 +105,7 @@ class App:
             audio_device=bytes(config.MPV_AUDIO_DEVICE, "utf-8"),
             fade=config.PLAYBACK_CROSSFADE,
             fade_time_ms=config.PLAYBACK_CROSSFADE_DURATION,
+            fade_tracks=config.PLAYBACK_FADE_TRACKS,
         )
         # Theoretically, each caller maintain its own position delegate.
         # For simplicity, this delegate is created for common use cases and
@@ -112,7 +115,11 @@ class App:
         # in one second. Considering the use cases and performance, I guess 300ms is
         # a reasonable interval.
         self.player_pos_per300ms = PlayerPositionDelegate(self.player, interval=300)
-        self.playlist = Playlist(self, audio_select_policy=config.AUDIO_SELECT_POLICY)
+        self.playlist = Playlist(
+            self,
+            audio_select_policy=config.AUDIO_SELECT_POLICY,
+            standby_cache=StandbyCache(STANDBY_CACHE_FILE),
+        )
         self.live_lyric = LiveLyric(self)
         self.fm = FM(self)
         self.recently_played = RecentlyPlayed(self.playlist)
@@ -121,6 +128,7 @@ class App:
         self.player.set_playlist(self.playlist)
 
         self.about_to_shutdown.connect(lambda _: self.dump_and_save_state(), weak=False)
+        self.about_to_shutdown.connect(lambda _: self.request.close(), weak=False)
 
     def initialize(self):
         self.coll_mgr.scan()
@@ -121,6 +121,13 @@ def create_config() -> Config:
         default=None,
         desc="",
     )
+    # The deadline (in seconds) for finding a standby for a song.
+    config.deffield(
+        "STANDBY_TIMEOUT",
+        type_=float,
+        default=10.0,
+        desc="",
+    )
 
     # YTDL related fields are deprecated since v4.1.9. Disable them by default.
     config.deffield(
@@ -186,6 +193,26 @@ def create_config() -> Config:
         default=500,
         desc=t("playback-crossfade-desc"),
     )
+    config.deffield(
+        "PLAYBACK_FADE_TRACKS",
+        type_=bool,
+        default=False,
+        desc=t("playback-fade-tracks-desc"),
+    )
+    config.deffield(
+        "ENABLE_GAPLESS_PLAYBACK",
+        type_=bool,
+        default=False,
+        desc=t("enable-gapless-playback-desc"),
+    )
+    config.deffield(
+        "MEDIA_PREFETCH_COUNT",
+        type_=int,
+        # Each prefetched media costs some requests to the provider,
+        # so it is disabled by default.
+        default=0,
+        desc=t("media-prefetch-count-desc"),
+    )
     config.deffield(
         "OPENAI_API_BASEURL",
         type_=str,
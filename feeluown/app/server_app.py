@@ -28,15 +28,16 @@ class ServerApp(App):
         super().initialize()
         self.live_lyric.sentence_changed.connect(self._ll_publisher.publish)
 
+        # Only the latest message of a coalesced topic is useful for clients.
         signals = [
-            (self.player.metadata_changed, 'player.metadata_changed'),
-            (self.player.seeked, 'player.seeked'),
-            (self.player.state_changed, 'player.state_changed'),
-            (self.player.duration_changed, 'player.duration_changed'),
-            (self.live_lyric.sentence_changed, 'live_lyric.sentence_changed'),
+            (self.player.metadata_changed, 'player.metadata_changed', True),
+            (self.player.seeked, 'player.seeked', True),
+            (self.player.state_changed, 'player.state_changed', False),
+            (self.player.duration_changed, 'player.duration_changed', True),
+            (self.live_lyric.sentence_changed, 'live_lyric.sentence_changed', True),
         ]
-        for signal, name in signals:
-            self.pubsub_gateway.add_topic(name)
+        for signal, name, coalesce in signals:
+            self.pubsub_gateway.add_topic(name, coalesce=coalesce)
             signal.connect(self._signal_publish.on_emitted(name),
                            weak=False,
                            aioqueue=True)
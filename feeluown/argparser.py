@@ -127,6 +127,21 @@ def add_server_cmds(subparsers: argparse._SubParsersAction, include_pubsub=True)
         type=str,
         choices=["1.0", "2.0"],
     )
+    set_parser.add_argument(
+        "--ack-framing",
+        type=str,
+        choices=["length", "chunked"],
+    )
+    set_parser.add_argument(
+        "--pipeline",
+        type=str,
+        choices=["on", "off"],
+    )
+    set_parser.add_argument(
+        "--wire-format",
+        type=str,
+        choices=["text", "msgpack"],
+    )
 
     if include_pubsub is True:
         sub_parser = subparsers.add_parser(
@@ -15,4 +15,5 @@ COLLECTIONS_DIR = HOME_DIR + '/collections'
 
 LOG_FILE = HOME_DIR + '/stdout.log'
 STATE_FILE = os.path.join(DATA_DIR, 'state.json')
+STANDBY_CACHE_FILE = os.path.join(DATA_DIR, 'standby_cache.json')
 DEFAULT_RCFILE_PATH = os.path.expanduser(f'{USER_HOME}/.fuorc')
@@ -1,3 +1,4 @@
+import multiprocessing
 import os
 from feeluown.utils.patch import patch_janus, patch_qeventloop, patch_mutagen, \
     patch_pydantic
@@ -25,6 +26,9 @@ from .run_app import run_app  # noqa: E402
 def run():
     """feeluown entry point.
     """
+    # The local provider may parse files in a process pool. When the app is
+    # frozen (by pyinstaller), a child process should not run the app.
+    multiprocessing.freeze_support()
 
     args = create_cli_parser().parse_args()
 
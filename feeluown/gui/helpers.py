@@ -58,6 +58,7 @@ from feeluown.library import (
 from feeluown.library import reverse
 from feeluown.media import Media, MediaType
 from feeluown.gui.consts import FontFamilies
+from feeluown.gui.image import ImgPriority
 
 
 if TYPE_CHECKING:
@@ -209,6 +210,9 @@ class BaseScrollAreaForNoScrollItemView(QScrollArea):
                 model.fetchMore(QModelIndex())
 
     def on_v_scrollbar_value_changed(self, value):
+        itemview = self.get_itemview()
+        if isinstance(itemview, ItemViewNoScrollMixin):
+            itemview.on_viewport_changed()
         maximum = self.verticalScrollBar().maximum()
         if maximum == value:
             self.maybe_trigger_itemview_fetch_more()
@@ -339,6 +343,15 @@ class ItemViewNoScrollMixin:
         if self._no_scroll_v is True:
             self.adjust_height()
 
+    def on_viewport_changed(self):
+        """Called when the visible part of the itemview is changed.
+
+        With no_scroll_v=True, the outside scroll area should call this
+        when it is scrolled.
+
+        .. versionadded:: 5.2
+        """
+
     def setModel(self, model):
         super().setModel(model)  # type: ignore[misc]
         if model is None:
@@ -556,9 +569,9 @@ def fetch_cover_wrapper(app: GuiApp):
     async def fetch_image_with_cb(img_uid, img_media: Optional[Media], cb):
         # Fetch image media and invoke cb.
         if img_media:
-            # FIXME: sleep random second to avoid send too many request to provider
-            await asyncio.sleep(random.randrange(100) / 100)
-            content = await img_mgr.get(img_media, img_uid)
+            # Images in a list have lower priority than the standalone ones,
+            # and img_mgr limits the number of concurrent downloads.
+            content = await img_mgr.get(img_media, img_uid, priority=ImgPriority.normal)
             cb(content)
         else:
             cb(None)
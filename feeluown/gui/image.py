@@ -1,11 +1,16 @@
 import asyncio
+import itertools
 import logging
 import os
+import re
 import tempfile
-import time
+import threading
 import uuid
-from functools import partial
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from enum import IntEnum
 from hashlib import md5
+from typing import Dict, List, Optional
 
 from PyQt6.QtCore import QUrl
 from PyQt6.QtGui import QDesktopServices, QImage
@@ -17,24 +22,57 @@ from feeluown.media import Media
 logger = logging.getLogger(__name__)
 
 
+class ImgPriority(IntEnum):
+    """Priority of image downloading, the smaller one is downloaded earlier."""
+
+    #: The image is shown alone and it is visible, such as the cover in
+    #: the player bar.
+    high = 0
+    #: The image is one of many images in a list.
+    normal = 10
+
+
+class _DownloadJob:
+    def __init__(self, hname, img_url, img_name, http_headers, proxies, future):
+        self.hname = hname
+        self.img_url = img_url
+        self.img_name = img_name
+        self.http_headers = http_headers
+        self.proxies = proxies
+        self.future = future
+        self.started = False
+        self.waiters = 0
+
+
 class ImgManager(object):
     """Image downloading and cache management
 
+    Images are downloaded by a few worker coroutines in priority order, with
+    a dedicated thread pool so that downloading images does not starve the
+    default executor. Concurrent requests for the same image share one
+    download. A download is dropped when all its waiters are cancelled
+    before it starts.
+
     TOOD: The related logic in this module needs to be reorganized
     """
 
+    MAX_WORKERS = 6
+
     def __init__(self, app):
         super().__init__()
         self._app = app
         self.cache = _ImgCache(self._app)
 
+        self._jobs: Dict[str, _DownloadJob] = {}  # {hname: job}
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._workers: List[asyncio.Task] = []
+        self._job_counter = itertools.count()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.MAX_WORKERS, thread_name_prefix="img_mgr"
+        )
+
     def get_from_cache(self, img_name):
-        fpath = self.cache.get(img_name)
-        if fpath is not None:
-            with open(fpath, "rb") as f:
-                content = f.read()
-            return content
-        return None
+        return self.cache.read(img_name)
 
     @staticmethod
     def _build_proxies(http_proxy):
@@ -45,7 +83,7 @@ class ImgManager(object):
             "https": http_proxy,
         }
 
-    async def get(self, img, img_name):
+    async def get(self, img, img_name, priority=ImgPriority.high):
         if isinstance(img, Media):
             img_url = img.url
             http_headers = img.http_headers
@@ -65,32 +103,71 @@ class ImgManager(object):
             if provider is None:
                 return None
             return provider.handle_with_path(img_url[11:])
-        fpath = self.cache.get(img_name)
-        if fpath is not None:
-            with open(fpath, "rb") as f:
-                content = f.read()
+        content = self.cache.read(img_name)
+        if content is not None:
             self.cache.update(img_name)
             return content
-        event_loop = asyncio.get_event_loop()
+
+        hname = self.cache.hash(img_name)
+        job = self._jobs.get(hname)
+        if job is None:
+            future = asyncio.get_running_loop().create_future()
+            proxies = self._build_proxies(http_proxy)
+            job = _DownloadJob(hname, img_url, img_name, http_headers, proxies, future)
+            self._jobs[hname] = job
+        # A job may be put into queue multiple times with different priorities,
+        # workers ignore the job once it is started.
+        self._get_queue().put_nowait((priority, next(self._job_counter), job))
+        job.waiters += 1
+        try:
+            return await asyncio.shield(job.future)
+        finally:
+            job.waiters -= 1
+            if job.waiters == 0 and not job.started:
+                job.future.cancel()
+                self._jobs.pop(hname, None)
+
+    def _get_queue(self) -> asyncio.PriorityQueue:
+        if self._queue is None:
+            self._queue = asyncio.PriorityQueue()
+            for _ in range(self.MAX_WORKERS):
+                self._workers.append(asyncio.create_task(self._worker(self._queue)))
+        return self._queue
+
+    async def _worker(self, queue):
+        loop = asyncio.get_running_loop()
+        while True:
+            _, _, job = await queue.get()
+            if job.started or job.future.done():
+                continue
+            job.started = True
+            try:
+                content = await loop.run_in_executor(
+                    self._executor, self._download, job
+                )
+            except Exception:
+                content = None
+                logger.exception(f"Download image failed, url:{job.img_url}")
+            if self._jobs.get(job.hname) is job:
+                self._jobs.pop(job.hname)
+            if not job.future.done():
+                job.future.set_result(content)
+
+    def _download(self, job: _DownloadJob) -> Optional[bytes]:
+        """Download the image and save it into cache, it runs in a worker thread."""
         try:
             # May return None.
-            proxies = self._build_proxies(http_proxy)
-            res = await event_loop.run_in_executor(
-                None,
-                partial(
-                    self._app.request.get,
-                    img_url,
-                    headers=http_headers,
-                    proxies=proxies,
-                ),
+            res = self._app.request.get(
+                job.img_url, headers=job.http_headers, proxies=job.proxies
             )
         except:  # noqa
             res = None
-            logger.error(f"Download image failed, url:{img_url}")
+            logger.error(f"Download image failed, url:{job.img_url}")
         if res is None:
-            return
-        fpath = self.cache.create(img_name)
-        self.save(fpath, res.content)
+            return None
+        fpath = self.cache.create(job.img_name)
+        if self.save(fpath, res.content):
+            self.cache.add(job.img_name, res.content)
         return res.content
 
     def get_from_files(self, img_url, img_name) -> bytes:
@@ -117,67 +194,194 @@ class ImgManager(object):
             raise Exception("Unsupported file type")
         return content
 
-    def save(self, fpath, content):
+    def save(self, fpath, content) -> bool:
         try:
             with open(fpath, "wb") as f:
                 f.write(content)
         except Exception:
             logger.exception("save image file failed")
+            return False
+        return True
 
 
 class _ImgCache(object):
     """Save img in cache dir.
 
-    Each image is saved with a hash ``name``, which contain img last used
-    timestamp.
+    Each image is saved with a hash ``name``. Files saved by old versions
+    have a ``-{timestamp}`` suffix, and they are still recognized.
+
+    The index of cached files is loaded once when the cache is used at the
+    first time, so that a lookup does not list the cache dir. Files are
+    evicted in LRU order when the total number or the total size exceeds the
+    limit. Content of recently used images is also kept in memory.
     """
 
-    MAX_TOTAL_NUMBER = 100
+    MAX_TOTAL_NUMBER = 2000
+    MAX_TOTAL_SIZE = 200 * 1024 * 1024
+    MAX_MEMORY_SIZE = 32 * 1024 * 1024
 
-    def __init__(self, app):
+    _fname_pattern = re.compile(r"^([0-9a-f]{32})(-\d+)?$")
+
+    def __init__(self, app, cache_dir=CACHE_DIR):
         super().__init__()
 
         self._app = app
+        self._cache_dir = cache_dir
+        self._lock = threading.RLock()
+        # {hname: (fname, size)}, ordered from least to most recently used.
+        self._index: Optional[OrderedDict] = None
+        self._total_size = 0
+        # {hname: content}, ordered from least to most recently used.
+        self._memory: OrderedDict = OrderedDict()
+        self._memory_size = 0
 
-    def _hash(self, img_name):
+    def hash(self, img_name):
         pure_url = img_name.split("?")[0]
         return md5(pure_url.encode("utf-8")).hexdigest()
 
-    def _gen_fname(self, hname):
-        ts_str = str(int(time.time()))
-        return hname + "-" + ts_str
+    def _load_index(self):
+        entries = []
+        try:
+            with os.scandir(self._cache_dir) as it:
+                for entry in it:
+                    m = self._fname_pattern.match(entry.name)
+                    if m is None or not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, m.group(1), entry.name, stat.st_size))
+        except FileNotFoundError:
+            pass
+        except OSError:
+            logger.exception("load img cache index failed")
+        entries.sort()
+        self._index = OrderedDict()
+        self._total_size = 0
+        for _, hname, fname, size in entries:
+            if hname in self._index:  # Duplicate file of old versions.
+                # Keep the newer file and remove the older one.
+                old_fname, old_size = self._index.pop(hname)
+                self._remove_file(old_fname)
+                self._total_size -= old_size
+            self._index[hname] = (fname, size)
+            self._total_size += size
+        self._evict()
+
+    def _get_index(self) -> OrderedDict:
+        if self._index is None:
+            self._load_index()
+        assert self._index is not None
+        return self._index
 
     def create(self, img_name):
-        """return img file path"""
-        hname = self._hash(img_name)
-        fname = self._gen_fname(hname)
+        """return img file path
+
+        Call :meth:`add` after the content is written to the file.
+        """
         logger.debug("create img cache for %s" % img_name)
-        return self._get_path(fname)
+        return self._get_path(self.hash(img_name))
+
+    def add(self, img_name, content):
+        """add the content, which is already written to the file, to cache"""
+        hname = self.hash(img_name)
+        with self._lock:
+            index = self._get_index()
+            if hname in index:
+                self._total_size -= index.pop(hname)[1]
+            index[hname] = (hname, len(content))
+            self._total_size += len(content)
+            self._put_memory(hname, content)
+            self._evict()
 
     def update(self, img_name):
-        hname = self._hash(img_name)
-        new_fname = self._gen_fname(hname)
-        new_fpath = self._get_path(new_fname)
-        old_fpath = self.get(img_name)
-        os.rename(old_fpath, new_fpath)
+        """mark the img as recently used"""
+        hname = self.hash(img_name)
+        with self._lock:
+            index = self._get_index()
+            if hname in index:
+                index.move_to_end(hname)
+                fpath = self._get_path(index[hname][0])
+                try:
+                    # Keep the LRU order across restarts.
+                    os.utime(fpath)
+                except OSError:
+                    pass
         logger.debug("update img cache for %s" % img_name)
 
     def get(self, img_name):
-        hname = self._hash(img_name)
-        for fname in os.listdir(CACHE_DIR):
-            if fname.startswith(hname):
-                logger.debug("get img cache for %s" % img_name)
-                return self._get_path(fname)
+        hname = self.hash(img_name)
+        with self._lock:
+            item = self._get_index().get(hname)
+        if item is not None:
+            logger.debug("get img cache for %s" % img_name)
+            return self._get_path(item[0])
         return None
 
-    def delete(self, img_name):
+    def read(self, img_name) -> Optional[bytes]:
+        """return the img content, None if it is not cached"""
+        hname = self.hash(img_name)
+        with self._lock:
+            content = self._memory.get(hname)
+            if content is not None:
+                self._memory.move_to_end(hname)
+                return content
         fpath = self.get(img_name)
-        if fpath is not None:
-            return os.remove(fpath)
+        if fpath is None:
+            return None
+        try:
+            with open(fpath, "rb") as f:
+                content = f.read()
+        except OSError:
+            logger.warning(f"read img cache failed: {fpath}")
+            with self._lock:
+                self._drop(hname)
+            return None
+        with self._lock:
+            self._put_memory(hname, content)
+        return content
+
+    def delete(self, img_name):
+        hname = self.hash(img_name)
+        with self._lock:
+            if hname in self._get_index():
+                self._drop(hname)
+                return True
         return False
 
+    def _put_memory(self, hname, content):
+        if len(content) > self.MAX_MEMORY_SIZE // 8:
+            return
+        old = self._memory.pop(hname, None)
+        if old is not None:
+            self._memory_size -= len(old)
+        self._memory[hname] = content
+        self._memory_size += len(content)
+        while self._memory_size > self.MAX_MEMORY_SIZE:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted)
+
+    def _drop(self, hname):
+        fname, size = self._get_index().pop(hname)
+        self._total_size -= size
+        content = self._memory.pop(hname, None)
+        if content is not None:
+            self._memory_size -= len(content)
+        self._remove_file(fname)
+
+    def _evict(self):
+        index = self._get_index()
+        while index and (
+            len(index) > self.MAX_TOTAL_NUMBER or self._total_size > self.MAX_TOTAL_SIZE
+        ):
+            self._drop(next(iter(index)))
+
+    def _remove_file(self, fname):
+        try:
+            os.remove(self._get_path(fname))
+        except OSError:
+            pass
+
     def _get_path(self, fname):
-        return os.path.join(CACHE_DIR, fname)
+        return os.path.join(self._cache_dir, fname)
 
 
 def open_image(img: QImage):
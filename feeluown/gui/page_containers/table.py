@@ -153,7 +153,8 @@ class Renderer:
         .. versionadded: v3.8.5
            The *hide_columns* parameter.
         """
-        reader = wrap(reader)
+        # The songs table reads songs page by page when it is scrolled.
+        reader = wrap(reader, paged=True)
         if show_count:
             count = reader.count
             self.meta_widget.songs_count = -1 if count is None else count
@@ -377,6 +378,14 @@ class TableContainer(QFrame, BgTransparentMixin):
         if self._extra is not None:
             self._layout.insertWidget(1, self._extra)
 
+    @property
+    def renderer(self):
+        """current renderer, return None if no renderer is set
+
+        .. versionadded:: 5.2
+        """
+        return self._renderer
+
     @property
     def current_table(self):
         """current visible table, if no table is visible, return None"""
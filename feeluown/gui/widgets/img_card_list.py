@@ -10,10 +10,12 @@ resized, the cover width and the margin should make a few adjustment.
 """
 
 # pylint: disable=unused-argument
+import asyncio
 import logging
 import random
+from collections import OrderedDict
 from datetime import date
-from typing import TypeVar, Optional, List, cast, Union, TYPE_CHECKING
+from typing import TypeVar, Optional, List, Dict, cast, Union, TYPE_CHECKING
 
 from PyQt6.QtCore import (
     QAbstractListModel,
@@ -25,10 +27,14 @@ from PyQt6.QtCore import (
     QRect,
     QSize,
     QSortFilterProxyModel,
+    QByteArray,
+    QBuffer,
+    QTimer,
     pyqtSignal,
 )
 from PyQt6.QtGui import (
     QImage,
+    QImageReader,
     QColor,
     QResizeEvent,
     QGuiApplication,
@@ -82,6 +88,9 @@ COLORS = {
 
 
 class ImgCardListModel(QAbstractListModel, ReaderFetchMoreMixin[T]):
+    #: Max number of decoded images kept in memory.
+    MAX_CACHED_IMAGES = 200
+
     def __init__(self, reader, fetch_image, source_name_map=None, parent=None):
         """
 
@@ -101,7 +110,16 @@ class ImgCardListModel(QAbstractListModel, ReaderFetchMoreMixin[T]):
         self.source_name_map = source_name_map or {}
         self.fetch_image = fetch_image
         self.colors = []
-        self.images = {}  # {uri: QImage}
+        # Decoded images, ordered from least to most recently used. Images which
+        # are evicted are decoded again (from the image cache) when needed.
+        self.images: OrderedDict = OrderedDict()  # {uri: QImage}
+        self._no_image_uris = set()  # Items which have no image.
+        # Images which are scaled to a smaller size than the current one.
+        self._stale_image_uris = set()
+        self._image_tasks: Dict[str, asyncio.Task] = {}  # {uri: task}
+        #: Images are scaled to this size (in device pixels) after decoding.
+        self._image_size: Optional[QSize] = None
+        self._rows: Dict[str, int] = {}  # {uri: row}
 
     @classmethod
     def create(cls, reader, app: "GuiApp"):
@@ -116,15 +134,29 @@ class ImgCardListModel(QAbstractListModel, ReaderFetchMoreMixin[T]):
 
         .. versionadded: 5.0
         """
-        try:
-            row = self._items.index(item)
-        except IndexError:
+        uri = reverse(item)
+        row = self._rows.get(uri)
+        if row is None:
             return
-        else:
-            self.beginRemoveRows(QModelIndex(), row, row)
-            self._items.remove(item)
-            self._deleted_items.append(item)
-            self.endRemoveRows()
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self._items.pop(row)
+        self.colors.pop(row)
+        self._deleted_items.append(item)
+        self.images.pop(uri, None)
+        self._stale_image_uris.discard(uri)
+        self._shift_rows(uri, row)
+        self.endRemoveRows()
+
+    def _shift_rows(self, uri, removed_row):
+        """Update the rows of the items after the removed one."""
+        self._rows.pop(uri)
+        for row in range(removed_row, len(self._items)):
+            item_uri = reverse(self._items[row])
+            # The row of an uri is the row of its first item, so only the
+            # first items are moved up, and the removed uri maps to its
+            # next duplicate if there is one.
+            if self._rows.get(item_uri, row + 1) == row + 1:
+                self._rows[item_uri] = row
 
     def can_fetch_more(self, _=None):
         """
@@ -154,21 +186,92 @@ class ImgCardListModel(QAbstractListModel, ReaderFetchMoreMixin[T]):
         items_len = len(items)
         colors = [random.choice(list(COLORS.values())) for _ in range(0, items_len)]
         self.colors.extend(colors)
+        start = len(self._items)
         self.on_items_fetched(items)
-        for item in items:
-            aio.create_task(self.fetch_image(item, self._fetch_image_callback(item)))
+        for row, item in enumerate(items, start=start):
+            uri = reverse(item)
+            self._rows.setdefault(uri, row)
+            self._fetch_image(item, uri)
+
+    def _fetch_image(self, item, uri):
+        if uri in self._image_tasks:
+            return
+        task = aio.create_task(self.fetch_image(item, self._fetch_image_callback(item)))
+        self._image_tasks[uri] = task
+        task.add_done_callback(lambda _, uri=uri: self._image_tasks.pop(uri, None))
+
+    def set_image_size(self, size: Optional[QSize]):
+        """Set the size (in device pixels) of images to be drawn.
+
+        Images are scaled to the size once they are decoded, so that painting
+        does not need to scale a full-size image. When the size grows, images
+        are decoded again when they are needed.
+
+        .. versionadded:: 5.2
+        """
+        if size is not None and size.isEmpty():
+            size = None
+        old_size = self._image_size
+        self._image_size = size
+        if old_size is None or (
+            size is not None
+            and (size.width() > old_size.width() or size.height() > old_size.height())
+        ):
+            self._stale_image_uris = set(self.images)
+
+    def _decode_image(self, content) -> QImage:
+        buffer = QBuffer()
+        buffer.setData(QByteArray(content))
+        reader = QImageReader(buffer)
+        size = self._image_size
+        origin_size = reader.size()
+        if size is not None and origin_size.isValid():
+            # Keep the aspect ratio and cover the target size, this lets the
+            # decoder (for example, jpeg) decode the image at a lower resolution.
+            scaled = origin_size.scaled(
+                size, Qt.AspectRatioMode.KeepAspectRatioByExpanding
+            )
+            if scaled.width() < origin_size.width():
+                reader.setScaledSize(scaled)
+        return reader.read()
+
+    def _cache_image(self, uri, img):
+        self._stale_image_uris.discard(uri)
+        self.images[uri] = img
+        self.images.move_to_end(uri)
+        while len(self.images) > self.MAX_CACHED_IMAGES:
+            self.images.popitem(last=False)
+
+    def cancel_fetching_images(self, rows=None):
+        """Cancel image fetching tasks which are not finished.
+
+        The model should call this when it is not shown anymore, so that
+        the downloads which are not started are dropped. When `rows` is
+        given, only the tasks of these rows are cancelled.
+        """
+        for uri, task in list(self._image_tasks.items()):
+            if rows is None or self._rows.get(uri) in rows:
+                task.cancel()
+                self._image_tasks.pop(uri, None)
+
+    def fetching_image_rows(self):
+        """Rows whose images are being fetched.
+
+        .. versionadded:: 5.2
+        """
+        return {self._rows[uri] for uri in self._image_tasks if uri in self._rows}
 
     def _fetch_image_callback(self, item):
         def cb(content):
             uri = reverse(item)
             if content is None:
-                self.images[uri] = None
+                self._no_image_uris.add(uri)
                 return
 
-            img = QImage()
-            img.loadFromData(content)
-            self.images[uri] = img
-            row = self._items.index(item)
+            self._cache_image(uri, self._decode_image(content))
+            row = self._rows.get(uri)
+            if row is None:  # The item is removed.
+                return
             top_left = self.createIndex(row, 0)
             bottom_right = self.createIndex(row, 0)
             self.dataChanged.emit(top_left, bottom_right)
@@ -184,7 +287,15 @@ class ImgCardListModel(QAbstractListModel, ReaderFetchMoreMixin[T]):
             uri = reverse(item)
             image = self.images.get(uri)
             if image is not None:
+                self.images.move_to_end(uri)
+                if uri in self._stale_image_uris:
+                    # Show the stale image until the new one is decoded.
+                    self._stale_image_uris.discard(uri)
+                    self._fetch_image(item, uri)
                 return image
+            if uri not in self._no_image_uris:
+                # The image was evicted, decode it again.
+                self._fetch_image(item, uri)
             color_str = self.colors[offset]
             color = QColor(color_str)
             color.setAlphaF(0.8)
@@ -318,15 +429,21 @@ class ImgCardListDelegate(QAbstractItemDelegate):
                 # Fall back to a flat fill when the image is invalid or height is zero.
                 brush = QBrush(border_color)
             else:
+                target_w = int(draw_width * self._device_pixel_ratio)
+                target_h = int(height * self._device_pixel_ratio)
                 if img_w / img_h > draw_width / height:
-                    img = obj.scaledToHeight(
-                        int(height * self._device_pixel_ratio),
-                        Qt.TransformationMode.SmoothTransformation,
-                    )
+                    # The model usually scales the image to the size already.
+                    if img_h == target_h:
+                        img = QImage(obj)
+                    else:
+                        img = obj.scaledToHeight(
+                            target_h, Qt.TransformationMode.SmoothTransformation
+                        )
+                elif img_w == target_w:
+                    img = QImage(obj)
                 else:
                     img = obj.scaledToWidth(
-                        int(draw_width * self._device_pixel_ratio),
-                        Qt.TransformationMode.SmoothTransformation,
+                        target_w, Qt.TransformationMode.SmoothTransformation
                     )
                 img.setDevicePixelRatio(self._device_pixel_ratio)
                 brush = QBrush(img)
@@ -405,6 +522,16 @@ class ImgCardListDelegate(QAbstractItemDelegate):
         self._card_width = (width + card_spacing) // count - card_spacing
         self._card_height = int(self._card_width / self.w_h_ratio) + self.text_height
         self.view.set_row_height(self._card_height + self.v_spacing)
+        model = self.view._source_model()
+        if model is not None:
+            model.set_image_size(self.image_size())
+
+    def image_size(self) -> QSize:
+        """Size of the card image, in device pixels."""
+        return QSize(
+            int(self._card_width * self._device_pixel_ratio),
+            int(self._card_width / self.w_h_ratio * self._device_pixel_ratio),
+        )
 
     def column_count(self):
         return (self._view_width + self.card_spacing) // (
@@ -500,12 +627,71 @@ class ImgCardListView(ItemViewNoScrollMixin, QListView):
         # Text for the remove action in context menu. Subclasses can override.
         self.enable_remove_action = False
 
+        # Pending images of the rows which are scrolled out are cancelled after
+        # scrolling stops, and they are fetched again when they are painted.
+        self._viewport_changed_timer = QTimer(self)
+        self._viewport_changed_timer.setSingleShot(True)
+        self._viewport_changed_timer.setInterval(100)
+        self._viewport_changed_timer.timeout.connect(
+            self.cancel_invisible_image_fetching)
+        self.verticalScrollBar().valueChanged.connect(self.on_viewport_changed)
+
+        # The model is kept in a python attribute, since the C++ object is
+        # already destroyed when the `destroyed` signal is emitted.
+        self._img_model: Optional[ImgCardListModel] = None
+        self.destroyed.connect(lambda *_: self._cancel_model_fetching_images())
+
     def on_activated(self, _: QModelIndex):
         """
         Subclass can implement this method if needed.
         """
         pass
 
+    def _source_model(self) -> Optional[ImgCardListModel]:
+        model = self.model()
+        if isinstance(model, QSortFilterProxyModel):
+            model = model.sourceModel()
+        if isinstance(model, ImgCardListModel):
+            return model
+        return None
+
+    def setModel(self, model):
+        # Images of the old model are not needed anymore.
+        self._cancel_model_fetching_images()
+        super().setModel(model)
+        self._img_model = new_model = self._source_model()
+        if new_model is not None:
+            delegate = self.itemDelegate()
+            if isinstance(delegate, ImgCardListDelegate):
+                new_model.set_image_size(delegate.image_size())
+
+    def _cancel_model_fetching_images(self):
+        if self._img_model is not None:
+            self._img_model.cancel_fetching_images()
+
+    def on_viewport_changed(self):
+        self._viewport_changed_timer.start()
+
+    def cancel_invisible_image_fetching(self):
+        """Cancel the pending images of the rows which are not visible.
+
+        .. versionadded:: 5.2
+        """
+        model = self._source_model()
+        if model is None:
+            return
+        proxy_model = self.model()
+        visible_rect = self.viewport().visibleRegion().boundingRect()
+        invisible_rows = set()
+        for row in model.fetching_image_rows():
+            index = model.index(row)
+            if proxy_model is not model:
+                index = proxy_model.mapFromSource(index)
+            if not (index.isValid() and self.visualRect(index).intersects(visible_rect)):
+                invisible_rows.add(row)
+        if invisible_rows:
+            model.cancel_fetching_images(invisible_rows)
+
     def contextMenuEvent(self, event):
         """Generic context menu that provides a remove action when available.
 
@@ -1,4 +1,5 @@
 import logging
+import re
 
 from enum import IntEnum, Enum
 from functools import partial
@@ -16,6 +17,7 @@ from PyQt6.QtCore import (
     QPoint,
     QPointF,
     QSortFilterProxyModel,
+    QTimer,
 )
 from PyQt6.QtGui import QPainter, QPalette, QMouseEvent, QPolygonF, QAction
 from PyQt6.QtWidgets import (
@@ -36,6 +38,12 @@ from PyQt6.QtWidgets import (
 from feeluown.i18n import t
 from feeluown.utils import aio
 from feeluown.utils.dispatch import Signal
+from feeluown.utils.lang import (
+    can_convert_chinese,
+    convert_chinese,
+    can_convert_pinyin,
+    convert_pinyin,
+)
 from feeluown.library import ModelState, ModelFlags, MediaFlags
 
 from feeluown.gui.mimedata import ModelMimeData
@@ -406,32 +414,197 @@ class SongsTableModel(BaseSongsTableModel, ReaderFetchMoreMixin):
     def reader(self):
         return self._reader
 
+    def replace_reader(self, reader, removed=()):
+        """Remove rows of the removed songs and read more rows from a new reader.
+
+        The songs of the new reader should be the songs of the old reader
+        without the removed ones, and followed by new songs, so that the rows
+        are kept. Return False when rows are being fetched from the old reader,
+        the caller should create a new model in this case.
+
+        .. versionadded:: 5.2
+        """
+        if self._is_fetching:
+            return False
+        fully_fetched = not self.can_fetch_more()
+        removed_ids = {song.identifier for song in removed}
+        for row in reversed(range(len(self._items))):
+            if self._items[row].identifier in removed_ids:
+                self.removeRows(row, 1)
+        self._reader = reader
+        # The view fetches more rows only when it is scrolled.
+        if fully_fetched and self.can_fetch_more():
+            self._is_fetching = True
+            self.fetch_more_impl()
+        return True
+
+
+# Punctuations are kept, so that "c++" does not match any text with a "c".
+_FILTER_IGNORED_CHARS = re.compile(r"\s+")
+
 
 class SongFilterProxyModel(QSortFilterProxyModel):
+    """Filter songs by text.
+
+    A normalized search key (lower case, simplified chinese, without spaces,
+    plus pinyin when pypinyin is installed) is computed for each
+    source row when the row is inserted, so filtering does not go through
+    the `data` method of the source model.
+
+    When the text is extended, only the rows accepted by the previous text are
+    checked. Filtering is debounced so that it does not run on every keystroke.
+    """
+
+    #: Filter the rows when the text is not changed for this many milliseconds.
+    FILTER_DEBOUNCE_MS = 150
+
     def __init__(self, parent=None, text=""):
         super().__init__(parent)
 
+        self._cn_convert_enabled = can_convert_chinese()
+        self._pinyin_enabled = can_convert_pinyin()
         self.text = text
+        self._pattern = self._normalize(text)
+        # Search keys of source rows, None means the keys are not computed.
+        self._keys = None
+        # Source rows accepted by the current pattern, None means it is unknown.
+        self._accepted_rows = None
+        # When it is not None, rows not in it are rejected without checking.
+        self._narrow_rows = None
+
+        self._pending_text = None
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(self.FILTER_DEBOUNCE_MS)
+        self._filter_timer.timeout.connect(self._apply_pending_text)
+
+    def setSourceModel(self, model):
+        old_model = self.sourceModel()
+        if old_model is not None:
+            for signal, slot in self._source_signal_slots(old_model):
+                signal.disconnect(slot)
+        self._keys = self._accepted_rows = None
+        # Connect before the proxy does, so that keys are updated before the
+        # proxy filters the inserted rows.
+        if model is not None:
+            for signal, slot in self._source_signal_slots(model):
+                signal.connect(slot)
+        super().setSourceModel(model)
+
+    def _source_signal_slots(self, model):
+        return [
+            (model.rowsInserted, self._on_source_rows_inserted),
+            (model.rowsRemoved, self._on_source_rows_removed),
+            (model.dataChanged, self._on_source_data_changed),
+            (model.modelReset, self._on_source_layout_changed),
+            (model.layoutChanged, self._on_source_layout_changed),
+        ]
 
     def filter_by_text(self, text):
+        """Filter the songs after a short delay.
+
+        .. versionchanged:: 5.2
+           The songs are filtered after a short delay.
+        """
         # if text is an empty string or None, we show all songs
-        self.text = text or ""
-        self.invalidateFilter()
+        text = text or ""
+        if not text:
+            # Show all songs immediately.
+            self._filter_timer.stop()
+            self._pending_text = None
+            self.set_filter_text(text)
+            return
+        self._pending_text = text
+        self._filter_timer.start()
+
+    def _apply_pending_text(self):
+        if self._pending_text is not None:
+            text, self._pending_text = self._pending_text, None
+            self.set_filter_text(text)
+
+    def set_filter_text(self, text):
+        """Filter the songs immediately.
+
+        .. versionadded:: 5.2
+        """
+        pattern = self._normalize(text)
+        self.text = text
+        if pattern == self._pattern:
+            return
+        # A row which matches the new pattern must match the old one.
+        if self._pattern and self._pattern in pattern:
+            self._narrow_rows = self._accepted_rows
+        self._pattern = pattern
+        self._accepted_rows = set()
+        try:
+            self.invalidateFilter()
+        finally:
+            self._narrow_rows = None
 
     def filterAcceptsRow(self, source_row, source_parent):
-        if not self.text:
+        if not self._pattern:
             return super().filterAcceptsRow(source_row, source_parent)
-
+        if self._narrow_rows is not None and source_row not in self._narrow_rows:
+            return False
+        accepted = self._pattern in self._get_key(source_row)
+        if accepted and self._accepted_rows is not None:
+            self._accepted_rows.add(source_row)
+        return accepted
+
+    def _normalize(self, text):
+        text = text.lower()
+        if self._cn_convert_enabled:
+            text = convert_chinese(text, "cn")
+        return _FILTER_IGNORED_CHARS.sub("", text)
+
+    def _compute_key(self, source_row):
         source_model = self.sourceModel()
-        index = source_model.index(source_row, Column.song, parent=source_parent)
+        index = source_model.index(source_row, Column.song)
         song = index.data(Qt.ItemDataRole.UserRole)
-        text = self.text.lower()
-        ctx = (
-            song.title_display.lower()
-            + song.album_name_display.lower()
-            + song.artists_name_display.lower()
-        )
-        return text in ctx
+        fields = [
+            self._normalize(song.title_display),
+            self._normalize(song.album_name_display),
+            self._normalize(song.artists_name_display),
+        ]
+        if self._pinyin_enabled:
+            for field in fields[:]:
+                if not field.isascii():
+                    fields.extend(convert_pinyin(field))
+        # Fields are separated, so the pattern never matches across fields.
+        return "\n".join(fields)
+
+    def _get_key(self, source_row):
+        if self._keys is None:
+            self._keys = [
+                self._compute_key(row) for row in range(self.sourceModel().rowCount())
+            ]
+        if source_row >= len(self._keys):  # This should not happen.
+            return self._compute_key(source_row)
+        return self._keys[source_row]
+
+    def _on_source_rows_inserted(self, parent, first, last):
+        if self._keys is not None:
+            self._keys[first:first] = [
+                self._compute_key(row) for row in range(first, last + 1)
+            ]
+        # Rows after the inserted ones are shifted.
+        if last < self.sourceModel().rowCount() - 1:
+            self._accepted_rows = None
+
+    def _on_source_rows_removed(self, parent, first, last):
+        if self._keys is not None:
+            del self._keys[first:last + 1]
+        self._accepted_rows = None
+
+    def _on_source_data_changed(self, top_left, bottom_right, *_):
+        if self._keys is not None:
+            for row in range(top_left.row(), bottom_right.row() + 1):
+                if row < len(self._keys):
+                    self._keys[row] = self._compute_key(row)
+        self._accepted_rows = None
+
+    def _on_source_layout_changed(self, *_):
+        self._keys = self._accepted_rows = None
 
 
 class ArtistsModel(QAbstractListModel):
@@ -21,6 +21,9 @@ notify-on-track-changed-desc = Show desktop notification on { -track } change
 notify-duration-desc = Notification duration (ms)
 playback-crossfade-desc = Crossfade on play/pause
 playback-crossfade-duration-desc = Crossfade duration (ms)
+playback-fade-tracks-desc = Fade out the end of a { -track } and fade in the next one
+enable-gapless-playback-desc = Preload the next { -track } to play without gaps
+media-prefetch-count-desc = Number of upcoming { -track(plural: "plural") } whose media are prepared in advance, each one costs extra requests to the provider
 openai-api-baseurl-desc = OpenAI API base URL
 openai-api-key-desc = OpenAI API key
 openai-model-desc = OpenAI model name
@@ -21,6 +21,9 @@ notify-on-track-changed-desc = { -track }切り替え時にデスクトップ通
 notify-duration-desc = デスクトップ通知保持時間 (ms)
 playback-crossfade-desc = 再生/一時停止 クロスフェード
 playback-crossfade-duration-desc = クロスフェード持続時間
+playback-fade-tracks-desc = { -track }の終わりをフェードアウトし、次の{ -track }をフェードイン
+enable-gapless-playback-desc = 次の{ -track }を先読みしてギャップレス再生する
+media-prefetch-count-desc = 再生リソースを事前に準備する後続の{ -track }の数（{ -track }ごとにプロバイダーへの追加リクエストが発生します）
 openai-api-baseurl-desc = OpenAI API 基本URL
 openai-api-key-desc = OpenAI APIキー
 openai-model-desc = OpenAIモデル名
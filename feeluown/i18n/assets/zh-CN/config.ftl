@@ -21,6 +21,9 @@ notify-on-track-changed-desc = 切换{ -track }时显示桌面通知
 notify-duration-desc = 桌面通知保留时长(ms)
 playback-crossfade-desc = 播放暂停淡入淡出
 playback-crossfade-duration-desc = 淡入淡出持续时间
+playback-fade-tracks-desc = { -track }结尾淡出，下一首淡入
+enable-gapless-playback-desc = 预加载下一首{ -track }，实现无缝播放
+media-prefetch-count-desc = 提前准备播放资源的后续{ -track }数量，每首都会额外请求资源提供方
 openai-api-baseurl-desc = OpenAI API 基础 URL
 openai-api-key-desc = OpenAI API 密钥
 openai-model-desc = OpenAI 模型名称
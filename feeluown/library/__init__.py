@@ -29,4 +29,6 @@ from .uri import (
     parse_line, NS_TYPE_MAP,
 )
 from .collection import Collection, CollectionType
-from .standby import get_standby_score, STANDBY_DEFAULT_MIN_SCORE, STANDBY_FULL_SCORE
+from .standby import (
+    get_standby_score, STANDBY_DEFAULT_MIN_SCORE, STANDBY_FULL_SCORE, StandbyCache,
+)
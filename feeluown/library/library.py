@@ -1,11 +1,12 @@
 # mypy: disable-error-code=type-abstract
+import asyncio
 import logging
 import warnings
 from collections import Counter
 from typing import Optional, TypeVar, List, TYPE_CHECKING
 
 from feeluown.media import Media, MediaType
-from feeluown.utils.aio import run_fn, as_completed
+from feeluown.utils.aio import run_fn, as_completed, create_task, wait_for
 from feeluown.utils.dispatch import Signal
 from feeluown.library.base import SearchType, ModelType
 from feeluown.library.provider import Provider
@@ -46,6 +47,8 @@ from feeluown.library.standby import (
     get_standby_score,
     STANDBY_DEFAULT_MIN_SCORE,
     STANDBY_FULL_SCORE,
+    STANDBY_PROBE_DELAY,
+    STANDBY_PROBE_CONCURRENCY,
 )
 
 if TYPE_CHECKING:
@@ -64,12 +67,19 @@ def raise_(e):
 class Library:
     """Resource entrypoints."""
 
-    def __init__(self, providers_standby=None, enable_ai_standby_matcher=True):
+    def __init__(
+        self,
+        providers_standby=None,
+        enable_ai_standby_matcher=True,
+        standby_timeout=None,
+    ):
         """
 
-        :type app: feeluown.app.App
+        :param standby_timeout: the default deadline (in seconds) for listing
+            song standbys, None means no deadline.
         """
         self._providers_standby = providers_standby
+        self.standby_timeout = standby_timeout
         self._providers = set()
         self.ytdl: Optional["Ytdl"] = None
         self.ai: Optional["AI"] = None
@@ -209,16 +219,94 @@ class Library:
             else:
                 yield result
 
-    async def a_song_prepare_media_no_exc(self, standby, policy):
+    async def a_song_prepare_media_no_exc(self, standby, policy, errors=None):
+        """
+        .. versionchanged:: 5.2
+           Add `errors` parameter. When it is a list, unexpected errors
+           are appended to it.
+        """
         media = None
         try:
             media = await run_fn(self.song_prepare_media, standby, policy)
         except MediaNotFound as e:
             logger.debug(f"standby media not found: {e}")
-        except:  # noqa
+        except Exception as e:  # noqa
             logger.exception(f"get standby:{standby} media failed")
+            if errors is not None:
+                errors.append(e)
         return media
 
+    async def a_probe_standby_media(
+        self,
+        standby_list,
+        audio_select_policy=">>>",
+        limit=1,
+        delay=STANDBY_PROBE_DELAY,
+        max_concurrency=STANDBY_PROBE_CONCURRENCY,
+        errors=None,
+    ):
+        """Probe media of standbys concurrently, Happy Eyeballs style
+
+        `standby_list` is ordered by priority. A standby is probed when the
+        previous one fails or does not finish within `delay` seconds. It
+        returns as soon as the first `limit` valid standbys are known, i.e.
+        all standbys before them have finished, and cancels the others.
+
+        :param errors: a list, unexpected errors of probing are appended to it.
+        :return: [(standby, media), ...] ordered by priority
+        """
+        song_media_list = []
+        tasks = []
+        pending = set()
+        i_ready = 0  # Index of the first standby which is not reported.
+
+        def start_next():
+            standby = standby_list[len(tasks)]
+            task = create_task(
+                self.a_song_prepare_media_no_exc(
+                    standby, audio_select_policy, errors=errors
+                )
+            )
+            tasks.append(task)
+            pending.add(task)
+
+        try:
+            while True:
+                # Report finished standbys in priority order.
+                while i_ready < len(tasks) and tasks[i_ready].done():
+                    media = tasks[i_ready].result()
+                    if media is not None:
+                        song_media_list.append((standby_list[i_ready], media))
+                        if len(song_media_list) >= limit:
+                            return song_media_list
+                    i_ready += 1
+                if i_ready >= len(standby_list):
+                    return song_media_list
+                if not pending:
+                    start_next()
+                    continue
+                n_valid = sum(
+                    1 for t in tasks if t.done() and t.result() is not None
+                )
+                can_start = (
+                    len(tasks) < len(standby_list)
+                    and len(pending) < max_concurrency
+                    and n_valid < limit
+                )
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=delay if can_start else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                # Start the next one when the running ones are slow or failed.
+                if can_start and (
+                    not done or any(t.result() is None for t in done)
+                ):
+                    start_next()
+        finally:
+            for task in pending:
+                task.cancel()
+
     async def a_list_song_standby_v2(
         self,
         song,
@@ -227,26 +315,81 @@ class Library:
         score_fn=None,
         min_score=STANDBY_DEFAULT_MIN_SCORE,
         limit=1,
+        timeout=None,
+        return_complete=False,
     ):
         """list song standbys and their media
 
+        Candidates are probed concurrently by :meth:`a_probe_standby_media`.
+        When `timeout` (default :attr:`standby_timeout`) is reached, the
+        standbys which are found so far are returned.
+
+        When `return_complete` is True, a tuple `(song_media_list, complete)`
+        is returned. `complete` is False when the timeout is reached or any
+        provider fails, so an empty list does not mean there is no standby.
+
         .. versionadded:: 3.7.8
+
+        .. versionchanged:: 5.2
+           Add `timeout` and `return_complete` parameter, and probe standbys
+           concurrently.
         """
+        if timeout is None:
+            timeout = self.standby_timeout
+        song_media_list = []  # [(standby, media), (standby, media)]
+        errors = []
+        complete = True
+        try:
+            await wait_for(
+                self._a_list_song_standby_v2(
+                    song_media_list,
+                    song,
+                    audio_select_policy,
+                    source_in,
+                    score_fn,
+                    min_score,
+                    max(limit, 1),
+                    errors,
+                ),
+                timeout=timeout,
+            )
+        except asyncio.TimeoutError:
+            complete = False
+            logger.warning(
+                f"list standby for song:{song} timeout, "
+                f"found {len(song_media_list)} standby(s)"
+            )
+        if return_complete:
+            return song_media_list, complete and not errors
+        return song_media_list
+
+    async def _a_list_song_standby_v2(
+        self,
+        song_media_list,
+        song,
+        audio_select_policy,
+        source_in,
+        score_fn,
+        min_score,
+        limit,
+        errors,
+    ):
         if source_in is None:
             pvd_ids = self._providers_standby or [pvd.identifier for pvd in self.list()]
         else:
             pvd_ids = [pvd.identifier for pvd in self._filter(identifier_in=source_in)]
         if score_fn is None:
             score_fn = get_standby_score
-        limit = max(limit, 1)
 
         q = "{} {}".format(song.title_display, song.artists_name_display)
         standby_score_list = []  # [(standby, score), (standby, score)]
-        song_media_list = []  # [(standby, media), (standby, media)]
         top2_standby = []
-        async for result in self.a_search(q, source_in=pvd_ids):
+        async for result in self.a_search(q, source_in=pvd_ids, return_err=True):
             if result is None:
                 continue
+            if result.err_msg:
+                errors.append(result.err_msg)
+            full_score_standby_list = []
             # Only check the first 3 songs
             for i, standby in enumerate(result.songs):
                 # HACK(cosven): I think the local provider should not be included,
@@ -255,18 +398,21 @@ class Library:
                     top2_standby.append(standby)
                 score = score_fn(song, standby)
                 if score == STANDBY_FULL_SCORE:
-                    media = await self.a_song_prepare_media_no_exc(
-                        standby, audio_select_policy
-                    )
-                    if media is None:
-                        continue
-                    logger.info(f"Find full score standby for song:{q}")
-                    song_media_list.append((standby, media))
-                    if len(song_media_list) >= limit:
-                        # Return as early as possible to get better performance
-                        return song_media_list
+                    full_score_standby_list.append(standby)
                 elif score >= min_score:
                     standby_score_list.append((standby, score))
+            if full_score_standby_list:
+                for standby, media in await self.a_probe_standby_media(
+                    full_score_standby_list,
+                    audio_select_policy,
+                    limit=limit - len(song_media_list),
+                    errors=errors,
+                ):
+                    logger.info(f"Find full score standby for song:{q}")
+                    song_media_list.append((standby, media))
+                if len(song_media_list) >= limit:
+                    # Return as early as possible to get better performance
+                    return
         if standby_score_list:
             standby_pvd_id_set = {standby.source for standby, _ in standby_score_list}
             logger.info(
@@ -288,18 +434,14 @@ class Library:
                 key=lambda song_score: song_score[1],
                 reverse=True,
             )
-            for standby, _ in sorted_standby_score_list:
-                # TODO: send multiple requests at a time.
-                media = await self.a_song_prepare_media_no_exc(
-                    standby, audio_select_policy
+            song_media_list.extend(
+                await self.a_probe_standby_media(
+                    [standby for standby, _ in sorted_standby_score_list],
+                    audio_select_policy,
+                    limit=limit - len(song_media_list),
+                    errors=errors,
                 )
-                if media is not None:
-                    song_media_list.append((standby, media))
-                    if len(song_media_list) >= limit:
-                        return song_media_list
-            if song_media_list:
-                return song_media_list
-        return song_media_list
+            )
 
     def check_flags(self, source: str, model_type: ModelType, flags: PF) -> bool:
         """Check if a provider satisfies the specific ability for a model type
@@ -1,7 +1,27 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
 from .models import SongModel
+from .uri import parse_line, reverse, ResolveFailed
+
+logger = logging.getLogger(__name__)
 
 STANDBY_DEFAULT_MIN_SCORE = 0.5
 STANDBY_FULL_SCORE = 1
+#: Start probing the next standby when the previous one does not finish
+#: in this many seconds (Happy Eyeballs).
+STANDBY_PROBE_DELAY = 0.3
+#: Max number of standbys which are probed at the same time.
+STANDBY_PROBE_CONCURRENCY = 3
+#: Seconds to remember the standby of a song.
+STANDBY_CACHE_TTL = 7 * 24 * 3600
+#: Seconds to remember that a song has no standby.
+STANDBY_CACHE_NEGATIVE_TTL = 24 * 3600
 
 
 def get_standby_score(origin, standby):
@@ -49,3 +69,114 @@ def get_standby_score(origin, standby):
     #       f"'{standby.album_name}', "
     #       f"'{standby.duration_ms}')")
     return score / 10
+
+
+class StandbyCache:
+    """Remember the standby of songs, so that it is not searched again.
+
+    The cache maps a song uri to its standby. It also remembers songs which
+    have no standby (negative results), these entries expire earlier since a
+    standby may be found later. When the cache is full, the least recently
+    used entry is evicted. Entries can be saved to a JSON file and
+    loaded on the next start; the file is loaded lazily when the cache is
+    used at the first time.
+
+    >>> from feeluown.library import BriefSongModel
+    >>> cache = StandbyCache()
+    >>> song = BriefSongModel(source='a', identifier='1', title='x')
+    >>> cache.get(song)
+    (False, None)
+    >>> cache.set(song, None)
+    >>> cache.get(song)
+    (True, None)
+    """
+
+    def __init__(self, fpath=None, ttl=STANDBY_CACHE_TTL,
+                 negative_ttl=STANDBY_CACHE_NEGATIVE_TTL, maxsize=2000,
+                 timer=time.time):
+        #: When fpath is None, the cache is in memory only.
+        self._fpath = fpath
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._maxsize = maxsize
+        self._timer = timer
+        self._lock = threading.Lock()
+        # {song_uri: (standby_line or None, expired_at)}, ordered from the
+        # least to the most recently used.
+        self._entries: Optional[OrderedDict[str, Tuple[Optional[str], float]]] = None
+
+    def _get_entries(self):
+        if self._entries is None:
+            self._entries = OrderedDict()
+            self._load()
+        return self._entries
+
+    def _load(self):
+        if self._fpath is None or not os.path.exists(self._fpath):
+            return
+        try:
+            with open(self._fpath, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            logger.exception('load standby cache failed')
+            return
+        now = self._timer()
+        assert self._entries is not None
+        for song_uri, (line, expired_at) in data.items():
+            if expired_at > now:
+                self._entries[song_uri] = (line, expired_at)
+
+    def get(self, song):
+        """Return (hit, standby), standby is None when the song has no standby."""
+        song_uri = reverse(song)
+        with self._lock:
+            entry = self._get_entries().get(song_uri)
+            if entry is None:
+                return False, None
+            line, expired_at = entry
+            if expired_at <= self._timer():
+                self._entries.pop(song_uri)  # type: ignore
+                return False, None
+            self._entries.move_to_end(song_uri)  # type: ignore
+        if line is None:
+            return True, None
+        try:
+            standby, _ = parse_line(line)
+        except (ResolveFailed, ValueError):
+            logger.warning(f'invalid standby cache entry: {line}')
+            self.remove(song)
+            return False, None
+        return True, standby
+
+    def set(self, song, standby):
+        """Remember the standby of the song, standby can be None."""
+        if standby is None:
+            line, ttl = None, self._negative_ttl
+        else:
+            line, ttl = reverse(standby, as_line=True), self._ttl
+        song_uri = reverse(song)
+        with self._lock:
+            entries = self._get_entries()
+            entries[song_uri] = (line, self._timer() + ttl)
+            entries.move_to_end(song_uri)
+            while len(entries) > self._maxsize:
+                entries.popitem(last=False)
+
+    def remove(self, song):
+        with self._lock:
+            self._get_entries().pop(reverse(song), None)
+
+    def save(self):
+        """Save the entries to the file. It does blocking IO."""
+        if self._fpath is None:
+            return
+        with self._lock:
+            data = dict(self._get_entries())
+        # Write to a temporary file first, so that the file is never broken.
+        tmp_fpath = self._fpath + '.tmp'
+        try:
+            with open(tmp_fpath, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_fpath, self._fpath)
+        except OSError:
+            logger.exception('save standby cache failed')
@@ -24,6 +24,24 @@ def init_config(config):
         default=[DEFAULT_MUSIC_FOLDER],
         desc="Supported list of music folders",
     )
+    config.deffield(
+        "SCAN_WORKERS",
+        type_=int,
+        default=1,
+        desc="Number of processes used to parse music files, 0 means CPU count",
+    )
+    config.deffield(
+        "WATCH_MUSIC_FOLDERS",
+        type_=bool,
+        default=False,
+        desc="Watch music folders and update the library when files change",
+    )
+    config.deffield(
+        "DB_BACKEND",
+        type_=str,
+        default="json",
+        desc="Storage of the local library, json or sqlite",
+    )
     config.deffield(
         "MUSIC_FORMATS",
         type_=list,
@@ -1,8 +1,13 @@
 import base64
 import json
 import logging
+import multiprocessing
 import os
 import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
 from typing import Optional
 
 from pydantic import ValidationError
@@ -12,7 +17,6 @@ from mutagen.easymp4 import EasyMP4
 from mutagen.flac import FLAC
 from mutagen.apev2 import APEv2File
 
-from feeluown.serializers import serialize
 from feeluown.utils.utils import elfhash, log_exectime
 from feeluown.utils.lang import can_convert_chinese, convert_chinese
 from feeluown.library import SongModel, AlbumModel, ArtistModel, AlbumType
@@ -201,13 +205,18 @@ def add_song(
     expand_artist_songs=False,
     artist_splitter=[',', '&'],
     artist_splitter_ignorance=None,
-    split_album_artist_name=False
+    split_album_artist_name=False,
+    data=None,
 ):
     """
     parse music file metadata with Easymp3 and return a song
     model.
+
+    :param data: metadata read by :func:`read_audio_metadata` before.
+        The file is parsed when it is None.
     """
-    data = read_audio_metadata(fpath, can_convert_chinese, lang)
+    if data is None:
+        data = read_audio_metadata(fpath, can_convert_chinese, lang)
     if data is None:
         return
 
@@ -318,6 +327,42 @@ def add_song(
             album_artist_.hot_songs.append(song)
 
 
+def read_audio_metadata_list(fpaths, can_convert_chinese=False, lang='auto',
+                             workers=1):
+    """Read metadata of many audio files, return a list of metadata.
+
+    Files are parsed by a process pool when workers is not 1, and 0 means
+    the number of CPUs.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(fpaths) < 2:
+        return [read_audio_metadata(fpath, can_convert_chinese, lang)
+                for fpath in fpaths]
+    func = partial(read_audio_metadata, can_convert_chinese=can_convert_chinese,
+                   lang=lang)
+    # Send files to workers in chunks to reduce the IPC overhead.
+    chunksize = max(1, min(64, len(fpaths) // (workers * 4)))
+    try:
+        # Do not fork, since scanning runs in a thread of a multi-threaded app.
+        mp_context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=mp_context) as executor:
+            return list(executor.map(func, fpaths, chunksize=chunksize))
+    except (OSError, BrokenProcessPool):
+        logger.exception('parse files in process pool failed, fallback')
+        return [func(fpath) for fpath in fpaths]
+
+
+def stat_fingerprint(fpath) -> Optional[list]:
+    """Return the [size, mtime_ns] fingerprint of a file, or None when
+    the file can't be accessed."""
+    try:
+        st = os.stat(fpath)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
 def scan_directory(directory, exts, depth=2):
     if depth < 0:
         return []
@@ -346,13 +391,21 @@ class DB:
     """
     DB manages a fileset and their corresponding models
 
+    Parsing metadata of media files is the most expensive part of scanning,
+    so the parsed metadata of each file is persisted with its fingerprint
+    (size and mtime). When scanning, only new or changed files are parsed
+    again, and deleted files are dropped.
+
     the data structure in db file::
 
         {
-          "files": [],
-          "songs": []
+          "version": "2.0",
+          "options": [can_convert_chinese, lang],
+          "files": {fpath: [size, mtime_ns, metadata]}
         }
     """
+    version = '2.0'
+
     def __init__(self, fpath):
         """
         :param filepath: database file path
@@ -369,26 +422,118 @@ class DB:
         self._artists = {}             # {artist_id: artist)
         self._album_contributors = {}  # {album_id: [artist_id]}
 
+        self._config = None            # config used by the last scan
+        self._options = None           # [can_convert_chinese, lang]
+        self._file_metadata = {}       # {fpath: [size, mtime_ns, metadata]}
+
+    def load(self):
+        """load the parsed metadata of media files from db file"""
+        if not self._fpath or not os.path.exists(self._fpath):
+            return
+        try:
+            with open(self._fpath, 'r', encoding='utf-8') as f:
+                js = json.load(f)
+        except (OSError, ValueError):
+            logger.exception('load local db file failed, ignore it')
+            return
+        if not isinstance(js, dict) or js.get('version') != self.version:
+            logger.info('local db file version mismatch, ignore it')
+            return
+        options, files = js.get('options'), js.get('files')
+        # Treat a malformed db file like a version mismatch, so that
+        # all media files are rescanned.
+        if not (isinstance(options, list) and len(options) == 2) or \
+                not isinstance(files, dict) or \
+                not all(isinstance(value, list) and len(value) == 3
+                        for value in files.values()):
+            logger.warning('local db file is malformed, ignore it')
+            return
+        self._options = options
+        self._file_metadata = files
+        self._fileset = set(self._file_metadata)
+
     def flush(self):
         """flush the changes into db file"""
-        with open(self._fpath, 'w', encoding='utf-8') as f:
+        if not self._dirty or not self._fpath:
+            return
+        tmp_fpath = self._fpath + '.tmp'
+        with open(tmp_fpath, 'w', encoding='utf-8') as f:
             json.dump({
-                'version': '1.0',
-                'files': list(self._fileset),
-                'songs': serialize('json', self._songs),
-                'artists': serialize('json', self._artists),
-                'albums': serialize('json', self._albums),
+                'version': self.version,
+                'options': self._options,
+                'files': self._file_metadata,
             }, f)
+        os.replace(tmp_fpath, self._fpath)
+        self._dirty = False
 
     def list_models(self):
         """list all models in database"""
         pass
 
     def add(self, fpath):
-        """add media file to database"""
+        """add or update a media file in database
+
+        It can only be used after scanning. Call :meth:`after_scan` after
+        a batch of changes so that songs, covers and mappings are refreshed.
+
+        :return: the song model, None if the file is not changed or it
+            can't be parsed.
+        """
+        if not self.is_file_changed(fpath):
+            return None
+        fingerprint = stat_fingerprint(fpath)
+        if fingerprint is None:
+            return None
+        self.remove(fpath)
+        data = read_audio_metadata(fpath, *self._options)
+        self._file_metadata[fpath] = fingerprint + [data]
+        self._fileset.add(fpath)
+        self._dirty = True
+        if data is None:
+            return None
+        self._add_song(fpath, data)
+        song_id = self._file_song.get(fpath)
+        if song_id is None:  # Duplicate song.
+            return None
+        self._song_file[song_id] = fpath
+        return self._songs[song_id]
+
+    def is_file_changed(self, fpath):
+        """whether the file is new or changed since it is added"""
+        cached = self._file_metadata.get(fpath)
+        return cached is None or cached[:2] != stat_fingerprint(fpath)
 
     def remove(self, fpath):
-        """add media file to database"""
+        """remove media file from database
+
+        :return: the removed song model, None if there is no song for the file.
+        """
+        if self._file_metadata.pop(fpath, None) is not None:
+            self._fileset.discard(fpath)
+            self._dirty = True
+        song_id = self._file_song.pop(fpath, None)
+        if song_id is None:
+            return None
+        self._song_file.pop(song_id, None)
+        song = self._songs.pop(song_id)
+
+        maybe_orphan_artist_ids = {artist.identifier for artist in song.artists}
+        album = self._albums.get(song.album.identifier) if song.album else None
+        if album is not None:
+            album.songs = [s for s in album.songs if s.identifier != song_id]
+            if not album.songs:
+                self._albums.pop(album.identifier)
+                self._album_contributors.pop(album.identifier, None)
+                maybe_orphan_artist_ids.update(a.identifier for a in album.artists)
+        for artist_id in maybe_orphan_artist_ids:
+            artist = self._artists.get(artist_id)
+            if artist is None:
+                continue
+            artist.hot_songs = [s for s in artist.hot_songs
+                                if s.identifier != song_id]
+            if not artist.hot_songs and not self.list_albums_by_artist(artist_id):
+                self._artists.pop(artist_id)
+        return song
 
     ############################
 
@@ -398,6 +543,15 @@ class DB:
     def list_albums(self):
         return list(self._albums.values())
 
+    def list_albums_by_artist(self, artist_id):
+        albums = []
+        for album in self._albums.values():
+            for artist in album.artists:
+                if artist.identifier == artist_id:
+                    albums.append(album)
+                    break
+        return albums
+
     def list_albums_by_contributor(self, artist_id):
         albums = []
         for album_id, artists in self._album_contributors.items():
@@ -424,27 +578,110 @@ class DB:
     @log_exectime
     def scan(self, config, paths, depth, exts):
         """scan media files in all paths
+
+        Only new or changed files are parsed, the metadata of other files
+        are read from the db file.
         """
+        media_files = self._list_media_files(paths, depth, exts)
+        self._update_file_metadata(config, media_files)
+        self._build_models(config)
+        logger.info('Local music scan finished.')
+
+    def _list_media_files(self, paths, depth, exts):
         media_files = []
         logger.info('start scanning...')
         for directory in paths:
             logger.debug('Scanning for directory (%s)...', directory)
             media_files.extend(scan_directory(directory, exts, depth))
         logger.info(f'scanning finished, {len(media_files)} files in total')
+        return media_files
+
+    def _update_file_metadata(self, config, media_files) -> bool:
+        """Parse new or changed files and drop deleted files.
 
-        is_cn_convert_enabled = can_convert_chinese()
+        Return True if there is any change.
+        """
+        options = [can_convert_chinese(), config.CORE_LANGUAGE]
+        if self._options is None and not self._file_metadata:
+            self.load()
+        if self._options != options:
+            # The cached metadata is converted with different options.
+            self._options = options
+            self._file_metadata = {}
+            self._dirty = True
+
+        old_file_metadata = self._file_metadata
+        file_metadata = {}
+        to_parse = []  # files which are new or changed
         for fpath in media_files:
-            add_song(fpath, self._songs, self._artists,
-                     self._albums, self._file_song, self._album_contributors,
-                     is_cn_convert_enabled, config.CORE_LANGUAGE,
-                     config.IDENTIFIER_DELIMITER, config.EXPAND_ARTIST_SONGS,
-                     config.ARTIST_SPLITTER, config.ARTIST_SPLITTER_IGNORANCE,
-                     config.SPLIT_ALBUM_ARTIST_NAME)
-        logger.info('Local music scan finished.')
+            fingerprint = stat_fingerprint(fpath)
+            if fingerprint is None:
+                continue
+            cached = old_file_metadata.get(fpath)
+            if cached is not None and cached[:2] == fingerprint:
+                file_metadata[fpath] = cached
+            else:
+                file_metadata[fpath] = fingerprint + [None]
+                to_parse.append(fpath)
+        changed = bool(to_parse) or len(file_metadata) != len(old_file_metadata)
+        if to_parse:
+            logger.info(f'parsing {len(to_parse)} new or changed files...')
+            metadata_list = read_audio_metadata_list(
+                to_parse, options[0], options[1], workers=config.SCAN_WORKERS,
+            )
+            for fpath, data in zip(to_parse, metadata_list):
+                file_metadata[fpath][2] = data
+        self._dirty = self._dirty or changed
+        self._file_metadata = file_metadata
+        self._fileset = set(file_metadata)
+        return changed
+
+    def _build_models(self, config):
+        self._config = config
+        self._reset_models()
+        for fpath, (_, _, data) in self._file_metadata.items():
+            if data is None:
+                continue
+            self._add_song(fpath, data)
+
+    def _add_song(self, fpath, data):
+        is_cn_convert_enabled, lang = self._options
+        config = self._config
+        add_song(fpath, self._songs, self._artists,
+                 self._albums, self._file_song, self._album_contributors,
+                 is_cn_convert_enabled, lang,
+                 config.IDENTIFIER_DELIMITER, config.EXPAND_ARTIST_SONGS,
+                 config.ARTIST_SPLITTER, config.ARTIST_SPLITTER_IGNORANCE,
+                 config.SPLIT_ALBUM_ARTIST_NAME,
+                 data=data)
+
+    def _reset_models(self):
+        self._file_song.clear()
+        self._song_file.clear()
+        self._songs.clear()
+        self._albums.clear()
+        self._artists.clear()
+        self._album_contributors.clear()
+
+    def after_scan(self, album_ids=None, artist_ids=None):
+        """Post-process models after they are changed.
+
+        When `album_ids` and `artist_ids` are given, only these albums and
+        artists are processed, which is used after a few files are changed.
+        """
+        if album_ids is None:
+            albums = list(self._albums.values())
+        else:
+            albums = [self._albums[album_id] for album_id in album_ids
+                      if album_id in self._albums]
+        if artist_ids is None:
+            artists = list(self._artists.values())
+        else:
+            artists = [self._artists[artist_id] for artist_id in artist_ids
+                       if artist_id in self._artists]
 
-    def after_scan(self):
         # Sort the songs in a album.
-        for album in self._albums.values():
+        for album in albums:
             try:
                 album.songs.sort(key=lambda x: (int(x.disc.split('/')[0]),
                                                 int(x.track.split('/')[0])))
@@ -454,18 +691,19 @@ class DB:
             except:  # noqa
                 logger.exception('Sort album songs failed.')
 
+        # Build the {artist_id: [album]} mapping in one pass.
+        artist_albums = defaultdict(list)
+        for album in self._albums.values():
+            for artist_ in album.artists:
+                if artist_ids is None or artist_.identifier in artist_ids:
+                    artist_albums[artist_.identifier].append(album)
+
         # Select a pic_url for the artist
-        for artist in self._artists.values():
-            albums = []
-            for album in self._albums.values():
-                for artist_ in album.artists:
-                    if artist_.identifier == artist.identifier:
-                        albums.append(album)
-                        continue
+        for artist in artists:
+            albums = artist_albums.get(artist.identifier)
             if albums:
                 albums.sort(key=sort_album_func, reverse=True)
-                if albums:
-                    artist.pic_url = albums[0].cover
+                artist.pic_url = albums[0].cover
 
             if not artist.pic_url and artist.hot_songs:
                 # sort the artist hot_songs.
@@ -480,5 +718,7 @@ class DB:
                     artist.pic_url = gen_cover_url(song)
                     break
 
-        # Cache the {song_id:fpath} mapping.
-        self._song_file = {v: k for k, v in self._file_song.items()}
+        # Cache the {song_id:fpath} mapping, it is maintained by add and
+        # remove after scanning.
+        if album_ids is None:
+            self._song_file = {v: k for k, v in self._file_song.items()}
@@ -6,25 +6,33 @@ including small parts such as music directory scanning and music library constru
 in theory, all these small parts can be extracted from it.
 """
 
-import difflib
 import logging
+import os
 import re
 import threading
 from functools import wraps
 
+from feeluown.consts import DATA_DIR
 from feeluown.excs import ProviderIOError
 
 from feeluown.i18n import t
 from feeluown.media import Media, Quality
-from feeluown.library import AbstractProvider, ProviderV2, ModelType, SimpleSearchResult
+from feeluown.library import (
+    AbstractProvider, ProviderV2, ModelType, SimpleSearchResult, SearchType,
+)
+from feeluown.utils.dispatch import Signal
 from feeluown.utils.reader import create_reader
 from feeluown.utils.utils import log_exectime
 from feeluown.utils.audio import read_audio_cover
-from .db import sort_album_func
+from .db import sort_album_func, to_brief_song, to_brief_album, to_brief_artist
+from .search_index import SearchIndex
+from .watcher import Watcher
 
 
 logger = logging.getLogger(__name__)
 SOURCE = 'local'
+DB_FILE = os.path.join(DATA_DIR, 'local_library.json')
+SQLITE_DB_FILE = os.path.join(DATA_DIR, 'local_library.sqlite3')
 
 
 def wait_for_scan(func):
@@ -50,13 +58,28 @@ class LocalProvider(AbstractProvider, ProviderV2):
 
         self._app = None
         self._scan_finished = threading.Event()
+        self._db_lock = threading.RLock()
+        self._watcher = None
+        #: emitted with (added songs, removed songs) when music files change
+        self.library_changed = Signal()
+        self._song_index = SearchIndex()
+        self._album_index = SearchIndex()
+        self._artist_index = SearchIndex()
+        # The index is built on the first search, so that models which are
+        # loaded lazily (by SqliteDB) are not loaded on each startup.
+        self._search_index_built = False
 
         from .db import DB
 
-        self.db = DB('')
+        self.db = DB(DB_FILE)
 
     def initialize(self, app):
         self._app = app
+        app.about_to_shutdown.connect(lambda _: self.stop_watching(), weak=False)
+        if app.config.local.DB_BACKEND == 'sqlite':
+            from .sqlite_db import SqliteDB
+
+            self.db = SqliteDB(SQLITE_DB_FILE)
 
     def handle_with_path(self, path, **_):
         """
@@ -70,7 +93,8 @@ class LocalProvider(AbstractProvider, ProviderV2):
             except IndexError:
                 return None
             else:
-                fpath = self.db.get_song_fpath(identifier)
+                with self._db_lock:
+                    fpath = self.db.get_song_fpath(identifier)
                 if fpath:
                     return read_audio_cover(fpath)[0]
         return None
@@ -85,9 +109,87 @@ class LocalProvider(AbstractProvider, ProviderV2):
 
     def scan(self, config, paths, depth=3):
         exts = config.MUSIC_FORMATS
-        self.db.scan(config, paths, depth, exts)
-        self.db.after_scan()
-        self._scan_finished.set()
+        with self._db_lock:
+            self.db.scan(config, paths, depth, exts)
+            self.db.after_scan()
+            self._search_index_built = False
+            self._scan_finished.set()
+            self._flush_db()
+        if config.WATCH_MUSIC_FOLDERS and self._watcher is None:
+            self._watcher = Watcher(paths, exts, depth, self._on_files_changed)
+            self._watcher.start()
+
+    def stop_watching(self):
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+
+    def _flush_db(self):
+        try:
+            self.db.flush()
+        except OSError:
+            logger.exception('flush local db failed')
+
+    def _on_files_changed(self, fpaths):
+        """Apply the changes of media files to db and search index.
+
+        This is called by the watcher in a worker thread.
+        """
+        added, removed = [], []
+        with self._db_lock:
+            for fpath in sorted(fpaths):
+                if os.path.isfile(fpath):
+                    if not self.db.is_file_changed(fpath):
+                        continue
+                    old_song = self.db.remove(fpath)
+                    song = self.db.add(fpath)
+                else:
+                    old_song, song = self.db.remove(fpath), None
+                if old_song is not None:
+                    removed.append(old_song)
+                if song is not None:
+                    added.append(song)
+            if not (added or removed):
+                return
+            album_ids, artist_ids = self._get_changed_model_ids(added, removed)
+            self.db.after_scan(album_ids, artist_ids)
+            if self._search_index_built:
+                self._update_search_index(removed, added, album_ids, artist_ids)
+            self._flush_db()
+        logger.info(f'local library changed: {len(added)} songs added, '
+                    f'{len(removed)} songs removed')
+        self.library_changed.emit(added, removed)
+
+    def _get_changed_model_ids(self, added, removed):
+        """Get ids of albums and artists which may be changed by the songs."""
+        album_ids, artist_ids = set(), set()
+        for song in removed + added:
+            if song.album is not None:
+                album_ids.add(song.album.identifier)
+            artist_ids.update(artist.identifier for artist in song.artists)
+        for album_id in album_ids:
+            album = self.db.get_album(album_id)
+            if album is not None:
+                artist_ids.update(artist.identifier for artist in album.artists)
+        return album_ids, artist_ids
+
+    def _update_search_index(self, removed, added, album_ids, artist_ids):
+        for song in removed:
+            self._song_index.remove(song.identifier)
+        for song in added:
+            self.index_song(song)
+        for album_id in album_ids:
+            album = self.db.get_album(album_id)
+            if album is None:
+                self._album_index.remove(album_id)
+            else:
+                self.index_album(album)
+        for artist_id in artist_ids:
+            artist = self.db.get_artist(artist_id)
+            if artist is None:
+                self._artist_index.remove(artist_id)
+            else:
+                self.index_artist(artist)
 
     def use_model_v2(self, model_type):
         return model_type in (ModelType.song, ModelType.album, ModelType.artist)
@@ -95,7 +197,8 @@ class LocalProvider(AbstractProvider, ProviderV2):
     @wait_for_scan
     def song_get(self, identifier):
         """implements SupportsSongGet protocol."""
-        return self.db.get_song(identifier)
+        with self._db_lock:
+            return self.db.get_song(identifier)
 
     def song_list_quality(self, _):
         """implements SupportsSongMultiQuality protocol."""
@@ -104,78 +207,105 @@ class LocalProvider(AbstractProvider, ProviderV2):
     @wait_for_scan
     def song_get_media(self, song, _):
         """implements SupportsSongMultiQuality protocol."""
-        fpath = self.db.get_song_fpath(song.identifier)
+        with self._db_lock:
+            fpath = self.db.get_song_fpath(song.identifier)
         if fpath:
             return Media(fpath)
 
     @wait_for_scan
     def album_get(self, identifier):
         """Implement SupportsAlbumGet protocol."""
-        return self.db.get_album(identifier)
+        with self._db_lock:
+            return self.db.get_album(identifier)
 
     @wait_for_scan
     def artist_get(self, identifier):
         """Implement SupportsArtistGet protocol."""
-        return self.db.get_artist(identifier)
+        with self._db_lock:
+            return self.db.get_artist(identifier)
 
     @wait_for_scan
     def artist_create_songs_rd(self, artist):
         """Implement SupportsArtistSongsReader protocol."""
         artist = self.model_get(artist.meta.model_type, artist.identifier)
-        return create_reader(artist.hot_songs)
+        with self._db_lock:
+            return create_reader(list(artist.hot_songs))
 
     @wait_for_scan
     def artist_create_albums_rd(self, artist):
         """Implement SupportsArtistAlbumsReader protocol."""
-        albums = []
-        for album in self.db.list_albums():
-            for artist_ in album.artists:
-                if artist_.identifier == artist.identifier:
-                    albums.append(album)
-                    continue
+        with self._db_lock:
+            albums = self.db.list_albums_by_artist(artist.identifier)
         albums.sort(key=sort_album_func, reverse=True)
         return create_reader(albums)
 
     @wait_for_scan
     def artist_create_contributed_albums_rd(self, artist):
-        albums = self.db.list_albums_by_contributor(artist.identifier)
+        with self._db_lock:
+            albums = self.db.list_albums_by_contributor(artist.identifier)
         albums.sort(key=sort_album_func, reverse=True)
         return create_reader(albums)
 
     @property
     def songs(self):
-        return self.db.list_songs()
+        with self._db_lock:
+            return self.db.list_songs()
 
     @property
     def albums(self):
-        return self.db.list_albums()
+        with self._db_lock:
+            return self.db.list_albums()
 
     @property
     def artists(self):
-        return self.db.list_artists()
+        with self._db_lock:
+            return self.db.list_artists()
+
+    def _ensure_search_index(self):
+        with self._db_lock:
+            if not self._search_index_built:
+                self.build_search_index()
+                self._search_index_built = True
 
     @log_exectime
-    @wait_for_scan
-    def search(self, keyword, **kwargs):
-        from .db import to_brief_song
+    def build_search_index(self):
+        for index in (self._song_index, self._album_index, self._artist_index):
+            index.clear()
+        for song in self.db.list_songs():
+            self.index_song(song)
+        for album in self.db.list_albums():
+            self.index_album(album)
+        for artist in self.db.list_artists():
+            self.index_artist(artist)
+
+    def index_song(self, song):
+        self._song_index.add(song.identifier, to_brief_song(song),
+                             f'{song.title} {song.artists_name}')
+
+    def index_album(self, album):
+        self._album_index.add(album.identifier, to_brief_album(album),
+                              f'{album.name} {album.artists_name}')
+
+    def index_artist(self, artist):
+        self._artist_index.add(artist.identifier, to_brief_artist(artist),
+                               artist.name)
 
+    @log_exectime
+    @wait_for_scan
+    def search(self, keyword, type_=SearchType.so, **kwargs):
         limit = kwargs.get('limit', 10)
-        repr_song_map = dict()
-        for song in self.songs:
-            key = song.title + ' ' + song.artists_name
-            repr_song_map[key] = song
-        choices = repr_song_map.keys()
-        if choices:
-            # TODO: maybe use a more reasonable algorithm.
-            result = difflib.get_close_matches(keyword, choices, n=limit, cutoff=0)
-        else:
-            result = []
-        result_songs = [repr_song_map[each] for each in result]
-
-        return SimpleSearchResult(
-            q=keyword,
-            songs=[to_brief_song(song) for song in result_songs]
-        )
+        type_ = SearchType.parse(type_)
+        self._ensure_search_index()
+        if type_ == SearchType.so:
+            return SimpleSearchResult(
+                q=keyword, songs=self._song_index.search(keyword, limit))
+        if type_ == SearchType.al:
+            return SimpleSearchResult(
+                q=keyword, albums=self._album_index.search(keyword, limit))
+        if type_ == SearchType.ar:
+            return SimpleSearchResult(
+                q=keyword, artists=self._artist_index.search(keyword, limit))
+        return None
 
 
 provider = LocalProvider()
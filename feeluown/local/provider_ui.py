@@ -14,6 +14,7 @@ class LocalProviderUi(AbstractProviderUi):
 
     def __init__(self, app: 'GuiApp'):
         self._app = app
+        provider.library_changed.connect(self._on_library_changed, aioqueue=True)
 
     @property
     def provider(self):
@@ -25,6 +26,14 @@ class LocalProviderUi(AbstractProviderUi):
     def login_or_go_home(self):
         self._app.browser.goto(uri='/local')
 
+    def _on_library_changed(self, added, removed):
+        # Update the library page in place only when it is shown.
+        if self._app.browser.current_page != '/local':
+            return
+        renderer = self._app.ui.table_container.renderer
+        if isinstance(renderer, LibraryRenderer):
+            renderer.update_library(added, removed, provider.albums, provider.artists)
+
 
 def show_provider(req):
     if hasattr(req, 'ctx'):
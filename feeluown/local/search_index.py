@@ -0,0 +1,104 @@
+import heapq
+import re
+import threading
+from collections import Counter, defaultdict
+
+from feeluown.utils.lang import (
+    can_convert_chinese, convert_chinese, can_convert_pinyin, convert_pinyin,
+)
+
+
+_IGNORED_CHARS = re.compile(r'[\s\W_]+')
+
+
+class SearchIndex:
+    """An n-gram inverted index for models.
+
+    Texts are normalized (lower case, simplified chinese, without spaces and
+    punctuations) and split into character unigrams and bigrams. When pypinyin
+    is installed, the pinyin and the pinyin initials of the text are indexed
+    too, so that `zjlx` can match `再见理想`.
+
+    A query of one character is looked up in the unigram index, and a longer
+    query is looked up in the bigram index. Models which contain at least half
+    of the query grams are ranked by the number of grams they contain.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._grams = defaultdict(set)  # {gram: {identifier}}
+        self._docs = {}                 # {identifier: (model, text, grams)}
+        self._cn_convert_enabled = can_convert_chinese()
+        self._pinyin_enabled = can_convert_pinyin()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def normalize(self, text):
+        text = text.lower()
+        if self._cn_convert_enabled:
+            text = convert_chinese(text, 'cn')
+        return _IGNORED_CHARS.sub('', text)
+
+    def _split(self, text):
+        unigrams = set(text)
+        bigrams = {text[i:i+2] for i in range(len(text) - 1)}
+        return unigrams, bigrams
+
+    def _text_to_grams(self, text):
+        texts = [text]
+        if self._pinyin_enabled and not text.isascii():
+            texts.extend(convert_pinyin(text))
+        grams = set()
+        for each in texts:
+            unigrams, bigrams = self._split(each)
+            grams |= unigrams
+            grams |= bigrams
+        return grams
+
+    def add(self, identifier, model, text):
+        """Add or update a model in the index."""
+        with self._lock:
+            self.remove(identifier)
+            text = self.normalize(text)
+            grams = self._text_to_grams(text)
+            for gram in grams:
+                self._grams[gram].add(identifier)
+            self._docs[identifier] = (model, text, grams)
+
+    def remove(self, identifier):
+        with self._lock:
+            doc = self._docs.pop(identifier, None)
+            if doc is None:
+                return
+            for gram in doc[2]:
+                identifiers = self._grams[gram]
+                identifiers.discard(identifier)
+                if not identifiers:
+                    del self._grams[gram]
+
+    def clear(self):
+        with self._lock:
+            self._grams.clear()
+            self._docs.clear()
+
+    def search(self, keyword, limit=10):
+        """Return at most `limit` models which match the keyword best."""
+        query = self.normalize(keyword)
+        if not query:
+            return []
+        unigrams, bigrams = self._split(query)
+        grams = bigrams or unigrams
+        with self._lock:
+            counter = Counter()
+            for gram in grams:
+                counter.update(self._grams.get(gram, ()))
+            min_count = (len(grams) + 1) // 2
+            # Rank by the number of matched grams, and prefer shorter text
+            # since it matches the keyword more precisely.
+            scored = heapq.nsmallest(
+                limit,
+                (item for item in counter.items() if item[1] >= min_count),
+                key=lambda item: (-item[1], len(self._docs[item[0]][1]))
+            )
+            return [self._docs[identifier][0] for identifier, _ in scored]
@@ -0,0 +1,244 @@
+import json
+import logging
+import sqlite3
+import threading
+from typing import Optional
+
+from feeluown.serializers import serialize, deserialize
+from feeluown.utils.utils import log_exectime
+from .db import DB
+
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS files (
+    fpath TEXT PRIMARY KEY,
+    size INTEGER,
+    mtime_ns INTEGER,
+    metadata TEXT
+);
+CREATE TABLE IF NOT EXISTS songs (
+    id TEXT PRIMARY KEY,
+    fpath TEXT,
+    data TEXT
+);
+CREATE TABLE IF NOT EXISTS albums (
+    id TEXT PRIMARY KEY,
+    data TEXT
+);
+CREATE TABLE IF NOT EXISTS artists (
+    id TEXT PRIMARY KEY,
+    data TEXT
+);
+CREATE TABLE IF NOT EXISTS album_artists (
+    album_id TEXT,
+    artist_id TEXT
+);
+CREATE TABLE IF NOT EXISTS album_contributors (
+    album_id TEXT,
+    artist_id TEXT
+);
+CREATE INDEX IF NOT EXISTS album_artists_artist_id ON album_artists (artist_id);
+CREATE INDEX IF NOT EXISTS album_contributors_artist_id
+    ON album_contributors (artist_id);
+'''
+
+
+def dump_model(model):
+    return json.dumps(serialize('python', model))
+
+
+def load_model(data):
+    return deserialize('python', json.loads(data))
+
+
+class SqliteDB(DB):
+    """
+    SqliteDB persists both the file metadata and the models in a sqlite file.
+
+    When no media file is changed since the last scan, models are not built
+    during scanning. Instead, they are loaded from the sqlite file on demand,
+    and lookups by id or by artist are index hits. Models are built again
+    when any option used to build them is changed.
+    """
+
+    def __init__(self, fpath):
+        super().__init__(fpath)
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        # When it is True, the models are not built in memory, and they are
+        # loaded from the sqlite file on demand.
+        self._lazy = False
+        # Options used to build the persisted models, in json format.
+        self._model_options: Optional[str] = None
+
+    def _get_conn(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self._fpath, check_same_thread=False)
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._get_conn().execute(sql, params).fetchall()
+
+    def load(self):
+        """load the parsed metadata of media files from sqlite file"""
+        rows = dict(self._query('SELECT key, value FROM meta'))
+        if rows.get('version') != self.version:
+            logger.info('local sqlite db version mismatch, ignore it')
+            return
+        self._options = json.loads(rows['options'])
+        self._model_options = rows.get('model_options')
+        self._file_metadata = {
+            fpath: [size, mtime_ns, json.loads(metadata)]
+            for fpath, size, mtime_ns, metadata in self._query(
+                'SELECT fpath, size, mtime_ns, metadata FROM files')
+        }
+        self._fileset = set(self._file_metadata)
+
+    def flush(self):
+        """flush the file metadata and the models into sqlite file"""
+        if not self._dirty or self._lazy:
+            return
+        file_rows = [(fpath, size, mtime_ns, json.dumps(metadata))
+                     for fpath, (size, mtime_ns, metadata)
+                     in self._file_metadata.items()]
+        song_rows = [(song_id, self._song_file.get(song_id), dump_model(song))
+                     for song_id, song in self._songs.items()]
+        album_rows = [(album_id, dump_model(album))
+                      for album_id, album in self._albums.items()]
+        artist_rows = [(artist_id, dump_model(artist))
+                       for artist_id, artist in self._artists.items()]
+        album_artist_rows = [(album_id, artist.identifier)
+                             for album_id, album in self._albums.items()
+                             for artist in album.artists]
+        contributor_rows = [(album_id, artist_id)
+                            for album_id, artist_ids in self._album_contributors.items()
+                            for artist_id in artist_ids]
+        with self._lock:
+            conn = self._get_conn()
+            with conn:  # In one transaction.
+                for table in ('meta', 'files', 'songs', 'albums', 'artists',
+                              'album_artists', 'album_contributors'):
+                    conn.execute(f'DELETE FROM {table}')
+                conn.executemany('INSERT INTO meta VALUES (?, ?)',
+                                 [('version', self.version),
+                                  ('options', json.dumps(self._options)),
+                                  ('model_options', self._model_options)])
+                conn.executemany('INSERT INTO files VALUES (?, ?, ?, ?)', file_rows)
+                conn.executemany('INSERT INTO songs VALUES (?, ?, ?)', song_rows)
+                conn.executemany('INSERT INTO albums VALUES (?, ?)', album_rows)
+                conn.executemany('INSERT INTO artists VALUES (?, ?)', artist_rows)
+                conn.executemany('INSERT INTO album_artists VALUES (?, ?)',
+                                 album_artist_rows)
+                conn.executemany('INSERT INTO album_contributors VALUES (?, ?)',
+                                 contributor_rows)
+        self._dirty = False
+
+    @log_exectime
+    def scan(self, config, paths, depth, exts):
+        media_files = self._list_media_files(paths, depth, exts)
+        changed = self._update_file_metadata(config, media_files)
+        model_options = self.dump_model_options(config)
+        if model_options != self._model_options:
+            self._model_options = model_options
+            self._dirty = True
+        if not changed and not self._dirty \
+           and self._query('SELECT 1 FROM songs LIMIT 1'):
+            self._config = config
+            self._reset_models()
+            self._lazy = True
+            logger.info('Local music scan finished, models are loaded lazily.')
+        else:
+            self._lazy = False
+            self._build_models(config)
+            logger.info('Local music scan finished.')
+
+    def dump_model_options(self, config):
+        return json.dumps([self._options,
+                           config.IDENTIFIER_DELIMITER,
+                           config.EXPAND_ARTIST_SONGS,
+                           config.ARTIST_SPLITTER,
+                           config.ARTIST_SPLITTER_IGNORANCE,
+                           config.SPLIT_ALBUM_ARTIST_NAME])
+
+    def after_scan(self, album_ids=None, artist_ids=None):
+        # Models persisted in sqlite file are already post-processed.
+        if not self._lazy:
+            super().after_scan(album_ids, artist_ids)
+
+    def _ensure_models(self):
+        """Build all models in memory so that they can be changed."""
+        if self._lazy:
+            self._lazy = False
+            self._build_models(self._config)
+            super().after_scan()
+
+    def add(self, fpath):
+        self._ensure_models()
+        return super().add(fpath)
+
+    def remove(self, fpath):
+        self._ensure_models()
+        return super().remove(fpath)
+
+    def _get_model(self, cache, table, identifier):
+        model = cache.get(identifier)
+        if model is None and self._lazy:
+            rows = self._query(f'SELECT data FROM {table} WHERE id = ?', (identifier,))
+            if rows:
+                model = cache[identifier] = load_model(rows[0][0])
+        return model
+
+    def _list_models(self, cache, table):
+        if self._lazy:
+            for identifier, data in self._query(f'SELECT id, data FROM {table}'):
+                if identifier not in cache:
+                    cache[identifier] = load_model(data)
+        return list(cache.values())
+
+    def list_songs(self):
+        return self._list_models(self._songs, 'songs')
+
+    def list_albums(self):
+        return self._list_models(self._albums, 'albums')
+
+    def list_artists(self):
+        return self._list_models(self._artists, 'artists')
+
+    def list_albums_by_artist(self, artist_id):
+        if not self._lazy:
+            return super().list_albums_by_artist(artist_id)
+        rows = self._query('SELECT album_id FROM album_artists WHERE artist_id = ?',
+                           (artist_id,))
+        return [self.get_album(album_id) for album_id, in rows]
+
+    def list_albums_by_contributor(self, artist_id):
+        if not self._lazy:
+            return super().list_albums_by_contributor(artist_id)
+        rows = self._query(
+            'SELECT album_id FROM album_contributors WHERE artist_id = ?',
+            (artist_id,))
+        return [self.get_album(album_id) for album_id, in rows]
+
+    def get_song(self, identifier):
+        return self._get_model(self._songs, 'songs', identifier)
+
+    def get_album(self, identifier):
+        return self._get_model(self._albums, 'albums', identifier)
+
+    def get_artist(self, identifier):
+        return self._get_model(self._artists, 'artists', identifier)
+
+    def get_song_fpath(self, song_id) -> Optional[str]:
+        if not self._lazy:
+            return super().get_song_fpath(song_id)
+        rows = self._query('SELECT fpath FROM songs WHERE id = ?', (song_id,))
+        return rows[0][0] if rows else None
@@ -8,19 +8,50 @@ class LibraryRenderer(Renderer):
         self.albums = albums
         self.artists = artists
 
+        self._songs_model = None
+
     async def render(self):
         self.meta_widget.show()
         self.tabbar.show()
         self.tabbar.library_mode()
 
         # render songs
-        self.show_songs(reader=wrap(self.songs), show_count=True)
+        self._show_songs()
 
         # bind signals
         self.toolbar.filter_albums_needed.connect(
             lambda types: self.albums_table.model().filter_by_types(types))
-        self.tabbar.show_songs_needed.connect(
-            lambda: self.show_songs(reader=wrap(self.songs),
-                                    show_count=True))
+        self.tabbar.show_songs_needed.connect(self._show_songs)
         self.tabbar.show_albums_needed.connect(lambda: self.show_albums(self.albums))
         self.tabbar.show_artists_needed.connect(lambda: self.show_artists(self.artists))
+
+    def _show_songs(self):
+        self.show_songs(reader=wrap(self.songs), show_count=True)
+        self._songs_model = self.songs_table.model().sourceModel()
+
+    def update_library(self, added, removed, albums, artists):
+        """Update the shown library when some songs are added or removed.
+
+        Rows of the songs table are updated in place, instead of rendering
+        the whole page again.
+
+        .. versionadded:: 5.2
+        """
+        removed_ids = {song.identifier for song in removed}
+        self.songs = [song for song in self.songs
+                      if song.identifier not in removed_ids] + list(added)
+        self.albums = albums
+        self.artists = artists
+
+        current_table = self.container.current_table
+        if current_table is self.songs_table:
+            model = self.songs_table.model()
+            if model is not None and model.sourceModel() is self._songs_model \
+               and self._songs_model.replace_reader(wrap(self.songs), removed):
+                self.meta_widget.songs_count = len(self.songs)
+            else:
+                self._show_songs()
+        elif current_table is self.albums_table:
+            self.show_albums(self.albums)
+        elif current_table is self.artists_table:
+            self.show_artists(self.artists)
@@ -0,0 +1,146 @@
+"""
+Watch music folders and report changed media files.
+
+When watchdog is installed, filesystem events (inotify on Linux) are used.
+Otherwise, the music folders are polled periodically and files are compared
+by their fingerprints.
+"""
+
+import logging
+import os
+import threading
+
+from .db import scan_directory, stat_fingerprint
+
+
+logger = logging.getLogger(__name__)
+
+
+def can_use_watchdog():
+    try:
+        import watchdog  # noqa
+    except ImportError:
+        return False
+    return True
+
+
+class Watcher:
+    """
+    Watcher calls `callback` with a set of changed file paths. Paths of
+    added, changed and removed files are all reported, the callback should
+    check whether a file still exists.
+
+    Events are debounced: the callback is called when no new event
+    comes for `debounce` seconds, so that copying a whole album results
+    in one batch instead of many.
+    """
+
+    def __init__(self, paths, exts, depth, callback, debounce=2, poll_interval=60):
+        self._paths = paths
+        self._exts = exts
+        self._depth = depth
+        self._callback = callback
+        self._debounce = debounce
+        self._poll_interval = poll_interval
+
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._timer = None
+        self._observer = None
+        self._stopped = threading.Event()
+
+    def is_media_file(self, fpath):
+        return fpath.split('.')[-1] in self._exts
+
+    def is_within_depth(self, fpath):
+        """Check if the file is in a music folder and not deeper than `depth`.
+
+        watchdog watches the music folders recursively, so the files which are
+        ignored by scanning are filtered out here, like `scan_directory` does.
+        """
+        fpath = os.path.abspath(fpath)
+        for path in self._paths:
+            path = os.path.abspath(path)
+            if os.path.commonpath([path, fpath]) != path:
+                continue
+            dirs = os.path.relpath(os.path.dirname(fpath), path)
+            if dirs == '.' or dirs.count(os.sep) < self._depth:
+                return True
+        return False
+
+    def start(self):
+        if can_use_watchdog():
+            self._start_observer()
+        else:
+            logger.info('watchdog is not installed, poll music folders instead')
+            threading.Thread(target=self._poll, daemon=True,
+                             name='local-watcher').start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._observer is not None:
+            self._observer.stop()
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+
+    def _start_observer(self):
+        from watchdog.observers import Observer  # noqa
+        from watchdog.events import FileSystemEventHandler  # noqa
+
+        watcher = self
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.is_directory:
+                    return
+                paths = [event.src_path, getattr(event, 'dest_path', '')]
+                watcher.on_paths_changed(
+                    [os.fsdecode(p) for p in paths if p])
+
+        self._observer = Observer()
+        for path in self._paths:
+            if os.path.isdir(path):
+                self._observer.schedule(Handler(), path, recursive=True)
+        self._observer.daemon = True
+        self._observer.start()
+
+    def on_paths_changed(self, fpaths):
+        fpaths = [fpath for fpath in fpaths
+                  if self.is_media_file(fpath) and self.is_within_depth(fpath)]
+        if not fpaths:
+            return
+        with self._lock:
+            self._pending.update(fpaths)
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self._debounce, self._flush_pending)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_pending(self):
+        with self._lock:
+            fpaths, self._pending = self._pending, set()
+            self._timer = None
+        if fpaths and not self._stopped.is_set():
+            try:
+                self._callback(fpaths)
+            except:  # noqa
+                logger.exception('handle changed files failed')
+
+    def _snapshot(self):
+        snapshot = {}
+        for directory in self._paths:
+            for fpath in scan_directory(directory, self._exts, self._depth):
+                snapshot[fpath] = stat_fingerprint(fpath)
+        return snapshot
+
+    def _poll(self):
+        old = self._snapshot()
+        while not self._stopped.wait(self._poll_interval):
+            new = self._snapshot()
+            changed = {fpath for fpath in old.keys() | new.keys()
+                       if old.get(fpath) != new.get(fpath)}
+            old = new
+            if changed:
+                self.on_paths_changed(changed)
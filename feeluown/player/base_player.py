@@ -149,6 +149,27 @@ class AbstractPlayer(metaclass=ABCMeta):
         :param metadata: metadata for the media
         """
 
+    def preload(self, media) -> bool:
+        """preload the media, so that it is played right after the current one
+
+        :return: False if the player does not support preloading the media.
+
+        .. versionadded:: 5.2
+        """
+        return False
+
+    @property
+    def preloaded_media(self):
+        """the media which is preloaded by :meth:`preload`"""
+        return None
+
+    def play_preloaded(self, media, metadata=None):
+        """use the preloaded media as the current media
+
+        The default implementation simply plays the media.
+        """
+        self.play(media, metadata=metadata)
+
     @abstractmethod
     def set_play_range(self, start=None, end=None):
         pass
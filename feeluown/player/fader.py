@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import math
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# k: factor between 0 and 1, to represent tick/fade_time
+def fade_curve(k: float, fade_in: bool) -> float:
+
+    def sigmoid(x: float) -> float:
+        return math.pow(1 + math.pow(math.e, -11.4514 * (x - 0.5)), -1)
+
+    if fade_in:
+        return sigmoid(k)
+    else:
+        return 1 - sigmoid(k)
+
+
+class Fader:
+    """Fade the volume in coarse-grained steps on the asyncio event loop.
+
+    The fader changes a volume factor between 0 and 1, and calls
+    `on_factor_changed` with the new factor about every `interval` seconds.
+    A new fade replaces the current one and starts from the current factor,
+    so toggling quickly does not make the volume jump.
+
+    Methods are thread safe, fading steps always run on the event loop.
+    When there is no event loop, the factor is changed immediately.
+    """
+
+    interval = 0.03
+
+    def __init__(self,
+                 on_factor_changed: Callable[[float], None],
+                 duration_ms: int,
+                 loop: Optional[asyncio.AbstractEventLoop] = None):
+        self._on_factor_changed = on_factor_changed
+        self._duration = duration_ms / 1000
+        self._loop = loop
+        self.factor = 1.0
+        self._handle: Optional[asyncio.Handle] = None
+        # Increased when a fade is requested or cancelled, so that a fade
+        # which is scheduled from another thread is dropped when it is stale.
+        self._generation = 0
+
+    @property
+    def is_fading(self):
+        return self._handle is not None
+
+    def fade_in(self, on_finished=None):
+        self.start(1, on_finished)
+
+    def fade_out(self, on_finished=None):
+        self.start(0, on_finished)
+
+    def start(self, target: float, on_finished: Optional[Callable] = None):
+        self._generation += 1
+        generation = self._generation
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is not None and loop is self._loop:
+            self._start(target, on_finished, generation)
+        elif self._loop is not None and self._loop.is_running():
+            self._loop.call_soon_threadsafe(
+                self._start, target, on_finished, generation)
+        elif loop is not None:
+            self._loop = loop
+            self._start(target, on_finished, generation)
+        else:
+            self._set_factor(target)
+            if on_finished is not None:
+                on_finished()
+
+    def reset(self, factor: float):
+        """Cancel the current fade and set the factor immediately."""
+        self.cancel()
+        self._set_factor(factor)
+
+    def cancel(self):
+        """Cancel the current fade, and its `on_finished` is not called."""
+        self._generation += 1
+        self._cancel_handle()
+
+    def _cancel_handle(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _start(self, target, on_finished, generation):
+        if generation != self._generation:
+            return
+        self._cancel_handle()
+        assert self._loop is not None
+        begin, factor = self._loop.time(), self.factor
+        # A partial fade takes partial time.
+        duration = self._duration * abs(target - factor)
+        fade_in = target > factor
+
+        def step():
+            assert self._loop is not None
+            k = (self._loop.time() - begin) / duration if duration > 0 else 1
+            if k >= 1:
+                self._handle = None
+                self._set_factor(target)
+                if on_finished is not None:
+                    on_finished()
+                return
+            curve = fade_curve(k, fade_in=True)
+            self._set_factor(factor + (target - factor) * curve)
+            self._handle = self._loop.call_later(self.interval, step)
+
+        logger.debug(f'fade {"in" if fade_in else "out"} to {target} in {duration}s')
+        step()
+
+    def _set_factor(self, factor):
+        self.factor = factor
+        self._on_factor_changed(factor)
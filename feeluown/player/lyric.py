@@ -1,10 +1,12 @@
 from __future__ import annotations
+import asyncio
 import re
 import logging
-from typing import Dict, Optional, TYPE_CHECKING
+from bisect import bisect_right
+from typing import Dict, Optional, Tuple, TYPE_CHECKING
 from collections import namedtuple, OrderedDict
 
-from feeluown.library import LyricModel
+from feeluown.library import LyricModel, reverse
 from feeluown.utils.aio import run_fn
 from feeluown.utils.dispatch import Signal
 
@@ -13,6 +15,8 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+_SENTENCE_PATTERN = re.compile(r'\[(\d+(:\d+){0,2}([:\.]\d+)?)\]')
+
 
 def find_previous(element, list_):
     """
@@ -28,21 +32,13 @@ def find_previous(element, list_):
     (1, 0)
     >>> find_previous(3, [1, 2])
     (2, 1)
+    >>> find_previous(0, [])
+    (None, None)
     """
-    length = len(list_)
-    for index, current in enumerate(list_):
-        # current is the last element
-        if length - 1 == index:
-            return current, index
-
-        # current is the first element
-        if index == 0:
-            if element < current:
-                return None, None
-
-        if current <= element < list_[index+1]:
-            return current, index
-    return None, None
+    index = bisect_right(list_, element) - 1
+    if index < 0:
+        return None, None
+    return list_[index], index
 
 
 def parse_lyric_text(content: str) -> Dict[int, str]:
@@ -73,10 +69,9 @@ def parse_lyric_text(content: str) -> Dict[int, str]:
         return mileseconds
 
     ms_sentence_map = OrderedDict()
-    sentence_pattern = re.compile(r'\[(\d+(:\d+){0,2}([:\.]\d+)?)\]')
     lines = content.splitlines()
     for line in lines:
-        m = sentence_pattern.search(line, 0)
+        m = _SENTENCE_PATTERN.search(line, 0)
         sentence = line
         time_list = []
         while m:
@@ -84,7 +79,7 @@ def parse_lyric_text(content: str) -> Dict[int, str]:
             t = to_mileseconds(time_str)
             time_list.append(t)
             sentence = sentence[m.end():]
-            m = sentence_pattern.search(sentence, 0)
+            m = _SENTENCE_PATTERN.search(sentence, 0)
         for t in time_list:
             ms_sentence_map[t] = sentence
     ms_sentence_map = OrderedDict(sorted(ms_sentence_map.items(), key=lambda x: x[0]))
@@ -95,16 +90,27 @@ Line = namedtuple('Line', ['origin', 'trans', 'has_trans'])
 
 
 class Lyric:
+    """Lyric timeline
+
+    Lines are looked up by bisecting the sorted positions. Since the
+    position usually moves forward, the current index is tracked and
+    the current line and the next line are checked first.
+    """
+
     def __init__(self, pos_s_map: OrderedDict):
         self._pos_s_map = pos_s_map
         self._pos_list = list(self._pos_s_map.keys())
-        self._pos = 0
+        self._s_list = list(self._pos_s_map.values())
+        self.reset()
+
+    def reset(self):
+        """Reset the current position."""
         self._index: Optional[int] = None
         self._current_s = ''
 
     @property
     def lines(self):
-        return list(self._pos_s_map.values())
+        return list(self._s_list)
 
     @classmethod
     def from_content(cls, content):
@@ -118,11 +124,22 @@ class Lyric:
     def current_s(self):
         return self._current_s
 
+    def _find_index(self, ms) -> Optional[int]:
+        pos_list = self._pos_list
+        index = self._index
+        if index is not None:
+            # Check the current line and the next line at first.
+            for i in (index, index + 1):
+                if i < len(pos_list) and pos_list[i] <= ms and \
+                        (i + 1 == len(pos_list) or ms < pos_list[i + 1]):
+                    return i
+        _, index = find_previous(ms, pos_list)
+        return index
+
     def update_position(self, pos):
-        pos, index = find_previous(pos*1000 + 300, self._pos_list)
-        if pos is not None and pos != self._pos:
-            self._current_s = self._pos_s_map[pos]
-            self._pos = pos
+        index = self._find_index(pos*1000 + 300)
+        if index is not None and index != self._index:
+            self._current_s = self._s_list[index]
             self._index = index
             return self._current_s, True
         return self._current_s, False
@@ -139,7 +156,16 @@ class LiveLyric:
         live_lyric = LiveLyric()
         player.song_changed.connect(live_lyric.on_song_changed)
         player.position_change.connect(live_lyric.on_position_changed)
+
+    Parsed lyrics of recently played songs are cached, so that a song
+    which is played again does not need to be fetched and parsed again.
+    Songs without lyric and failed fetches are not cached.
+    Lyrics of the next song in the playlist are prefetched into the cache
+    when the song is changed.
     """
+
+    MAX_CACHED_LYRICS = 20
+
     def __init__(self, app: App):
         """
 
@@ -165,6 +191,13 @@ class LiveLyric:
         self._current_line: Line = Line('', '', False)
         self.line_changed = Signal()
 
+        self._song_uri: Optional[str] = None
+        # {song uri: (lyric, trans_lyric)}, ordered from least to most
+        # recently used.
+        self._cache: OrderedDict[str, Tuple[Optional[Lyric], Optional[Lyric]]] = \
+            OrderedDict()
+        self._fetching: Dict[str, asyncio.Future] = {}  # {song uri: future}
+
     @property
     def current_lyrics(self):
         # Note that more lyric may be return in the future, for example, KTV lyric.
@@ -209,25 +242,97 @@ class LiveLyric:
 
     def on_song_changed(self, song):
         if song is None:
+            self._song_uri = None
             self.set_lyric(None)
             return
 
-        def cb(future):
-            try:
-                lyric = future.result()
-            except:  # noqa
-                logger.exception('get lyric failed')
-                lyric = None
-            self.set_lyric(lyric)
-
-        future = run_fn(self._app.library.song_get_lyric, song)
-        future.add_done_callback(cb)
-
-    def set_lyric(self, model: Optional[LyricModel]):
+        uri = self._song_uri = reverse(song)
+        lyrics = self._get_cached_lyrics(uri)
+        if lyrics is not None:
+            self._set_lyrics(*lyrics)
+        else:
+            def cb(future):
+                if future.cancelled() or future.exception() is not None:
+                    lyrics = (None, None)
+                else:
+                    lyrics = future.result()
+                # The song may be changed when the lyric is being fetched.
+                if self._song_uri == uri:
+                    self._set_lyrics(*lyrics)
+
+            self._get_fetching_future(song, uri).add_done_callback(cb)
+        self._prefetch_next_song()
+
+    def _prefetch_next_song(self):
+        """Fetch lyrics of the next song, so that they are ready when
+        the next song starts to play.
+        """
+        song = self._app.playlist.next_song
+        if song is None:
+            return
+        uri = reverse(song)
+        if uri not in self._cache:
+            logger.debug(f'prefetch lyrics for {uri}')
+            self._get_fetching_future(song, uri)
+
+    def _get_fetching_future(self, song, uri):
+        """Fetch lyrics in background. A song is fetched only once when it is
+        being fetched.
+        """
+        future = self._fetching.get(uri)
+        if future is None:
+            future = run_fn(self._fetch_lyrics, song)
+            self._fetching[uri] = future
+            future.add_done_callback(lambda f: self._on_lyrics_fetched(uri, f))
+        return future
+
+    def _on_lyrics_fetched(self, uri, future):
+        self._fetching.pop(uri, None)
+        if future.cancelled():
+            return
+        try:
+            lyrics = future.result()
+        except:  # noqa
+            logger.exception('get lyric failed')
+        else:
+            # The song may have no lyric yet, or the provider failed to fetch
+            # it and returned nothing, so the empty result is not cached
+            # and the lyric is fetched again next time.
+            if lyrics[0] is not None:
+                self._cache_lyrics(uri, lyrics)
+
+    def _fetch_lyrics(self, song) -> Tuple[Optional[Lyric], Optional[Lyric]]:
+        """Fetch and parse the lyrics, it runs in a worker thread."""
+        return self._parse_lyric_model(self._app.library.song_get_lyric(song))
+
+    def _get_cached_lyrics(self, uri):
+        lyrics = self._cache.get(uri)
+        if lyrics is not None:
+            self._cache.move_to_end(uri)
+        return lyrics
+
+    def _cache_lyrics(self, uri, lyrics):
+        self._cache[uri] = lyrics
+        self._cache.move_to_end(uri)
+        while len(self._cache) > self.MAX_CACHED_LYRICS:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def _parse_lyric_model(model: Optional[LyricModel]):
         if model is not None and model.content:
-            self._lyric = Lyric.from_content(model.content)
-            self._trans_lyric = Lyric.from_content(model.trans_content) \
+            lyric = Lyric.from_content(model.content)
+            trans_lyric = Lyric.from_content(model.trans_content) \
                 if model.trans_content else None
-        else:
-            self._lyric = self._trans_lyric = None
+            return lyric, trans_lyric
+        return None, None
+
+    def set_lyric(self, model: Optional[LyricModel]):
+        self._set_lyrics(*self._parse_lyric_model(model))
+
+    def _set_lyrics(self, lyric: Optional[Lyric], trans_lyric: Optional[Lyric]):
+        # Cached lyrics may have been used before.
+        for each in (lyric, trans_lyric):
+            if each is not None:
+                each.reset()
+        self._lyric, self._trans_lyric = lyric, trans_lyric
         self.lyrics_changed.emit(self._lyric, self._trans_lyric)
@@ -1,9 +1,7 @@
+import asyncio
 import locale
 import logging
-import time
-import math
-import os
-import sys
+from typing import Optional
 
 from feeluown.mpv import (  # type: ignore
     MPV,
@@ -15,10 +13,10 @@ from feeluown.mpv import (  # type: ignore
     ErrorCode,
 )
 
-from threading import Thread, RLock
 from feeluown.utils.dispatch import Signal
 from feeluown.media import Media, VideoAudioManifest
 from .base_player import AbstractPlayer, State
+from .fader import Fader, fade_curve  # noqa
 from .metadata import MetadataFields, Metadata
 
 logger = logging.getLogger(__name__)
@@ -40,10 +38,16 @@ class MpvPlayer(AbstractPlayer):
         winid=None,
         fade=False,
         fade_time_ms=500,
+        fade_tracks=False,
         **kwargs
     ):
         """
         :param _: keep this arg to keep backward compatibility
+        :param fade: fade in and out on resume and pause
+        :param fade_tracks: fade out the end of a media and fade in the next one
+
+        .. versionadded:: 5.2
+           The *fade_tracks* parameter.
         """
         super().__init__(**kwargs)
         # https://github.com/cosven/FeelUOwn/issues/246
@@ -76,6 +80,21 @@ class MpvPlayer(AbstractPlayer):
             self._mpv.handle, b'user-agent', b'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'
         )
 
+        self.do_fade = fade
+        self.fade_tracks = fade_tracks
+        self.fade_time_ms = fade_time_ms
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        # The fader changes mpv volume directly, the `volume` property is not
+        # changed, so that `volume_changed` is not emitted while fading.
+        self._fader = Fader(self._on_fade_factor_changed, fade_time_ms, loop)
+        # Whether the current media is fading out before it ends.
+        self._fading_out_tail = False
+        #: The media which is appended to mpv's playlist, see :meth:`preload`.
+        self._preloaded_media: Optional[Media] = None
+
         #: if video_format changes to None, there is no video available
         self.video_format_changed = Signal()  # Optional[str]
         self.audio_bitrate_changed = Signal()  # Optional[int], for example: 128001
@@ -101,11 +120,6 @@ class MpvPlayer(AbstractPlayer):
         # because in that case `pause()` set status immediately
         self.pausing = False
 
-        self.do_fade = fade
-        if self.do_fade:
-            self.fade_lock = RLock()
-            self.fade_time_ms = fade_time_ms
-
     def shutdown(self):
         # The mpv has already been terminated.
         # The mpv can't terminate twice.
@@ -130,6 +144,8 @@ class MpvPlayer(AbstractPlayer):
             self._set_http_headers(media.http_headers)
             self._set_http_proxy(media.http_proxy)
             self._stop_mpv()
+            if self.do_fade or self.fade_tracks:
+                self._reset_fade()
             if media.manifest is None:
                 url = media.url
                 # Clear playlist before play next song,
@@ -156,6 +172,59 @@ class MpvPlayer(AbstractPlayer):
                     self._mpv.play(audio_url)
             else:
                 assert False, 'Unknown manifest'
+        self._preloaded_media = None
+        self._set_current_media(media, metadata)
+
+    def preload(self, media) -> bool:
+        """Append the media to mpv's playlist, so that mpv plays it right after
+        the current media ends, without any gap.
+
+        Call :meth:`play_preloaded` when the current media is finished.
+
+        :return: False if the media can't be preloaded.
+        """
+        current_media = self._current_media
+        if not isinstance(media, Media) or media.manifest is not None \
+                or not isinstance(current_media, Media):
+            return False
+        # HTTP headers and proxy are global options of mpv, they can't be
+        # changed when the current media is playing.
+        if (media.http_headers or {}) != (current_media.http_headers or {}) \
+                or media.http_proxy != current_media.http_proxy:
+            return False
+        self.clear_preloaded()
+        logger.debug("Player preloads: '%s'", media)
+        self._mpv.playlist_append(media.url)
+        self._preloaded_media = media
+        return True
+
+    def clear_preloaded(self):
+        if self._preloaded_media is not None:
+            # Remove all playlist entries except the current one.
+            self._mpv.playlist_clear()
+            self._preloaded_media = None
+
+    @property
+    def preloaded_media(self) -> Optional[Media]:
+        return self._preloaded_media
+
+    def play_preloaded(self, media, metadata=None):
+        """Use the preloaded media as the current media.
+
+        mpv has already started to play the preloaded media, so it only
+        updates the current media and emits signals. If the media is not
+        the preloaded one, it is played normally.
+        """
+        if media is not self._preloaded_media:
+            self.play(media, metadata=metadata)
+            return
+        self._preloaded_media = None
+        self.media_about_to_changed.emit(self._current_media, media)
+        if self.do_fade or self.fade_tracks:
+            self._reset_fade()
+        self._set_current_media(media, metadata)
+
+    def _set_current_media(self, media, metadata):
         self._current_media = media
         self.media_changed.emit(media)
         if metadata is None:
@@ -178,48 +247,40 @@ class MpvPlayer(AbstractPlayer):
             self.seeked.emit(start)
         _mpv_set_option_string(self._mpv.handle, b'end', bytes(end_str, 'utf-8'))
 
-    def set_volume(self, max_volume: int, fade_in: bool):
-        # Since Python 3.11 we have high resolution time.sleep()
-        if sys.version_info.minor >= 11 or sys.version_info.major > 3:
-            interval = 0.001
+    def _reset_fade(self):
+        # Cancel fading out (for pausing or at the end) of the previous media.
+        self.pausing = False
+        self._fading_out_tail = False
+        if self.fade_tracks:
+            self._fader.reset(0)
+            self._fader.fade_in()
         else:
-            interval = 0.02 if os.name == "nt" else 0.01
-
-        freq = int(self.fade_time_ms / 1000 / interval)
+            self._fader.reset(1)
 
-        for _tick in range(freq):
-            new_volume = math.ceil(
-                fade_curve(_tick / freq, fade_in=fade_in) * max_volume
-            )
-            self.volume = new_volume
-            time.sleep(interval)
+    def _on_fade_factor_changed(self, factor):
+        self._mpv.volume = self.volume * factor
 
     def fade_in(self):
-        with self.fade_lock:
-            # skip fade-in on playing
-            if not self._mpv.pause:
-                return
-
-            max_volume = self.volume
-
-            self.volume = 0
-            self._resume()
-            self.set_volume(max_volume, fade_in=True)
+        # skip fade-in on playing
+        if not self._mpv.pause and not self.pausing:
+            return
+        self.pausing = False
+        if self._mpv.pause:
+            self._fader.reset(0)
+        self._resume()
+        self._fader.fade_in()
 
     def fade_out(self):
-        with self.fade_lock:
-            # skip fade-out on pause
-            if self._mpv.pause or self.pausing:
-                return
-
-            max_volume = self.volume
-            self.pausing = True
-
-            self.set_volume(max_volume, fade_in=False)
-            self._pause()
-
-            self.pausing = False
-            self.volume = max_volume
+        # skip fade-out on pause
+        if self._mpv.pause or self.pausing:
+            return
+        self.pausing = True
+        self._fader.fade_out(on_finished=self._on_faded_out)
+
+    def _on_faded_out(self):
+        self._pause()
+        self.pausing = False
+        self._fader.reset(1)
 
     def _resume(self):
         self._mpv.pause = False
@@ -231,13 +292,13 @@ class MpvPlayer(AbstractPlayer):
 
     def resume(self):
         if self.do_fade:
-            Thread(target=self.fade_in).start()
+            self.fade_in()
         else:
             self._resume()
 
     def pause(self):
         if self.do_fade:
-            Thread(target=self.fade_out).start()
+            self.fade_out()
         else:
             self._pause()
 
@@ -263,13 +324,17 @@ class MpvPlayer(AbstractPlayer):
             self._mpv.seek(position, reference='absolute')
             self._position = position
             self.seeked.emit(position)
+            if self._fading_out_tail:
+                # Seek back from the faded out tail.
+                self._fading_out_tail = False
+                self._fader.fade_in()
         else:
             logger.warning("can't set position when current media is empty")
 
     @AbstractPlayer.volume.setter  # type: ignore
     def volume(self, value):
         super(MpvPlayer, MpvPlayer).volume.__set__(self, value)
-        self._mpv.volume = self.volume
+        self._on_fade_factor_changed(self._fader.factor)
 
     @property
     def audio_bitrate(self):
@@ -296,6 +361,23 @@ class MpvPlayer(AbstractPlayer):
     def _on_position_changed(self, position):
         self._position = max(0, position or 0)
         self.position_changed.emit(position)
+        if self.fade_tracks:
+            self._fade_out_tail_if_needed()
+
+    def _fade_out_tail_if_needed(self):
+        """Fade out the last part of the media, and the next media fades in
+        when it is played. mpv plays one media at a time, so the two media
+        do not overlap.
+        """
+        if self._fading_out_tail or self.pausing or self.state != State.playing:
+            return
+        duration = self.duration
+        # Do not fade out short media, such as a sound effect.
+        if not duration or duration * 1000 < self.fade_time_ms * 4:
+            return
+        if (duration - self._position) * 1000 <= self.fade_time_ms:
+            self._fading_out_tail = True
+            self._fader.fade_out()
 
     def _on_duration_changed(self, duration):
         """listening to mpv duration change event"""
@@ -362,15 +444,3 @@ class MpvPlayer(AbstractPlayer):
 
     def __log_handler(self, loglevel, component, message):
         print('[{}] {}: {}'.format(loglevel, component, message))
-
-
-# k: factor between 0 and 1, to represent tick/fade_time
-def fade_curve(k: float, fade_in: bool) -> float:
-
-    def sigmoid(x: float) -> float:
-        return math.pow(1 + math.pow(math.e, -11.4514 * (x - 0.5)), -1)
-
-    if fade_in:
-        return sigmoid(k)
-    else:
-        return 1 - sigmoid(k)
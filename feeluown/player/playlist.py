@@ -8,6 +8,7 @@ from threading import Lock
 from feeluown.excs import ProviderIOError
 from feeluown.utils import aio
 from feeluown.utils.aio import run_fn, run_afn
+from feeluown.utils.cache import TTLCache
 from feeluown.utils.dispatch import Signal
 from feeluown.utils.utils import DedupList
 from feeluown.library import (
@@ -17,6 +18,7 @@ from feeluown.library import (
     VideoModel,
     ModelNotFound,
     BriefSongModel,
+    StandbyCache,
 )
 from feeluown.media import Media
 from feeluown.i18n import t
@@ -30,6 +32,19 @@ logger = logging.getLogger(__name__)
 TASK_SET_CURRENT_MODEL = "playlist.set_current_model"
 TASK_PLAY_MODEL = "playlist.play_model"
 TASK_PREPARE_MEDIA = "playlist.prepare_media"
+TASK_PRELOAD_NEXT_SONG = "playlist.preload_next_song"
+TASK_PREFETCH_MEDIA = "playlist.prefetch_media"
+
+#: Media urls of providers are usually signed and they expire after a while,
+#: prefetched media are used within this many seconds. Note that this is only
+#: a time-based eviction: the media does not tell when its url expires, and it
+#: is not validated before it is used. Keep it shorter than the url lifetime
+#: of the providers.
+MEDIA_CACHE_TTL = 5 * 60
+
+#: In gapless mode, the next song is preloaded when the current song has
+#: less than this many seconds left.
+GAPLESS_PRELOAD_SECONDS = 20
 
 
 class PlaybackMode(IntEnum):
@@ -100,10 +115,13 @@ class Playlist:
         songs=None,
         playback_mode=PlaybackMode.loop,
         audio_select_policy="hq<>",
+        standby_cache=None,
     ):
         """
         :param songs: list of :class:`feeluown.library.SongModel`
         :param playback_mode: :class:`feeluown.player.PlaybackMode`
+        :param standby_cache: :class:`feeluown.library.StandbyCache`, an in-memory
+            cache is used by default.
         """
         self._app = app
         self._metadata_mgr = MetadataAssembler(app)
@@ -174,7 +192,19 @@ class Playlist:
         #    The *play_model_handling* signal.
         self.play_model_stage_changed = Signal()
 
+        # The song whose next song is being preloaded, and the preloaded
+        # (song, media, metadata). Check ENABLE_GAPLESS_PLAYBACK for details.
+        self._preload_for = None
+        self._preloaded = None
+        # Media of the upcoming songs, {(song, audio_select_policy): media}.
+        # They are evicted after MEDIA_CACHE_TTL seconds.
+        # Check MEDIA_PREFETCH_COUNT for details.
+        self._media_cache = TTLCache(maxsize=16, ttl=MEDIA_CACHE_TTL)
+        # Standby of bad songs, so that standby is not searched again.
+        self._standby_cache = standby_cache or StandbyCache()
+
         self._app.player.media_finished.connect(self._on_media_finished)
+        self._app.player.position_changed.connect(self._on_position_changed)
         self.song_changed.connect(self._on_song_changed)
 
     @property
@@ -597,11 +627,106 @@ class Playlist:
         if self.playback_mode == PlaybackMode.one_loop:
             with self._queue_lock:
                 return self.set_existing_song_as_current_song(self.current_song)
-        else:
-            self.next()
+        with self._queue_lock:
+            preloaded, self._preloaded = self._preloaded, None
+            # The player has already started to play the preloaded media.
+            if preloaded is not None \
+                    and preloaded[1] is self._app.player.preloaded_media \
+                    and preloaded[0] == self._get_next_song_no_lock():
+                return self._app.task_mgr.run_afn_preemptive(
+                    self._a_set_preloaded_song,
+                    *preloaded,
+                    name=TASK_SET_CURRENT_MODEL,
+                )
+            return self._next_no_lock()
+
+    async def _a_set_preloaded_song(self, song, media, metadata):
+        self.set_current_song_with_media(song, media, metadata, preloaded=True)
+
+    def _on_position_changed(self, position):
+        """Preload the next song when the current one is about to end."""
+        song = self._current_song
+        if song is None or song is self._preload_for or not position \
+                or not self._app.config.ENABLE_GAPLESS_PLAYBACK:
+            return
+        duration = self._app.player.duration
+        if not duration or duration - position > GAPLESS_PRELOAD_SECONDS:
+            return
+        if self.watch_mode or self.playback_mode == PlaybackMode.one_loop:
+            return
+        self._preload_for = song
+        self._app.task_mgr.run_afn_preemptive(
+            self._a_preload_next_song, song, name=TASK_PRELOAD_NEXT_SONG
+        )
+
+    async def _a_preload_next_song(self, song):
+        with self._queue_lock:
+            next_song = self._get_next_song_no_lock()
+        if next_song is None or next_song == song:
+            return
+        try:
+            media = await self._prepare_media(next_song)
+        except Exception as e:  # noqa
+            logger.info(f"preload media for {next_song} failed: {e}")
+            return
+        metadata = await self._metadata_mgr.prepare_for_song(next_song)
+        # The current song may be changed when the media is being prepared.
+        if self._current_song is not song:
+            return
+        if self._app.player.preload(media):
+            logger.info(f"preloaded the next song: {next_song}")
+            self._preloaded = (next_song, media, metadata)
 
     def _on_song_changed(self, song):
         self._app.task_mgr.run_afn_preemptive(self._fetch_current_song_mv, song)
+        if song is not None and self._app.config.MEDIA_PREFETCH_COUNT > 0:
+            self._app.task_mgr.run_afn_preemptive(
+                self._a_prefetch_media, name=TASK_PREFETCH_MEDIA
+            )
+
+    def _get_next_songs_no_lock(self, count):
+        """Get at most `count` good songs which will be played after the
+        current song, in the order of the queue (shuffled or not).
+
+        Requires: acquire `_queue_lock` before calling this method.
+        """
+        current_song = self.current_song
+        if current_song is None or current_song not in self._queue:
+            base = 0
+        else:
+            base = self._queue.index(current_song) + 1
+        length = len(self._queue)
+        end = base + length if self.playback_mode != PlaybackMode.sequential \
+            else length
+        songs = []
+        for i in range(base, end):
+            song = self._queue[i % length]
+            if song == current_song or song in self._bad_songs:
+                continue
+            songs.append(song)
+            if len(songs) >= count:
+                break
+        return songs
+
+    async def _a_prefetch_media(self):
+        """Prepare media of the upcoming songs in background."""
+        with self._queue_lock:
+            songs = self._get_next_songs_no_lock(
+                self._app.config.MEDIA_PREFETCH_COUNT
+            )
+        policy = self.audio_select_policy
+        for song in songs:
+            if (song, policy) in self._media_cache:
+                continue
+            try:
+                media = await run_fn(
+                    self._app.library.song_prepare_media, song, policy
+                )
+            except Exception as e:  # noqa
+                logger.debug(f"prefetch media for {song} failed: {e}")
+                continue
+            logger.debug(f"prefetched media for {song}")
+            self._media_cache.set((song, policy), media)
 
     async def _fetch_current_song_mv(self, song):
         if song is None:
@@ -713,31 +838,58 @@ class Playlist:
         return
 
     async def find_and_use_standby(self, song):
+        hit, standby = self._standby_cache.get(song)
+        if hit and standby is None:
+            logger.info(f"{song} song standby not found (cached)")
+            self._app.show_msg(t("track-standby-unavailable", track=song))
+            return song, None
+        if hit:
+            media = await self._app.library.a_song_prepare_media_no_exc(
+                standby, self.audio_select_policy
+            )
+            if media is not None:
+                logger.info(f"song standby was found in {standby.source} (cached)")
+                return self._use_standby(song, standby, media)
+            # The standby may be unavailable now, search again.
+            self._standby_cache.remove(song)
+
         self._app.show_msg(t("track-standby-try", track=song))
         logger.info(f"try to find standby from other providers for {song}")
-        standby_candidates = await self._app.library.a_list_song_standby_v2(
-            song, self.audio_select_policy
+        standby_candidates, complete = await self._app.library.a_list_song_standby_v2(
+            song, self.audio_select_policy, return_complete=True
         )
         if standby_candidates:
             standby, media = standby_candidates[0]
             logger.info(f"song standby was found in {standby.source} ✅")
-            self._app.show_msg(
-                t("track-standby-found", track=song, standby=standby.source)
-            )
-            # Insert the standby song after the song
-            # TODO: Perhaps we can optimize here using the `self.insert` function?
-            with self._queue_lock:
-                if song in self._queue and standby not in self._queue:
-                    index = self._queue.index(song)
-                    self._queue_insert(index + 1, standby)
-                    self.songs_added.emit(index + 1, 1)
-            return standby, media
+            self._standby_cache.set(song, standby)
+            await run_fn(self._standby_cache.save)
+            return self._use_standby(song, standby, media)
 
         logger.info(f"{song} song standby not found")
+        # The search may be timeout or failed, and it is worth searching again.
+        if complete:
+            self._standby_cache.set(song, None)
+            await run_fn(self._standby_cache.save)
         self._app.show_msg(t("track-standby-unavailable", track=song))
         return song, None
 
-    def set_current_song_with_media(self, song, media, metadata=None):
+    def _use_standby(self, song, standby, media):
+        self._app.show_msg(
+            t("track-standby-found", track=song, standby=standby.source)
+        )
+        # Insert the standby song after the song
+        # TODO: Perhaps we can optimize here using the `self.insert` function?
+        with self._queue_lock:
+            if song in self._queue and standby not in self._queue:
+                index = self._queue.index(song)
+                self._queue_insert(index + 1, standby)
+                self.songs_added.emit(index + 1, 1)
+        return standby, media
+
+    def set_current_song_with_media(self, song, media, metadata=None, preloaded=False):
+        """
+        :param preloaded: the media is preloaded by the player.
+        """
         if song is None:
             self.set_current_song_none()
             return
@@ -745,6 +897,7 @@ class Playlist:
         with self._queue_lock:
             self.insert_after_current_song(song)
             self._current_song = song
+            self._preload_for = self._preloaded = None
             # TODO: There might be a problem here.
             # For example, how do we keep `current_song` consistent with `media`?
             self.song_changed.emit(song)
@@ -757,7 +910,10 @@ class Playlist:
             if not self._app.has_gui:
                 kwargs["video"] = False
             # TODO: set artwork field
-            self._app.player.play(media, metadata=metadata, **kwargs)
+            if preloaded:
+                self._app.player.play_preloaded(media, metadata=metadata)
+            else:
+                self._app.player.play(media, metadata=metadata, **kwargs)
 
     def set_current_song_none(self):
         """A special case of `set_current_song_with_media`."""
@@ -772,11 +928,13 @@ class Playlist:
             if mv_media:
                 return mv_media
             self._app.show_msg(t("music-video-not-avaliable"))
-        return await aio.run_fn(
-            self._app.library.song_prepare_media,
-            song,
-            self.audio_select_policy,
-        )
+        policy = self.audio_select_policy
+        # A prefetched media is used only once, in case that it is invalid.
+        media = self._media_cache.pop((song, policy))
+        if media is not None:
+            logger.debug(f"use prefetched media for {song}")
+            return media
+        return await aio.run_fn(self._app.library.song_prepare_media, song, policy)
 
     async def _prepare_mv_media(self, song) -> Optional[Media]:
         try:
@@ -1,8 +1,12 @@
 import sys
 import os
+import multiprocessing
 
 
 if __name__ == '__main__':
+    # Child processes of a process pool run the frozen executable.
+    multiprocessing.freeze_support()
+
     # Chdir first and then load feeluown, so that libmpv can be loaded correctly.
     # On macOS, the dir is changed to FeelUOwnX.app/Contents/Frameworks.
     if hasattr(sys, '_MEIPASS'):
@@ -1,4 +1,8 @@
-import copy
+from types import MappingProxyType
+
+
+# {id(mapping): {type: serializer_cls}}, see `_get_cls_by_type`.
+_DISPATCH_CACHES = {}
 
 
 class SerializerError(Exception):
@@ -23,6 +27,26 @@ class DeserializerError(Exception):
     pass
 
 
+def _get_cls_by_type(mapping, obj):
+    """Find the serializer class of the object in mapping.
+
+    The result is cached by the type of the object, so that the mapping
+    is not scanned with isinstance for every object.
+    """
+    type_ = obj.__class__
+    cache = _DISPATCH_CACHES.setdefault(id(mapping), {})
+    try:
+        return cache[type_]
+    except KeyError:
+        pass
+    for model_cls, serialize_cls in mapping.items():
+        # FIXME: remove me when model v2 has its own serializer
+        if isinstance(obj, model_cls):
+            cache[type_] = serialize_cls
+            return serialize_cls
+    return None
+
+
 class Serializer:
     """Serializer abstract base class
 
@@ -60,8 +84,11 @@ class Serializer:
 
         - fetch: if this option is specified, the attribute value
           should be authoritative.
+
+        Options are read-only, they are shared with the serializers created
+        by this serializer.
         """
-        self.options = copy.deepcopy(options)
+        self.options = MappingProxyType(options)
 
     def serialize(self, obj):
         serializer_cls = self.get_serializer_cls(obj)
@@ -69,11 +96,10 @@ class Serializer:
 
     @classmethod
     def get_serializer_cls(cls, model):
-        for model_cls, serialize_cls in cls._mapping.items():
-            # FIXME: remove me when model v2 has its own serializer
-            if isinstance(model, model_cls):
-                return serialize_cls
-        raise SerializerError(f"no serializer for {type(model)}")
+        serialize_cls = _get_cls_by_type(cls._mapping, model)
+        if serialize_cls is None:
+            raise SerializerError(f"no serializer for {type(model)}")
+        return serialize_cls
 
 
 class Deserializer:
@@ -97,7 +123,7 @@ class Deserializer:
         - fetch: if this option is specified, the attribute value
           should be authoritative.
         """
-        self.options = copy.deepcopy(options)
+        self.options = MappingProxyType(options)
 
     def deserialize(self, obj):
         deserializer_cls = self.get_deserializer_cls(obj)
@@ -105,11 +131,10 @@ class Deserializer:
 
     @classmethod
     def get_deserializer_cls(cls, model):
-        for model_cls, serialize_cls in cls._mapping.items():
-            # FIXME: remove me when model v2 has its own serializer
-            if isinstance(model, model_cls):
-                return serialize_cls
-        raise SerializerError(f"no serializer for {type(model)}")
+        serialize_cls = _get_cls_by_type(cls._mapping, model)
+        if serialize_cls is None:
+            raise SerializerError(f"no serializer for {type(model)}")
+        return serialize_cls
 
 
 class SerializerMeta(type):
@@ -129,6 +154,8 @@ class SerializerMeta(type):
         if Meta:
             for type_ in Meta.types:
                 mapping[type_] = klass
+            # The mapping is changed, so the dispatch cache is outdated.
+            _DISPATCH_CACHES.pop(id(mapping), None)
             fields = getattr(Meta, 'fields', None)
             if fields is not None:
                 klass._declared_fields = fields
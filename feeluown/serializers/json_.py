@@ -1,5 +1,8 @@
 import json
-from .python import PythonSerializer
+from .python import PythonSerializer, ListSerializer
+
+#: Items are joined into a chunk until the chunk has this many characters.
+JSON_CHUNK_SIZE = 64 * 1024
 
 
 class JsonSerializer(PythonSerializer):
@@ -17,3 +20,34 @@ class JsonSerializer(PythonSerializer):
     def serialize(self, obj):
         dict_ = super().serialize(obj)
         return json.dumps(dict_, **self.dump_options)
+
+    def serialize_iter(self, obj, chunk_size=JSON_CHUNK_SIZE):
+        """Serialize the object and yield the json text chunk by chunk.
+
+        Items of a list are serialized and encoded one by one, so the whole
+        json text and the whole python structure are never built at once.
+        The joined chunks equal the result of :meth:`serialize`.
+
+        .. versionadded:: 5.2
+        """
+        # The json text with indent is hard to build incrementally.
+        if not isinstance(obj, list) or self.dump_options.get('indent') is not None:
+            yield self.serialize(obj)
+            return
+
+        options = dict(self.dump_options)
+        encoder = options.pop('cls', None) or json.JSONEncoder
+        encode = encoder(**options).encode
+        item_separator = options.get('separators', (', ', ': '))[0]
+        chunk, size = ['['], 1
+        for i, item in enumerate(ListSerializer(**self.options).iter_serialize(obj)):
+            text = encode(item)
+            if i > 0:
+                chunk.append(item_separator)
+            chunk.append(text)
+            size += len(text)
+            if size >= chunk_size:
+                yield ''.join(chunk)
+                chunk, size = [], 0
+        chunk.append(']')
+        yield ''.join(chunk)
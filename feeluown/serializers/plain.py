@@ -23,12 +23,14 @@ fmt = formatter.format
 
 
 class ModelSerializerMixin:
-
-    def _get_items(self, model):
-        # initialize fields that need to be serialized
-        # if as_line option is set, we always use fields_display
-        modelcls = type(model)
-        fields = [field for field in model.model_fields
+    _fields_cache = {}  # {modelcls: fields}
+
+    @classmethod
+    def _get_fields(cls, modelcls):
+        fields = cls._fields_cache.get(modelcls)
+        if fields is not None:
+            return fields
+        fields = [field for field in modelcls.model_fields
                   if field not in BaseModel.model_fields]
         # Include properties.
         pydantic_fields = ("__values__", "fields", "__fields_set__",
@@ -37,6 +39,13 @@ class ModelSerializerMixin:
         fields += [prop for prop in dir(modelcls)
                    if isinstance(getattr(modelcls, prop), property)
                    and prop not in pydantic_fields]
+        cls._fields_cache[modelcls] = fields
+        return fields
+
+    def _get_items(self, model):
+        # initialize fields that need to be serialized
+        # if as_line option is set, we always use fields_display
+        fields = self._get_fields(type(model))
         items = [("provider", model.source),
                  ("identifier", str(model.identifier)),
                  ("uri", reverse(model))]
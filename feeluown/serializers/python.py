@@ -46,9 +46,12 @@ class PythonSerializer(Serializer):
 
     def serialize_items(self, items):
         json_ = {}
+        serializers = {}  # {serializer_cls: serializer}
         for key, value in items:
             serializer_cls = PythonSerializer.get_serializer_cls(value)
-            serializer = serializer_cls()
+            serializer = serializers.get(serializer_cls)
+            if serializer is None:
+                serializer = serializers[serializer_cls] = serializer_cls()
             json_[key] = serializer.serialize(value)
         return json_
 
@@ -75,14 +78,30 @@ class ListSerializer(PythonSerializer, metaclass=SerializerMeta):
         types = (list, )
 
     def serialize(self, list_):
+        return list(self.iter_serialize(list_))
+
+    def iter_serialize(self, list_):
+        """Serialize items one by one.
+
+        .. versionadded:: 5.2
+        """
         if not list_:
-            return []
-        result = []
+            return
+        item0 = list_[0]
+        type_ = item0.__class__
+        if all(item.__class__ is type_ for item in list_):
+            # Items usually have the same type, for example, songs of a playlist.
+            serializer = PythonSerializer.get_serializer_cls(item0)()
+            for item in list_:
+                yield serializer.serialize(item)
+            return
+        serializers = {}  # {serializer_cls: serializer}
         for item in list_:
             serializer_cls = PythonSerializer.get_serializer_cls(item)
-            serializer = serializer_cls()
-            result.append(serializer.serialize(item))
-        return result
+            serializer = serializers.get(serializer_cls)
+            if serializer is None:
+                serializer = serializers[serializer_cls] = serializer_cls()
+            yield serializer.serialize(item)
 
     def serialize_search_result_list(self, list_):
         from .objs import SearchPythonSerializer
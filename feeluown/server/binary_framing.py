@@ -0,0 +1,79 @@
+"""
+binary framing of the fuo protocol
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+A session can switch to the binary framing with ``set --wire-format msgpack``.
+After that, each request, response and pubsub message is a frame: a 4-byte
+big-endian length followed by a msgpack payload. A request is a map, so the
+server does not need to parse the text DSL::
+
+    {'cmd': 'search', 'args': ['zjl'], 'cmd_options': {}, 'options': {}}
+
+A response is ``{'code': 'OK', 'body': '...'}`` and a pubsub message is
+``{'topic': 'player.seeked', 'body': '...'}``. The body is the text which is
+serialized in the requested format, the same as in the text framing.
+
+.. versionadded:: 5.2
+"""
+
+import struct
+from typing import Optional
+
+from .data_structure import Request, Response
+from .excs import FuoProtocolError
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+#: Max size of the payload of a frame.
+MAX_FRAME_SIZE = 2 ** 24
+HEADER = struct.Struct('>I')
+
+
+def is_available():
+    return msgpack is not None
+
+
+def pack_frame(payload) -> bytes:
+    assert msgpack is not None
+    body = msgpack.packb(payload, use_bin_type=True)
+    return HEADER.pack(len(body)) + body
+
+
+def unpack_payload(body: bytes):
+    assert msgpack is not None
+    try:
+        return msgpack.unpackb(body, raw=False)
+    except (ValueError, msgpack.UnpackException) as e:
+        raise FuoProtocolError(f'invalid msgpack payload: {e}') from e
+
+
+def to_request(payload) -> Request:
+    """Build a request from a payload, and validate its fields.
+
+    >>> to_request({'cmd': 'show', 'args': ['fuo://']}).cmd_args
+    ['fuo://']
+    """
+    if not isinstance(payload, dict) or not isinstance(payload.get('cmd'), str):
+        raise FuoProtocolError('request should be a map with a string cmd')
+    args = payload.get('args') or []
+    cmd_options = payload.get('cmd_options') or {}
+    options = payload.get('options') or {}
+    if not isinstance(args, list) \
+       or not isinstance(cmd_options, dict) or not isinstance(options, dict):
+        raise FuoProtocolError('args should be a list and options should be maps')
+    return Request(payload['cmd'], args, cmd_options, options)
+
+
+def pack_response(resp: Response, req_id: Optional[int] = None) -> bytes:
+    payload = {'code': resp.code, 'body': ''.join(resp.iter_chunks())}
+    if req_id is not None:
+        payload['id'] = req_id
+    return pack_frame(payload)
+
+
+def pack_topic_msg(topic: str, msg: str) -> bytes:
+    return pack_frame({'topic': topic, 'body': msg})
@@ -6,6 +6,20 @@ class SessionOptions:
     # Always make the human-friendly protocol version as the default.
     rpc_version: str = '2.0'     # RPC protocol version.
     pubsub_version: str = '1.0'  # Pubsub protocol version.
+    # How the body of a response is framed, 'length' or 'chunked'.
+    #
+    # .. versionadded:: 5.2
+    ack_framing: str = 'length'
+    # Whether requests are handled concurrently, 'on' or 'off'. When it is on,
+    # the response line contains the id of the request.
+    #
+    # .. versionadded:: 5.2
+    pipeline: str = 'off'
+    # How requests and responses are encoded, 'text' or 'msgpack'.
+    # See :mod:`feeluown.server.binary_framing` for details.
+    #
+    # .. versionadded:: 5.2
+    wire_format: str = 'text'
 
 
 class Request:
@@ -30,9 +44,22 @@ class Request:
 
 
 class Response:
-    def __init__(self, ok=True, text='', req=None, options=None):
+    """
+    .. versionadded:: 5.2
+       The *chunks* parameter. When it is not None, the body is an iterable of
+       text chunks, and *text* is ignored.
+    """
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(self, ok=True, text='', req=None, options=None, chunks=None):
         self.code = 'OK' if ok else 'Oops'
         self.text = text
+        self.chunks = chunks
         self.options = options or {}
 
         self.req = req
+
+    def iter_chunks(self):
+        if self.chunks is None:
+            yield self.text
+        else:
+            yield from self.chunks
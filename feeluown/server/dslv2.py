@@ -7,12 +7,19 @@ as UNIX shell.
 'search'
 >>> req.cmd_args
 ['jaychou']
+
+Most requests are simple, such as ``status`` or ``play fuo://...``. They are
+parsed by a fast parser, which is driven by tables compiled from the argparse
+parsers, and it produces the same Request objects as argparse. The argparse
+parser is only used when the fast parser can't handle the request, for example,
+when the request is invalid and a helpful error message is needed.
 """
 
 import argparse
+import re
 import shlex
 import itertools
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 from feeluown.argparser import (
     create_fmt_parser,
@@ -23,7 +30,14 @@ from feeluown.server.data_structure import Request
 from feeluown.server.excs import FuoSyntaxError
 
 
+# Characters which have special meanings for shlex, as well as whitespaces
+# other than space and tab.
+_SHLEX_SPECIAL_CHARS = re.compile(r'[\'"\\#();<>|&]|[^ \t\S]')
+
+
 def tokenize(source):
+    if _SHLEX_SPECIAL_CHARS.search(source) is None:
+        return source.split()
     s = shlex.shlex(source, punctuation_chars=True, posix=True)
     s.whitespace_split = True
     try:
@@ -66,6 +80,127 @@ def create_dsl_parser():
     return parser
 
 
+class _CmdTable:
+    """Options and positionals of a cmd, compiled from its argparse parser."""
+
+    # Kinds of options which are supported by the fast parser.
+    STORE = 'store'
+    STORE_TRUE = 'store_true'
+    APPEND = 'append'
+
+    def __init__(self, subparser: argparse.ArgumentParser, req_option_names):
+        # pylint: disable=protected-access
+        #: Positionals, [(dest, required, default)]. None if it is not supported.
+        self.positionals: Optional[List[Tuple[str, bool, object]]] = []
+        #: {option_string: (kind, dest, choices)}, kind is None if unsupported.
+        self.options: Dict[str, Tuple[Optional[str], str, object]] = {}
+        self.defaults = {}
+        self.req_option_names = list(req_option_names)
+        self.cmd_option_names = []
+
+        for action in subparser._positionals._group_actions:
+            if action.nargs not in (None, '?') or action.choices is not None \
+               or action.type not in (None, str) or self.positionals is None:
+                self.positionals = None
+            else:
+                self.positionals.append((action.dest, action.nargs is None,
+                                         action.default))
+        for action in subparser._optionals._group_actions:
+            if action.dest == 'help':  # Ignore help action.
+                continue
+            if action.dest not in self.req_option_names:
+                self.cmd_option_names.append(action.dest)
+            self.defaults[action.dest] = action.default
+            kind: Optional[str] = None
+            if action.type in (None, str) and action.nargs is None:
+                if isinstance(action, argparse._StoreTrueAction):
+                    kind = self.STORE_TRUE
+                elif isinstance(action, argparse._AppendAction):
+                    kind = self.APPEND if action.default is None else None
+                elif isinstance(action, argparse._StoreAction):
+                    kind = self.STORE
+            for option_string in action.option_strings:
+                self.options[option_string] = (kind, action.dest, action.choices)
+        # Options of the request should be shared by all cmds.
+        if not set(self.req_option_names) <= set(self.defaults):
+            self.positionals = None
+
+    def parse(self, tokens) -> Optional[Tuple[list, dict, dict]]:
+        """Parse tokens (without the cmd name) to (cmd_args, cmd_options, options)
+
+        Return None when the tokens can't be handled. Only the simple patterns
+        are handled, so that the result is always same as argparse. For example,
+        positionals must be in front of options.
+        """
+        # pylint: disable=too-many-return-statements,too-many-branches
+        if self.positionals is None:
+            return None
+        values = self.defaults.copy()
+        cmd_args = []
+        has_option = False
+        i, length = 0, len(tokens)
+        while i < length:
+            token = tokens[i]
+            i += 1
+            if not token.startswith('-'):
+                # argparse handles a positional after options in a subtle way.
+                if has_option or len(cmd_args) >= len(self.positionals):
+                    return None
+                cmd_args.append(token)
+                continue
+            has_option = True
+            option_string, sep, value = token.partition('=')
+            kind, dest, choices = self.options.get(option_string, (None, None, None))
+            if kind is None:
+                return None
+            if kind == self.STORE_TRUE:
+                if sep:
+                    return None
+                values[dest] = True
+            else:
+                if not sep:
+                    if i >= length or tokens[i].startswith('-'):
+                        return None
+                    value = tokens[i]
+                    i += 1
+                if choices is not None and value not in choices:
+                    return None
+                if kind == self.APPEND:
+                    values[dest] = (values[dest] or []) + [value]
+                else:
+                    values[dest] = value
+        for dest, required, default in self.positionals[len(cmd_args):]:
+            if required:
+                return None
+            cmd_args.append(default)
+        cmd_options = {name: values[name] for name in self.cmd_option_names}
+        options = {name: values[name] for name in self.req_option_names}
+        return cmd_args, cmd_options, options
+
+
+_dsl_parser: Optional[ArgumentParserNoExitAndPrint] = None
+_cmd_tables: Dict[str, _CmdTable] = {}
+
+
+def _get_dsl_parser() -> ArgumentParserNoExitAndPrint:
+    """Get the dsl parser, and compile tables for the fast parser at the first time.
+
+    The parser is immutable after it is created, so it is shared.
+    """
+    # pylint: disable=protected-access,global-statement
+    global _dsl_parser
+    if _dsl_parser is None:
+        parser = create_dsl_parser()
+        req_option_names = [action.dest for action in create_fmt_parser()._actions]
+        for action in parser._actions:
+            if action.dest == 'cmd':
+                name_parser_map = action._name_parser_map  # type: ignore
+                for cmdname, subparser in name_parser_map.items():
+                    _cmd_tables[cmdname] = _CmdTable(subparser, req_option_names)
+        _dsl_parser = parser
+    return _dsl_parser
+
+
 class Parser:
     def __init__(self, source):
         self._source = source
@@ -76,7 +211,7 @@ class Parser:
         argparse have little public methods, so some protected methods are used.
         """
         # pylint: disable=too-many-locals,protected-access,too-many-branches
-        parser: ArgumentParserNoExitAndPrint = create_dsl_parser()
+        parser = _get_dsl_parser()
         tokens = tokenize(self._source)
 
         # Handle io_here token.
@@ -93,6 +228,18 @@ class Parser:
             elif token in ('<', '<<<'):
                 raise FuoSyntaxError('unknown token')
 
+        # Try the fast parser first.
+        table = _cmd_tables.get(tokens[0]) if tokens else None
+        if table is not None:
+            result = table.parse(tokens[1:])
+            if result is not None:
+                cmd_args, cmd_options, req_options = result
+                return Request(tokens[0],
+                               cmd_args,
+                               cmd_options,
+                               req_options,
+                               has_heredoc=has_heredoc, heredoc_word=heredoc_word)
+
         # Parse the tokens.
         args, remain = parser.parse_known_args(tokens)
         if remain:
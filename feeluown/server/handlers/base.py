@@ -25,6 +25,11 @@ class HandlerMeta(type):
 
 class AbstractHandler(metaclass=HandlerMeta):
     support_aio_handle = False
+    #: The handler may block for a long time (for example, it sends requests
+    #: to providers), so its `handle` method is called in an executor.
+    #:
+    #: .. versionadded:: 5.2
+    do_blocking_io = False
 
     def __init__(self, app: 'ServerApp', session: Optional[SessionLike] = None):
         """
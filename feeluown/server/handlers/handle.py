@@ -3,7 +3,8 @@ from typing import Optional
 
 from feeluown.server.data_structure import Request, Response
 from feeluown.server.session import SessionLike
-from feeluown.serializers import serialize
+from feeluown.serializers import serialize, JsonSerializer
+from feeluown.utils.aio import run_fn
 from .base import cmd_handler_mapping, AbstractHandler
 from .cmd import Cmd
 from .excs import HandlerException
@@ -42,8 +43,11 @@ async def handle_request(
             handler: AbstractHandler = handler_cls(app=app, session=session)
             if handler.support_aio_handle is True:
                 rv = await handler.a_handle(cmd)
+            elif handler.do_blocking_io is True:
+                # Do not block the event loop, so that other requests (and other
+                # connections) can be handled in the meantime.
+                rv = await run_fn(handler.handle, cmd)
             else:
-                # FIXME: handlers do blocking io should implement a_handle method.
                 rv = handler.handle(cmd)
         except HandlerException as e:
             ok, body = False, str(e)
@@ -55,6 +59,11 @@ async def handle_request(
             ok, body = True, rv
     fmt = req.options.get('format', None)
     fmt = fmt or 'plain'
+    if fmt == 'json' and session is not None and \
+       session.options.ack_framing == 'chunked':
+        # Serialize the body while it is being written.
+        chunks = JsonSerializer(brief=False).serialize_iter(body)
+        return Response(ok=ok, req=req, chunks=chunks)
     msg = serialize(fmt, body, brief=False)
     return Response(ok=ok, text=msg, req=req)
 
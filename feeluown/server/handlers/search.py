@@ -20,6 +20,7 @@ class SearchHandler(AbstractHandler):
     """
 
     cmds = 'search'
+    do_blocking_io = True
 
     def handle(self, cmd):
         return self.search(cmd.args[0], cmd.options)
@@ -1,5 +1,10 @@
+from dataclasses import fields
+
+from feeluown.server import binary_framing
+from feeluown.server.data_structure import SessionOptions
 from .cmd import Cmd
 from .base import AbstractHandler
+from .excs import HandlerException
 
 
 class SetHandler(AbstractHandler):
@@ -9,6 +14,13 @@ class SetHandler(AbstractHandler):
         assert self.session is not None
         options = cmd.options
 
+        # Options of a binary request are not validated by the parser.
+        unknown = set(options) - {field.name for field in fields(SessionOptions)}
+        if unknown:
+            raise HandlerException(f'unknown options: {", ".join(sorted(unknown))}')
+        if options.get('wire_format') == 'msgpack' \
+           and not binary_framing.is_available():
+            raise HandlerException('msgpack is not installed')
         for key, value in options.items():
             # Treat None as the default value.
             # TODO: use a more meaningful default value.
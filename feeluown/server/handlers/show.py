@@ -18,6 +18,7 @@ from feeluown.library import (
     SupportsPlaylistSongsReader, SupportsArtistAlbumsReader,
 )
 
+from feeluown.utils.aio import run_fn
 from .base import AbstractHandler
 from .excs import HandlerException
 
@@ -30,14 +31,27 @@ route = router.route
 
 class ShowHandler(AbstractHandler):
     cmds = 'show'
-
-    def handle(self, cmd):
+    support_aio_handle = True
+
+    async def a_handle(self, cmd):
+        # Only the routes which fetch models from providers may block for a long
+        # time, so they are handled in an executor. Other routes read the app
+        # state, which should only be read in the event loop thread.
+        provider_id = self._get_path(cmd).split('/')[1]
+        if provider_id and self.library.get(provider_id) is not None:
+            return await run_fn(self.handle, cmd)
+        return self.handle(cmd)
+
+    def _get_path(self, cmd):
         if cmd.args:
             furi = cmd.args[0]
         else:
             furi = 'fuo://'
         r = urlparse(furi)
-        path = f'/{r.netloc}{r.path}'
+        return f'/{r.netloc}{r.path}'
+
+    def handle(self, cmd):
+        path = self._get_path(cmd)
         logger.debug(f'Request path: {path}')
         try:
             rv = router.dispatch(path, {'library': self.library,
@@ -98,6 +112,9 @@ def current_session(req):
     result = []
     result.append(f'   rpc_version: {options.rpc_version}')
     result.append(f'pubsub_version: {options.pubsub_version}')
+    result.append(f'   ack_framing: {options.ack_framing}')
+    result.append(f'      pipeline: {options.pipeline}')
+    result.append(f'   wire_format: {options.wire_format}')
     return '\n'.join(result)
 
 
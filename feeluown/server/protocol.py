@@ -1,13 +1,15 @@
 import asyncio
+import itertools
 import logging
 from enum import Enum
-from typing import Optional, Awaitable, Callable
+from typing import Optional, Awaitable, Callable, Set
 
 from .session import SessionLike
 from .data_structure import Request, Response, SessionOptions
 from .dslv2 import parse as parse_v2
 from .dslv1 import parse as parse_v1
-from .excs import FuoSyntaxError
+from .excs import FuoSyntaxError, FuoProtocolError
+from . import binary_framing
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +40,10 @@ def decode(b):
     return b.decode('utf-8')
 
 
+def _fmt_id(req_id):
+    return '' if req_id is None else f' {req_id}'
+
+
 async def read_request(reader: asyncio.StreamReader, parse_func) -> Optional[Request]:
     """Read a request
 
@@ -81,6 +87,28 @@ async def read_request(reader: asyncio.StreamReader, parse_func) -> Optional[Req
     return req
 
 
+async def read_binary_request(reader: asyncio.StreamReader) -> Request:
+    """Read a request in the binary framing
+
+    .. versionadded:: 5.2
+    """
+    try:
+        header = await reader.readexactly(binary_framing.HEADER.size)
+    except asyncio.IncompleteReadError as e:
+        raise _EOF from e
+    length, = binary_framing.HEADER.unpack(header)
+    if length > binary_framing.MAX_FRAME_SIZE:
+        raise RequestError('request size should be less than 16MiB')
+    try:
+        body = await reader.readexactly(length)
+    except asyncio.IncompleteReadError as e:
+        raise _EOF from e
+    try:
+        return binary_framing.to_request(binary_framing.unpack_payload(body))
+    except FuoProtocolError as e:
+        raise RequestError(str(e)) from e
+
+
 class FuoServerProtocol(asyncio.streams.FlowControlMixin):
     """asyncio-style fuo server protocol (ClientHandler)
 
@@ -88,11 +116,19 @@ class FuoServerProtocol(asyncio.streams.FlowControlMixin):
     - asyncio.streams.StreamReaderProtocol
     - aiohttp.web_protocol.RequestHandler
 
+    When the pipeline option of the session is on, requests are handled
+    concurrently, at most `MAX_PIPELINED_REQUESTS` ones at the same time,
+    and each response is written as soon as it is ready. The response line
+    contains the id of the request so that the client can match them.
+
     TODO:
     - add request timeout: close connection if no action happens
     - add graceful shutdown: close connection before exit
     """
 
+    #: Max number of requests which are handled concurrently in a connection.
+    MAX_PIPELINED_REQUESTS = 8
+
     def __init__(
         self, handle_req: Callable[[Request, SessionLike], Awaitable[Response]], loop
     ):
@@ -109,6 +145,16 @@ class FuoServerProtocol(asyncio.streams.FlowControlMixin):
 
         self._peername = None
 
+        # Responses of pipelined requests are written by different tasks,
+        # and a response should not be interleaved with another one.
+        self._write_lock = asyncio.Lock()
+        self._req_ids = itertools.count(1)
+        self._pipeline_sem = asyncio.Semaphore(self.MAX_PIPELINED_REQUESTS)
+        self._pipelined_tasks: Set[asyncio.Task] = set()
+        # The wire format which is in use. It is changed to the one in options
+        # after the response of the `set` request is written.
+        self._wire_format = self.options.wire_format
+
     #
     # writer and reader property can only be used after connection is made.
     #
@@ -123,6 +169,8 @@ class FuoServerProtocol(asyncio.streams.FlowControlMixin):
         return self._reader
 
     async def read_request(self):
+        if self._wire_format == 'msgpack':
+            return await read_binary_request(self.reader)
         if self.options.rpc_version == '2.0':
             parse_func = parse_v2
         else:
@@ -133,16 +181,76 @@ class FuoServerProtocol(asyncio.streams.FlowControlMixin):
         version = self.options.rpc_version
         self.writer.write(encode(f'OK rpc {version}\r\n'))
 
-    async def write_response(self, resp):
+    async def write_response(self, resp, req_id=None):
+        """
+        .. versionadded:: 5.2
+           The *req_id* parameter. When it is not None, it is appended to the
+           response line.
+        """
         # TODO: Distinguish between client-side and server-side errors
         # (for example, add a ! marker after client-side errors)
-        msg_bytes = bytes(resp.text, 'utf-8')
-        response_line = f'ACK {resp.code} {len(msg_bytes)}\r\n'
+        async with self._write_lock:
+            if self._wire_format == 'msgpack':
+                self.writer.write(binary_framing.pack_response(resp, req_id))
+                await self.writer.drain()
+            elif self.options.ack_framing == 'chunked':
+                await self.write_chunked_response(resp, req_id)
+            else:
+                await self.write_length_response(resp, req_id)
+
+    async def write_length_response(self, resp, req_id=None):
+        msg_bytes = bytes(''.join(resp.iter_chunks()), 'utf-8')
+        response_line = f'ACK {resp.code} {len(msg_bytes)}{_fmt_id(req_id)}\r\n'
         self.writer.write(bytes(response_line, 'utf-8'))
         self.writer.write(msg_bytes)
         self.writer.write(b'\r\n')
         await self.writer.drain()
 
+    async def write_chunked_response(self, resp, req_id=None):
+        """Write the response body chunk by chunk.
+
+        The format is similar to the HTTP chunked transfer encoding::
+
+            ACK {code} chunked\r\n
+            {length}\r\n
+            {chunk}\r\n
+            ...
+            0\r\n
+            \r\n
+
+        Each chunk is written after the previous one is drained, so the
+        memory usage does not grow with the size of the body.
+        """
+        chunks = resp.iter_chunks()
+        try:
+            # Chunks are usually generated lazily, and an error may be raised.
+            chunk = next(chunks, '')
+        except Exception as e:  # pylint: disable=broad-except
+            logger.exception('generate response chunks failed')
+            resp = Response(ok=False, text=f'server error!\r\n{repr(e)}', req=resp.req)
+            chunks = resp.iter_chunks()
+            chunk = next(chunks)
+        self.writer.write(encode(f'ACK {resp.code} chunked{_fmt_id(req_id)}\r\n'))
+        while True:
+            chunk_bytes = encode(chunk)
+            if chunk_bytes:
+                self.writer.write(encode(f'{len(chunk_bytes)}\r\n'))
+                self.writer.write(chunk_bytes)
+                self.writer.write(b'\r\n')
+                await self.writer.drain()
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                break
+            except Exception:  # pylint: disable=broad-except
+                # The status line is already sent, so the client can only know
+                # the error by the closed connection.
+                logger.exception('generate response chunks failed')
+                self.writer.close()
+                return
+        self.writer.write(b'0\r\n\r\n')
+        await self.writer.drain()
+
     async def start(self):
         """connection handler"""
         # we should call drain after each write to do flow control,
@@ -152,12 +260,14 @@ class FuoServerProtocol(asyncio.streams.FlowControlMixin):
             await self.writer.drain()
             # HELP: static checker say there is no attribute "_connection_lost".
             while not self._connection_lost:  # type: ignore
+                pipelined = self.options.pipeline == 'on'
                 try:
                     req = await self.read_request()
                 except RequestError as e:
                     msg = 'bad reqeust!\r\n' + str(e)
                     bad_request_resp = Response(ok=False, text=msg)
-                    await self.write_response(bad_request_resp)
+                    req_id = next(self._req_ids) if pipelined else None
+                    await self.write_response(bad_request_resp, req_id)
                 except _EOF:
                     # Client closed the connection.
                     break
@@ -166,6 +276,12 @@ class FuoServerProtocol(asyncio.streams.FlowControlMixin):
                         # Ignore the empty request.
                         continue
 
+                    req_id = next(self._req_ids) if pipelined else None
+                    # Requests which change the session are barriers, they are
+                    # handled after all previous requests are finished.
+                    if req.cmd in ('quit', 'set'):
+                        await self.wait_pipelined_requests()
+
                     # In general, if the client wants to disconnect, it can
                     # simply close the connection itself,
                     # but if the client cannot conveniently close it itself, it can send
@@ -177,17 +293,48 @@ class FuoServerProtocol(asyncio.streams.FlowControlMixin):
                     if req.cmd == 'quit':
                         # FIXME: We'd better wait for close to happen
                         self.writer.close()
+                    elif pipelined and req.cmd != 'set':
+                        # Do not read more requests when there are too many
+                        # requests being handled.
+                        await self._pipeline_sem.acquire()
+                        task = self._loop.create_task(
+                            self._handle_pipelined_req(req, req_id))
+                        self._pipelined_tasks.add(task)
+                        task.add_done_callback(self._pipelined_tasks.discard)
                     else:
-                        try:
-                            resp = await self._handle_req(req, self)
-                        except Exception as e:  # pylint: disable=broad-except
-                            msg = f'server error!\r\n{repr(e)}'
-                            resp = Response(ok=False, text=msg, req=req)
-                        await self.write_response(resp)
+                        resp = await self.handle_req(req)
+                        await self.write_response(resp, req_id)
+                        if req.cmd == 'set':
+                            self._wire_format = self.options.wire_format
+            await self.wait_pipelined_requests()
         except ConnectionResetError:
             # client close the connection
             pass
 
+    async def handle_req(self, req) -> Response:
+        try:
+            return await self._handle_req(req, self)
+        except Exception as e:  # pylint: disable=broad-except
+            msg = f'server error!\r\n{repr(e)}'
+            return Response(ok=False, text=msg, req=req)
+
+    async def _handle_pipelined_req(self, req, req_id):
+        try:
+            resp = await self.handle_req(req)
+            await self.write_response(resp, req_id)
+        except ConnectionError:
+            # client close the connection
+            pass
+        except Exception:  # pylint: disable=broad-except
+            logger.exception(f'handle pipelined request {req_id} failed')
+        finally:
+            self._pipeline_sem.release()
+
+    async def wait_pipelined_requests(self):
+        """Wait until all pipelined requests are handled."""
+        if self._pipelined_tasks:
+            await asyncio.wait(self._pipelined_tasks)
+
     def connection_made(self, transport):
         self._peername = transport.get_extra_info('peername')
         logger.debug('%s connceted to fuo daemon.', self._peername)
@@ -233,6 +380,10 @@ class FuoServerProtocol(asyncio.streams.FlowControlMixin):
         """
         return False
 
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
     def write_topic_msg(self, topic, msg):
         """
         TODO: Create a enum for version.
@@ -240,8 +391,11 @@ class FuoServerProtocol(asyncio.streams.FlowControlMixin):
         if self._connection_lost or self.writer.is_closing():  # type: ignore
             raise DeadSubscriber
 
-        body = encode(msg)
         try:
+            if self._wire_format == 'msgpack':
+                self.writer.write(binary_framing.pack_topic_msg(topic, msg))
+                return
+            body = encode(msg)
             if self.options.pubsub_version == '2.0':
                 response_line = f'MSG {topic} {len(body)}\r\n'
                 self.writer.write(encode(response_line))
@@ -1,5 +1,7 @@
-from collections import defaultdict
+import asyncio
+from collections import defaultdict, deque
 import logging
+from typing import Optional
 
 from feeluown.serializers import serialize
 from feeluown.server.protocol import DeadSubscriber
@@ -8,20 +10,98 @@ from feeluown.server.protocol import DeadSubscriber
 logger = logging.getLogger(__name__)
 
 
+class _SubscriberQueue:
+    """Messages which are not sent to a subscriber yet.
+
+    For a coalesced topic, only the latest message is kept.
+    """
+
+    def __init__(self, subscriber, maxsize):
+        self.subscriber = subscriber
+        self.maxsize = maxsize
+        self._messages = deque()  # [[topic, msg]]
+        self._coalesced = {}  # {topic: [topic, msg]}, items are in _messages
+        self._event = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    def __len__(self):
+        return len(self._messages)
+
+    def put(self, topic, msg, coalesce=False) -> bool:
+        """Return False when the queue is full."""
+        if coalesce:
+            item = self._coalesced.get(topic)
+            if item is not None:
+                item[1] = msg
+                return True
+        if len(self._messages) >= self.maxsize:
+            return False
+        item = [topic, msg]
+        self._messages.append(item)
+        if coalesce:
+            self._coalesced[topic] = item
+        self._event.set()
+        return True
+
+    async def get(self):
+        while not self._messages:
+            self._event.clear()
+            await self._event.wait()
+        item = self._messages.popleft()
+        topic, msg = item
+        if self._coalesced.get(topic) is item:
+            self._coalesced.pop(topic)
+        return topic, msg
+
+
 class Gateway:
+    """Publish messages of topics to subscribers.
+
+    A message is serialized once, and it is put into a bounded queue of each
+    subscriber. Messages in a queue are sent by a task, which waits until the
+    subscriber's buffer is drained before sending the next one, so a slow
+    subscriber does not block the publisher. For a coalesced topic, such as
+    `player.seeked`, only the latest message is kept in the queue. When the
+    queue of a subscriber is full, the subscriber is too slow and it is
+    disconnected.
+
+    A subscriber has a `write_topic_msg(topic, msg)` method. Optionally, it has
+    a `writer` (:class:`asyncio.StreamWriter`) which is drained after each
+    message, and a `close` method which is called when it is disconnected.
+    """
+
+    #: Max number of pending messages of a subscriber.
+    MAX_PENDING_MESSAGES = 256
+
     def __init__(self):
         self.topics = set()
+        self._coalesced_topics = set()
         self._relations = defaultdict(set)  # {'topic': subscriber_set}
+        self._queues = {}  # {subscriber: _SubscriberQueue}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
 
-    def add_topic(self, topic):
+    def add_topic(self, topic, coalesce=False):
+        """
+        .. versionchanged:: 5.2
+           The *coalesce* parameter is added. When it is True, only the latest
+           message of the topic is kept for a subscriber.
+        """
         self.topics.add(topic)
+        if coalesce:
+            self._coalesced_topics.add(topic)
 
     def remove_topic(self, topic):
         if topic in self.topics:
             self.topics.remove(topic)
+            self._coalesced_topics.discard(topic)
 
     def link(self, topic, subscriber):
         self._relations[topic].add(subscriber)
+        if self._loop is None:
+            try:
+                self._loop = asyncio.get_running_loop()
+            except RuntimeError:
+                pass
 
     def unlink(self, topic, subscriber):
         if topic in self.topics and subscriber in self._relations[topic]:
@@ -31,17 +111,74 @@ class Gateway:
         for topic in self.topics:
             if subscriber in self._relations[topic]:
                 self._relations[topic].remove(subscriber)
+        queue = self._queues.pop(subscriber, None)
+        if queue is not None and queue.task is not None \
+                and queue.task is not asyncio.current_task():
+            queue.task.cancel()
 
     def publish(self, obj, topic, need_serialize=False):
-        # NOTE: use queue? maybe.
-        subscribers = self._relations[topic]
-        for subscriber in subscribers.copy():
+        """Publish a message, it is thread safe."""
+        if not self._relations[topic]:
+            return
+        if need_serialize is True:
+            msg = serialize('json', obj, brief=False)
+        else:
+            msg = obj
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if self._loop is None or loop is self._loop:
+            self._put_msg(topic, msg)
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._put_msg, topic, msg)
+
+    def _put_msg(self, topic, msg):
+        coalesce = topic in self._coalesced_topics
+        for subscriber in self._relations[topic].copy():
+            queue = self._queues.get(subscriber)
+            if queue is None:
+                queue = _SubscriberQueue(subscriber, self.MAX_PENDING_MESSAGES)
+                try:
+                    queue.task = asyncio.get_running_loop().create_task(
+                        self._send_msgs(queue))
+                except RuntimeError:
+                    # No event loop, send messages synchronously.
+                    self._send_msg(subscriber, topic, msg)
+                    continue
+                self._queues[subscriber] = queue
+            if not queue.put(topic, msg, coalesce=coalesce):
+                logger.warning(f'subscriber {subscriber} is too slow, disconnect it')
+                self._disconnect(subscriber)
+
+    def _send_msg(self, subscriber, topic, msg):
+        try:
+            subscriber.write_topic_msg(topic, msg)
+        except DeadSubscriber:
+            # NOTE: need lock?
+            self.remove_subscriber(subscriber)
+            return False
+        return True
+
+    async def _send_msgs(self, queue: _SubscriberQueue):
+        subscriber = queue.subscriber
+        while True:
+            topic, msg = await queue.get()
+            if not self._send_msg(subscriber, topic, msg):
+                break
+            # The message is just written, so the connection is not lost
+            # and the writer of a protocol is available.
+            writer = getattr(subscriber, 'writer', None)
+            if writer is None:
+                continue
             try:
-                if need_serialize is True:
-                    msg = serialize('json', obj, brief=False)
-                else:
-                    msg = obj
-                subscriber.write_topic_msg(topic, msg)
-            except DeadSubscriber:
-                # NOTE: need lock?
+                await writer.drain()
+            except ConnectionError:
                 self.remove_subscriber(subscriber)
+                break
+
+    def _disconnect(self, subscriber):
+        self.remove_subscriber(subscriber)
+        close = getattr(subscriber, 'close', None)
+        if close is not None:
+            close()
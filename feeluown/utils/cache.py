@@ -1,4 +1,5 @@
 import time
+from collections import OrderedDict
 from threading import RLock
 
 
@@ -72,3 +73,67 @@ class cached_field:
         else:
             expired_at = int(time.time()) + self._ttl
         return (expired_at, value)
+
+
+class TTLCache:
+    """A bounded LRU cache whose items expire after `ttl` seconds
+
+    >>> cache = TTLCache(maxsize=2, ttl=60)
+    >>> cache.set('a', 1)
+    >>> cache.set('b', 2)
+    >>> cache.get('a')
+    1
+    >>> cache.set('c', 3)  # 'b' is the least recently used one.
+    >>> cache.get('b') is None
+    True
+    >>> cache.set('d', 4, ttl=0)
+    >>> cache.get('d') is None
+    True
+
+    .. versionadded:: 5.2
+    """
+
+    def __init__(self, maxsize, ttl, timer=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._lock = RLock()
+        # {key: (expired_at, value)}, ordered from least to most recently used.
+        self._data: OrderedDict = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return self.get(key, _NOT_FOUND) is not _NOT_FOUND
+
+    def get(self, key, default=None):
+        """Return the value, or `default` when it does not exist or is expired."""
+        with self._lock:
+            datum = self._data.get(key)
+            if datum is None:
+                return default
+            if datum[0] <= self._timer():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return datum[1]
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            self._data[key] = (self._timer() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            datum = self._data.pop(key, None)
+        if datum is None or datum[0] <= self._timer():
+            return default
+        return datum[1]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
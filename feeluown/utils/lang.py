@@ -27,3 +27,24 @@ def convert_chinese(s: str, lang):
         return s
     except:  # noqa
         return s
+
+
+def can_convert_pinyin():
+    try:
+        import pypinyin  # noqa
+    except ImportError:
+        return False
+    return True
+
+
+def convert_pinyin(s: str):
+    """Convert chinese characters to pinyin, return (full, initials).
+
+    Please ensure can_convert_pinyin is True before invoke this function.
+
+    Note, this feature is available only if the `pypinyin` package is installed.
+    """
+    from pypinyin import lazy_pinyin, Style  # noqa
+
+    return (''.join(lazy_pinyin(s)),
+            ''.join(lazy_pinyin(s, style=Style.FIRST_LETTER)))
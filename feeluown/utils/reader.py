@@ -1,5 +1,9 @@
 import logging
+import queue
+import threading
 from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import Future
 from typing import (
     List,
     Generic,
@@ -12,7 +16,7 @@ from typing import (
     Sequence,
     AsyncIterable,
 )
-from threading import Lock
+from threading import Lock, RLock
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +24,7 @@ __all__ = (
     'create_reader',
     'SequentialReader',
     'RandomSequentialReader',
+    'PagedRandomSequentialReader',
     'Reader',
     'AsyncReader',
     # Below are deprecated.
@@ -218,14 +223,17 @@ class RandomSequentialReader(Reader[T]):
         """
         self.offset = 0
         self._count = count
-        self._ranges: List[Tuple[int, int]] = []  # list of tuple
-        self._objects: List[Optional[T]] = [None] * count
+        self._init_objects()
         self._read_func = read_func
         self._lock = Lock()
 
         assert max_per_read > 0, 'max_per_read must big than 0'
         self._max_per_read = max_per_read
 
+    def _init_objects(self):
+        self._ranges: List[Tuple[int, int]] = []  # list of tuple
+        self._objects: List[Optional[T]] = [None] * self._count
+
     @property
     def count(self):
         return self._count
@@ -343,6 +351,191 @@ class RandomSequentialReader(Reader[T]):
         return obj
 
 
+class PagedRandomSequentialReader(RandomSequentialReader[T]):
+    """RandomSequentialReader which reads objects page by page
+
+    Objects are kept in pages of `max_per_read` objects, so looking up an
+    object does not scan all objects. When more than `max_cached` objects
+    are kept, the least recently used pages are evicted. After a page is
+    read, the next `prefetch` pages are read in background threads, so
+    that a sequential reader (such as a table model which fetches more
+    items when it is scrolled) seldom waits for IO.
+
+    ``wrap(reader, paged=True)`` converts a RandomSequentialReader which has
+    more than one page to this reader, the songs table uses it this way.
+
+    >>> reader = PagedRandomSequentialReader(
+    ...     5, lambda start, end: list(range(start, end)), max_per_read=2)
+    >>> reader.read_range(1, 4)
+    [1, 2, 3]
+    >>> reader.readall()
+    [0, 1, 2, 3, 4]
+
+    .. versionadded:: 5.2
+    """
+
+    #: Number of threads which read pages ahead, shared by all readers.
+    prefetch_workers = 2
+    _prefetch_queue: Optional[queue.Queue] = None
+    _prefetch_queue_lock = Lock()
+
+    def __init__(self,
+                 count,
+                 read_func: Callable[[int, int], Iterable[T]],
+                 max_per_read=100,
+                 max_cached=5000,
+                 prefetch=1):
+        """
+
+        :param max_cached: max number of cached objects, it is at least
+                           two pages.
+        :param prefetch: number of pages to read ahead, 0 means no prefetching.
+        """
+        super().__init__(count, read_func, max_per_read=max_per_read)
+        self._max_cached = max(max_cached, 2 * max_per_read)
+        self._prefetch = prefetch
+        self._lock = RLock()
+
+    def _init_objects(self):
+        # Objects are kept in pages instead of a list of all objects.
+        # {page number: objects}, ordered from least to most recently used.
+        self._pages: OrderedDict = OrderedDict()
+        self._cached = 0
+        self._loading: dict = {}  # {page number: future}
+        # Pages which are queued for prefetching and not started yet.
+        self._queued: set = set()
+
+    @classmethod
+    def _get_prefetch_queue(cls) -> queue.Queue:
+        # Daemon threads are used so that a slow read does not block the
+        # interpreter from exiting.
+        with cls._prefetch_queue_lock:
+            if cls._prefetch_queue is None:
+                cls._prefetch_queue = queue.Queue()
+                for i in range(cls.prefetch_workers):
+                    threading.Thread(target=cls._prefetch_worker,
+                                     args=(cls._prefetch_queue,),
+                                     name=f'reader_prefetch_{i}',
+                                     daemon=True).start()
+            return cls._prefetch_queue
+
+    @staticmethod
+    def _prefetch_worker(queue_):
+        while True:
+            reader, page_no, future = queue_.get()
+            reader._prefetch_page(page_no, future)
+
+    def has_index(self, index) -> bool:
+        """Whether the object is read and cached."""
+        page = self._pages.get(index // self._max_per_read)
+        return page is not None and index % self._max_per_read < len(page)
+
+    def read(self, index):
+        if not 0 <= index < self._count:
+            raise IndexError('reader index out of range')
+        page_no, i = divmod(index, self._max_per_read)
+        objs = self._read_page(page_no)
+        self._prefetch_after(page_no)
+        if i >= len(objs):
+            raise IndexError(f'object {index} can not be read')
+        return objs[i]
+
+    def read_range(self, start, end) -> List[T]:
+        end = min(end, self._count)
+        if start >= end:
+            return []
+        objs: List[T] = []
+        first, last = start // self._max_per_read, (end - 1) // self._max_per_read
+        for page_no in range(first, last + 1):
+            offset = page_no * self._max_per_read
+            page = self._read_page(page_no)
+            objs.extend(page[max(start - offset, 0):end - offset])
+        self._prefetch_after(last)
+        return objs
+
+    def readall(self) -> List[T]:
+        # Do not prefetch since pages are read one by one.
+        objs: List[T] = []
+        for page_no in range(self._page_count()):
+            objs.extend(self._read_page(page_no))
+        return objs
+
+    def _page_count(self):
+        return (self._count + self._max_per_read - 1) // self._max_per_read
+
+    def _read_page(self, page_no) -> List[T]:
+        while True:
+            with self._lock:
+                page = self._pages.get(page_no)
+                if page is not None:
+                    self._pages.move_to_end(page_no)
+                    return page
+                future = self._loading.get(page_no)
+                is_owner = future is None
+                if is_owner:
+                    future = self._loading[page_no] = Future()
+                elif page_no in self._queued:
+                    # Take over the prefetching which is not started, instead
+                    # of waiting for the prefetch threads behind other pages.
+                    self._queued.discard(page_no)
+                    is_owner = True
+            if is_owner:
+                return self._load_page(page_no, future)
+            try:
+                return future.result()
+            except Exception:  # noqa
+                # The page is loaded by another thread and it failed,
+                # load it again in this thread.
+                continue
+
+    def _load_page(self, page_no, future) -> List[T]:
+        start = page_no * self._max_per_read
+        end = min(start + self._max_per_read, self._count)
+        logger.debug('trigger read_func(%d, %d)', start, end)
+        try:
+            objs = list(self._read_func(start, end))
+        except Exception as e:
+            with self._lock:
+                self._loading.pop(page_no, None)
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self._loading.pop(page_no, None)
+            self._pages[page_no] = objs
+            self._cached += len(objs)
+            self._evict(keep=page_no)
+        future.set_result(objs)
+        return objs
+
+    def _evict(self, keep):
+        while self._cached > self._max_cached and len(self._pages) > 1:
+            page_no = next(iter(self._pages))
+            if page_no == keep:
+                self._pages.move_to_end(page_no)
+                continue
+            self._cached -= len(self._pages.pop(page_no))
+
+    def _prefetch_after(self, page_no):
+        for i in range(page_no + 1, min(page_no + 1 + self._prefetch,
+                                        self._page_count())):
+            with self._lock:
+                if i in self._pages or i in self._loading:
+                    continue
+                future = self._loading[i] = Future()
+                self._queued.add(i)
+            self._get_prefetch_queue().put((self, i, future))
+
+    def _prefetch_page(self, page_no, future):
+        with self._lock:
+            if page_no not in self._queued:  # Taken over by a reader.
+                return
+            self._queued.discard(page_no)
+        try:
+            self._load_page(page_no, future)
+        except Exception:  # noqa
+            logger.warning(f'prefetch page {page_no} failed', exc_info=True)
+
+
 RandomReader = RandomSequentialReader  # For backward compatibility.
 
 
@@ -406,15 +599,27 @@ class AsyncSequentialReader(AsyncReader):
             raise
 
 
-def wrap(iterable):
+def wrap(iterable, paged=False):
     """
 
+    :param paged: convert a RandomSequentialReader which is not read yet and
+                  has more than one page to a PagedRandomSequentialReader.
+
     .. versionadded:: 3.4
     .. deprecated:: 3.7.7
        Use :func:`create_reader` instead.
+    .. versionadded:: 5.2
+       The *paged* parameter.
     """
     # if it is a reader already, just return it
     if isinstance(iterable, Reader):
+        # pylint: disable=protected-access
+        if paged and type(iterable) is RandomSequentialReader \
+           and iterable.offset == 0 and not iterable._ranges \
+           and iterable.count > iterable._max_per_read:
+            return PagedRandomSequentialReader(iterable.count,
+                                               iterable._read_func,
+                                               max_per_read=iterable._max_per_read)
         return iterable
 
     # async reader
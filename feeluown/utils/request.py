@@ -1,5 +1,11 @@
 import logging
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+
 import requests
+from requests.adapters import HTTPAdapter
 
 from feeluown.utils.dispatch import Signal
 from requests.exceptions import ConnectionError, HTTPError, Timeout
@@ -8,19 +14,89 @@ from requests.exceptions import ConnectionError, HTTPError, Timeout
 logger = logging.getLogger(__name__)
 
 
-class Request:
+class RequestStats:
+    """Timing statistics of requests to one host."""
+
     def __init__(self):
+        self.count = 0
+        self.failed_count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    @property
+    def avg_time(self):
+        return self.total_time / self.count if self.count else 0.0
+
+    def record(self, elapsed, ok):
+        self.count += 1
+        if not ok:
+            self.failed_count += 1
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+
+
+class Request:
+    """HTTP client which reuses connections.
+
+    Each host has its own session, whose connections are kept alive and
+    reused by later requests. The number of concurrent requests is limited
+    by `max_concurrency`. Sessions are shared by unrelated callers, so they
+    do not keep cookies, and cookies should be passed per request.
+    """
+
+    def __init__(self, max_concurrency=16):
         self.connected_signal = Signal()
         self.disconnected_signal = Signal()
         self.slow_signal = Signal()
         self.server_error_signal = Signal()
 
-    def get(self, *args, **kw):
-        logger.debug('request.get %s %s' % (args, kw))
+        self._max_concurrency = max_concurrency
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._sessions = {}  # {host: session}
+        #: {host: RequestStats}
+        self.stats = {}
+
+    def _get_host(self, url):
+        parts = urlsplit(url)
+        return f'{parts.scheme}://{parts.netloc}'
+
+    def _get_session(self, host):
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                # Reject all cookies set by the servers.
+                session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                adapter = HTTPAdapter(pool_connections=1,
+                                      pool_maxsize=self._max_concurrency)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._sessions[host] = session
+            return session
+
+    def _request(self, method, url, **kw):
+        host = self._get_host(url)
+        session = self._get_session(host)
+        ok = False
+        start = time.monotonic()
+        try:
+            with self._semaphore:
+                res = session.request(method, url, **kw)
+            ok = True
+            return res
+        finally:
+            elapsed = time.monotonic() - start
+            with self._lock:
+                self.stats.setdefault(host, RequestStats()).record(elapsed, ok)
+            logger.debug('request.%s %s finished in %.3fs', method, url, elapsed)
+
+    def get(self, url, params=None, **kw):
+        logger.debug('request.get %s %s' % (url, kw))
         if kw.get('timeout') is None:
             kw['timeout'] = 1
         try:
-            res = requests.get(*args, **kw)
+            res = self._request('GET', url, params=params, **kw)
             self.connected_signal.emit()
             return res
         except ConnectionError:
@@ -31,10 +107,10 @@ class Request:
             self.slow_signal.emit()
         return None
 
-    def post(self, *args, **kw):
-        logger.debug('request.post %s %s' % (args, kw))
+    def post(self, url, data=None, json=None, **kw):
+        logger.debug('request.post %s %s' % (url, kw))
         try:
-            res = requests.post(*args, **kw)
+            res = self._request('POST', url, data=data, json=json, **kw)
             return res
         except ConnectionError:
             self.disconnected_signal.emit()
@@ -43,3 +119,10 @@ class Request:
         except Timeout:
             self.slow_signal.emit()
         return None
+
+    def close(self):
+        """Close the sessions and their connections."""
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
+            session.close()
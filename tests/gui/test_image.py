@@ -1,9 +1,12 @@
+import asyncio
+import os
+import threading
 from types import SimpleNamespace
 from unittest.mock import MagicMock
 
 import pytest
 
-from feeluown.gui.image import ImgManager
+from feeluown.gui.image import ImgManager, ImgPriority, _ImgCache
 from feeluown.media import Media, MediaType
 
 
@@ -12,7 +15,7 @@ async def test_img_mgr_get_uses_media_network_options(tmp_path):
     app_mock = MagicMock()
     app_mock.request.get.return_value = SimpleNamespace(content=b"img-bytes")
     img_mgr = ImgManager(app_mock)
-    img_mgr.cache.get = MagicMock(return_value=None)
+    img_mgr.cache.read = MagicMock(return_value=None)
     img_mgr.cache.create = MagicMock(return_value=str(tmp_path / "img.cache"))
     img_mgr.save = MagicMock()
 
@@ -33,3 +36,94 @@ async def test_img_mgr_get_uses_media_network_options(tmp_path):
             "https": "http://127.0.0.1:7890",
         },
     )
+
+
+def test_img_cache_lru_eviction(tmp_path):
+    cache = _ImgCache(MagicMock(), cache_dir=str(tmp_path))
+    cache.MAX_TOTAL_NUMBER = 2
+    for name in ("a", "b"):
+        with open(cache.create(name), "wb") as f:
+            f.write(name.encode())
+        cache.add(name, name.encode())
+    cache.update("a")
+    with open(cache.create("c"), "wb") as f:
+        f.write(b"c")
+    cache.add("c", b"c")
+
+    # "b" is the least recently used one.
+    assert cache.get("b") is None
+    assert cache.read("a") == b"a"
+    assert len(os.listdir(tmp_path)) == 2
+
+    # The index is loaded from the cache dir.
+    cache = _ImgCache(MagicMock(), cache_dir=str(tmp_path))
+    assert cache.read("c") == b"c"
+    assert cache.get("b") is None
+
+
+def test_img_cache_load_index_with_duplicate_files(tmp_path):
+    cache = _ImgCache(MagicMock(), cache_dir=str(tmp_path))
+    hname = cache.hash("a")
+    old_fpath, new_fpath = tmp_path / f"{hname}-1", tmp_path / hname
+    old_fpath.write_bytes(b"old")
+    new_fpath.write_bytes(b"new")
+    os.utime(old_fpath, (1, 1))
+
+    # The older file is removed and the newer one is kept.
+    assert cache.read("a") == b"new"
+    assert os.listdir(tmp_path) == [hname]
+
+
+@pytest.mark.asyncio
+async def test_img_mgr_get_dedup_inflight_download(tmp_path):
+    app_mock = MagicMock()
+    app_mock.request.get.return_value = SimpleNamespace(content=b"img-bytes")
+    img_mgr = ImgManager(app_mock)
+    img_mgr.cache = _ImgCache(app_mock, cache_dir=str(tmp_path))
+
+    url = "https://img.example.com/a.jpg"
+    contents = await asyncio.gather(
+        img_mgr.get(url, "img-uid"),
+        img_mgr.get(url, "img-uid", priority=ImgPriority.normal),
+    )
+    assert contents == [b"img-bytes", b"img-bytes"]
+    app_mock.request.get.assert_called_once()
+    # The image is read from cache.
+    assert await img_mgr.get(url, "img-uid") == b"img-bytes"
+    app_mock.request.get.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_img_mgr_get_cancelled_before_download(tmp_path):
+    app_mock = MagicMock()
+    img_mgr = ImgManager(app_mock)
+    img_mgr.cache = _ImgCache(app_mock, cache_dir=str(tmp_path))
+    # No worker, so that the download is never started.
+    img_mgr.MAX_WORKERS = 0
+
+    task = asyncio.create_task(img_mgr.get("https://img.example.com/a.jpg", "uid"))
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert not img_mgr._jobs
+
+
+@pytest.mark.asyncio
+async def test_img_mgr_worker_can_be_cancelled(tmp_path):
+    app_mock = MagicMock()
+    event = threading.Event()
+    app_mock.request.get.side_effect = lambda *_, **__: event.wait(1)
+    img_mgr = ImgManager(app_mock)
+    img_mgr.cache = _ImgCache(app_mock, cache_dir=str(tmp_path))
+    img_mgr.MAX_WORKERS = 1
+
+    task = asyncio.create_task(img_mgr.get("https://img.example.com/a.jpg", "uid"))
+    await asyncio.sleep(0.1)
+    worker, = img_mgr._workers
+    worker.cancel()
+    await asyncio.sleep(0)
+    # The worker stops instead of treating the cancellation as a failure.
+    assert worker.cancelled()
+    event.set()
+    task.cancel()
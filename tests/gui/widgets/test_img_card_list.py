@@ -0,0 +1,120 @@
+import pytest
+from PyQt6 import sip
+from PyQt6.QtCore import QSize, Qt, QBuffer, QByteArray
+from PyQt6.QtGui import QImage
+from PyQt6.QtWidgets import QScrollArea
+
+from feeluown.library import BriefArtistModel
+from feeluown.utils import aio
+from feeluown.utils.reader import create_reader
+from feeluown.gui.widgets.img_card_list import (
+    ImgCardListModel, ArtistCardListView, ArtistCardListDelegate,
+)
+
+
+def create_image_content(width, height):
+    img = QImage(width, height, QImage.Format.Format_RGB32)
+    img.fill(0)
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QBuffer.OpenModeFlag.WriteOnly)
+    img.save(buffer, 'PNG')
+    return bytes(data)
+
+
+@pytest.mark.asyncio
+async def test_img_card_list_model_scale_and_evict_images(qapp):
+    content = create_image_content(400, 300)
+    fetched = []
+
+    async def fetch_image(item, cb):
+        fetched.append(item)
+        cb(content)
+
+    artists = [BriefArtistModel(identifier=str(i), source='fake', name=str(i))
+               for i in range(5)]
+    model = ImgCardListModel(create_reader(artists), fetch_image)
+    model.MAX_CACHED_IMAGES = 2
+    model.set_image_size(QSize(100, 100))
+    model._fetch_more_step = 5
+    model.fetch_more_impl()
+    await aio.sleep(0.1)
+    assert model.rowCount() == 5
+    assert len(fetched) == 5
+
+    # Images are scaled to cover the image size, and only a few are kept.
+    assert len(model.images) == 2
+    index = model.index(4)
+    image = model.data(index, Qt.ItemDataRole.DecorationRole)
+    assert isinstance(image, QImage)
+    assert (image.width(), image.height()) == (133, 100)
+
+    # The evicted image is decoded again when it is needed.
+    assert not isinstance(model.data(model.index(0), Qt.ItemDataRole.DecorationRole),
+                          QImage)
+    await aio.sleep(0.1)
+    assert fetched[-1] == artists[0]
+    assert isinstance(model.data(model.index(0), Qt.ItemDataRole.DecorationRole),
+                      QImage)
+
+    model.remove_item(artists[1])
+    assert model.rowCount() == 4
+    assert model._rows['fuo://fake/artists/2'] == 1
+    assert 'fuo://fake/artists/1' not in model._rows
+
+
+@pytest.mark.asyncio
+async def test_img_card_list_model_remove_duplicate_items(qapp):
+    async def fetch_image(item, cb):
+        pass
+
+    artists = [BriefArtistModel(identifier=str(i), source='fake', name=str(i))
+               for i in (0, 1, 2, 1, 3)]
+    model = ImgCardListModel(create_reader(artists), fetch_image)
+    model._fetch_more_step = 5
+    model.fetch_more_impl()
+    await aio.sleep(0.1)
+    assert model._rows == {'fuo://fake/artists/0': 0, 'fuo://fake/artists/1': 1,
+                           'fuo://fake/artists/2': 2, 'fuo://fake/artists/3': 4}
+    # The first item of the duplicate ones is removed,
+    # and the uri maps to the next one.
+    model.remove_item(artists[1])
+    assert model._rows == {'fuo://fake/artists/0': 0, 'fuo://fake/artists/1': 2,
+                           'fuo://fake/artists/2': 1, 'fuo://fake/artists/3': 3}
+    model.remove_item(artists[1])
+    assert model._rows == {'fuo://fake/artists/0': 0, 'fuo://fake/artists/2': 1,
+                           'fuo://fake/artists/3': 2}
+
+
+@pytest.mark.asyncio
+async def test_img_card_list_view_cancel_invisible_image_fetching(qtbot):
+    async def fetch_image(item, cb):
+        await aio.sleep(10)
+
+    artists = [BriefArtistModel(identifier=str(i), source='fake', name=str(i))
+               for i in range(10)]
+    model = ImgCardListModel(create_reader(artists), fetch_image)
+    scroll_area = QScrollArea()
+    qtbot.addWidget(scroll_area)
+    scroll_area.setWidgetResizable(True)
+    view = ArtistCardListView()
+    view.setItemDelegate(ArtistCardListDelegate(view))
+    scroll_area.setWidget(view)
+    scroll_area.resize(200, 200)
+    scroll_area.show()
+    receivers = view.receivers(view.destroyed)
+    view.setModel(model)
+    view.setModel(model)
+    # The destroyed signal is connected only once.
+    assert view.receivers(view.destroyed) == receivers
+
+    model._fetch_more_step = 10
+    model.fetch_more_impl()
+    await aio.sleep(0.1)
+    assert model.fetching_image_rows() == set(range(10))
+
+    view.cancel_invisible_image_fetching()
+    rows = model.fetching_image_rows()
+    assert 0 in rows and 9 not in rows
+    sip.delete(view)
+    assert not model.fetching_image_rows()
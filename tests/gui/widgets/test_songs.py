@@ -0,0 +1,83 @@
+import pytest
+from PyQt6.QtCore import QModelIndex
+
+from feeluown.library import BriefSongModel
+from feeluown.utils import aio
+from feeluown.utils.reader import wrap
+from feeluown.gui.widgets.songs import (
+    BaseSongsTableModel, SongFilterProxyModel, SongsTableModel,
+)
+
+
+def insert_songs(model, songs):
+    begin = model.rowCount()
+    model.beginInsertRows(QModelIndex(), begin, begin + len(songs) - 1)
+    model._items.extend(songs)
+    model.endInsertRows()
+
+
+def create_song(identifier, title, artists_name='', album_name=''):
+    return BriefSongModel(identifier=identifier, source='fake', title=title,
+                          artists_name=artists_name, album_name=album_name)
+
+
+def test_song_filter_proxy_model(qtbot):
+    model = BaseSongsTableModel()
+    filter_model = SongFilterProxyModel()
+    filter_model.setSourceModel(model)
+    insert_songs(model, [create_song('0', 'Hello World', 'Mary'),
+                         create_song('1', 'Hello', 'Tom', 'Blue')])
+    assert filter_model.rowCount() == 2
+
+    filter_model.set_filter_text('hello')
+    assert filter_model.rowCount() == 2
+    # Spaces and case are ignored.
+    filter_model.set_filter_text('HelloW')
+    assert filter_model.rowCount() == 1
+    # The pattern does not match across fields.
+    filter_model.set_filter_text('hellotom')
+    assert filter_model.rowCount() == 0
+
+    # Inserted rows are filtered with their precomputed keys.
+    filter_model.set_filter_text('blue')
+    insert_songs(model, [create_song('2', 'Blue Sky')])
+    assert filter_model.rowCount() == 2
+    filter_model.set_filter_text('bluesky')
+    assert filter_model.rowCount() == 1
+
+    filter_model.set_filter_text('')
+    assert filter_model.rowCount() == 3
+
+    # Punctuations are not ignored.
+    insert_songs(model, [create_song('3', 'C++ Song')])
+    filter_model.set_filter_text('c++')
+    assert filter_model.rowCount() == 1
+    filter_model.set_filter_text('+')
+    assert filter_model.rowCount() == 1
+
+
+def test_song_filter_proxy_model_debounce(qtbot):
+    model = BaseSongsTableModel()
+    filter_model = SongFilterProxyModel()
+    filter_model.setSourceModel(model)
+    insert_songs(model, [create_song('0', 'a'), create_song('1', 'b')])
+
+    filter_model.filter_by_text('a')
+    # The songs are not filtered immediately.
+    assert filter_model.rowCount() == 2
+    qtbot.waitUntil(lambda: filter_model.rowCount() == 1, timeout=1000)
+    filter_model.filter_by_text('')
+    assert filter_model.rowCount() == 2
+
+
+@pytest.mark.asyncio
+async def test_songs_table_model_replace_reader(qtbot):
+    songs = [create_song(str(i), f'song{i}') for i in range(3)]
+    model = SongsTableModel(reader=wrap(songs))
+    model.on_items_fetched(songs)
+
+    new_songs = songs[1:] + [create_song('3', 'song3')]
+    assert model.replace_reader(wrap(new_songs), removed=songs[:1])
+    # The new song is fetched since all songs are shown.
+    await aio.sleep(0.1)
+    assert model._items == new_songs
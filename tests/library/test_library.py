@@ -1,3 +1,6 @@
+import asyncio
+import time
+
 import pytest
 
 from feeluown.library import (
@@ -82,3 +85,74 @@ async def test_library_a_list_song_standby_v2(library):
     song_media_list = await library.a_list_song_standby_v2(song)
     assert song_media_list
     assert song_media_list[0][1].url == "good.mp3"
+
+
+@pytest.mark.asyncio
+async def test_library_a_probe_standby_media(library):
+    # {identifier: (delay, url)}
+    delays = {"1": (0.5, None), "2": (0.1, "2.mp3"), "3": (0.05, "3.mp3")}
+    started = []
+
+    async def prepare_media(standby, *_, **__):
+        started.append(standby.identifier)
+        delay, url = delays[standby.identifier]
+        await asyncio.sleep(delay)
+        return Media(url) if url else None
+
+    library.a_song_prepare_media_no_exc = prepare_media
+    standby_list = [
+        BriefSongModel(identifier=identifier, source="xxx") for identifier in "123"
+    ]
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    song_media_list = await library.a_probe_standby_media(standby_list, delay=0.05)
+    # The slow one does not block others, and the result respects the order.
+    assert started == ["1", "2", "3"]
+    assert [s.identifier for s, _ in song_media_list] == ["2"]
+    assert loop.time() - start < 0.5 + 0.1
+
+
+@pytest.mark.asyncio
+async def test_library_a_list_song_standby_v2_timeout(library):
+    class SlowProvider(Provider):
+        @property
+        def identifier(self):
+            return "slow"
+
+        @property
+        def name(self):
+            return "slow"
+
+        def search(self, *_, **__):
+            time.sleep(0.5)
+
+    library.register(SlowProvider())
+    song = BriefSongModel(identifier="1", title="", source="xxx")
+    song_media_list, complete = await library.a_list_song_standby_v2(
+        song, source_in=["slow"], timeout=0.1, return_complete=True
+    )
+    assert song_media_list == []
+    assert complete is False
+
+
+@pytest.mark.asyncio
+async def test_library_a_list_song_standby_v2_provider_failed(library):
+    class BadProvider(Provider):
+        @property
+        def identifier(self):
+            return "bad"
+
+        @property
+        def name(self):
+            return "bad"
+
+        def search(self, *_, **__):
+            raise ConnectionError
+
+    library.register(BadProvider())
+    song = BriefSongModel(identifier="1", title="", source="xxx")
+    song_media_list, complete = await library.a_list_song_standby_v2(
+        song, source_in=["bad"], return_complete=True
+    )
+    assert song_media_list == []
+    assert complete is False
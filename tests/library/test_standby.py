@@ -4,6 +4,7 @@ from feeluown.library.standby import (
     get_standby_score,
     STANDBY_DEFAULT_MIN_SCORE,
     STANDBY_FULL_SCORE,
+    StandbyCache,
 )
 from feeluown.library import BriefSongModel
 
@@ -80,3 +81,46 @@ def test_get_standby_origin_similarity_2():
     song = create_song('很爱很爱你 (Live)', '刘若英', '脱掉高跟鞋 世界巡回演唱会', '05:55')
     candidates = [create_song('很爱很爱你', '刘若英', '脱掉高跟鞋世界巡回演唱会', '05:24')]
     assert score_fn(song, candidates[0]) >= STANDBY_DEFAULT_MIN_SCORE
+
+
+def test_standby_cache_save_and_load(tmp_path):
+    fpath = str(tmp_path / 'standby_cache.json')
+    song = BriefSongModel(source='a', identifier='1', title='x')
+    song2 = BriefSongModel(source='a', identifier='2', title='y')
+    standby = BriefSongModel(source='b', identifier='1', title='x', artists_name='z')
+    cache = StandbyCache(fpath)
+    cache.set(song, standby)
+    cache.set(song2, None)
+    cache.save()
+
+    cache = StandbyCache(fpath)
+    hit, model = cache.get(song)
+    assert hit and model == standby and model.artists_name == 'z'
+    assert cache.get(song2) == (True, None)
+
+
+def test_standby_cache_negative_ttl():
+    now = [0]
+    cache = StandbyCache(ttl=100, negative_ttl=10, timer=lambda: now[0])
+    song = BriefSongModel(source='a', identifier='1', title='x')
+    song2 = BriefSongModel(source='a', identifier='2', title='y')
+    cache.set(song, song2)
+    cache.set(song2, None)
+    now[0] = 20
+    assert cache.get(song)[0] is True
+    # The negative result expires earlier.
+    assert cache.get(song2) == (False, None)
+
+
+def test_standby_cache_evict_least_recently_used():
+    cache = StandbyCache(maxsize=2)
+    songs = [BriefSongModel(source='a', identifier=str(i), title='x')
+             for i in range(3)]
+    cache.set(songs[0], None)
+    cache.set(songs[1], None)
+    # songs[0] is used recently, so songs[1] is evicted.
+    assert cache.get(songs[0]) == (True, None)
+    cache.set(songs[2], None)
+    assert cache.get(songs[0]) == (True, None)
+    assert cache.get(songs[1]) == (False, None)
+    assert cache.get(songs[2]) == (True, None)
@@ -0,0 +1,161 @@
+from unittest.mock import patch
+
+import pytest
+
+from feeluown.local import init_config
+from feeluown.local.db import DB
+from feeluown.local.sqlite_db import SqliteDB
+from feeluown.config import Config
+
+
+@pytest.fixture
+def local_config():
+    config = Config()
+    init_config(config)
+    return config
+
+
+def touch(fpath):
+    with open(fpath, 'w'):
+        pass
+
+
+def test_db_rescan_only_parses_changed_files(tmp_path, local_config):
+    music_dir = tmp_path / 'music'
+    music_dir.mkdir()
+    touch(music_dir / 'a - x.wav')
+    touch(music_dir / 'b - y.wav')
+    db_fpath = str(tmp_path / 'db.json')
+    paths, exts = [str(music_dir)], ['wav']
+
+    db = DB(db_fpath)
+    db.scan(local_config, paths, 2, exts)
+    db.flush()
+    assert len(db.list_songs()) == 2
+
+    # A new db loads metadata from db file and parses nothing.
+    db = DB(db_fpath)
+    with patch('feeluown.local.db.read_audio_metadata') as mock_read:
+        db.scan(local_config, paths, 2, exts)
+        assert not mock_read.called
+    assert sorted(song.title for song in db.list_songs()) == ['a', 'b']
+
+    # Only the new file is parsed, and the deleted file is dropped.
+    (music_dir / 'b - y.wav').unlink()
+    touch(music_dir / 'c - z.wav')
+    db.scan(local_config, paths, 2, exts)
+    assert sorted(song.title for song in db.list_songs()) == ['a', 'c']
+    db.flush()
+    db = DB(db_fpath)
+    db.load()
+    assert len(db._file_metadata) == 2
+
+
+@pytest.mark.parametrize('content', [
+    '{"version": "2.0"}',
+    '{"version": "2.0", "options": null, "files": {}}',
+    '{"version": "2.0", "options": [false, "auto"], "files": []}',
+    '{"version": "2.0", "options": [false, "auto"], "files": {"a.wav": 1}}',
+])
+def test_db_rescan_when_db_file_is_malformed(tmp_path, local_config, content):
+    music_dir = tmp_path / 'music'
+    music_dir.mkdir()
+    touch(music_dir / 'a - x.wav')
+    db_fpath = tmp_path / 'db.json'
+    db_fpath.write_text(content)
+
+    db = DB(str(db_fpath))
+    db.scan(local_config, [str(music_dir)], 2, ['wav'])
+    assert [song.title for song in db.list_songs()] == ['a']
+
+
+def test_db_scan_with_process_pool(tmp_path, local_config):
+    music_dir = tmp_path / 'music'
+    music_dir.mkdir()
+    for i in range(10):
+        touch(music_dir / f'song{i} - artist{i}.wav')
+    local_config.SCAN_WORKERS = 2
+
+    db = DB(str(tmp_path / 'db.json'))
+    db.scan(local_config, [str(music_dir)], 2, ['wav'])
+    assert sorted(song.title for song in db.list_songs()) == \
+        [f'song{i}' for i in range(10)]
+
+
+def test_sqlite_db_loads_models_lazily(tmp_path, local_config):
+    music_dir = tmp_path / 'music'
+    music_dir.mkdir()
+    touch(music_dir / 'song1 - artist1.wav')
+    touch(music_dir / 'song2 - artist1.wav')
+    db_fpath = str(tmp_path / 'db.sqlite3')
+    paths, exts = [str(music_dir)], ['wav']
+
+    db = SqliteDB(db_fpath)
+    db.scan(local_config, paths, 2, exts)
+    db.after_scan()
+    db.flush()
+    song = db.list_songs()[0]
+    artist_id = song.artists[0].identifier
+
+    db = SqliteDB(db_fpath)
+    with patch('feeluown.local.db.read_audio_metadata') as mock_read:
+        db.scan(local_config, paths, 2, exts)
+        db.after_scan()
+        assert not mock_read.called
+    assert db._lazy and not db._songs
+    assert db.get_song(song.identifier) == song
+    assert db.get_song_fpath(song.identifier) == str(music_dir / 'song1 - artist1.wav')
+    assert len(db.get_artist(artist_id).hot_songs) == 2
+    assert len(db.list_albums_by_artist(artist_id)) == 0
+    assert len(db.list_albums_by_contributor(artist_id)) == 1
+    assert len(db.list_songs()) == 2
+
+
+def test_sqlite_db_rebuilds_models_when_options_changed(tmp_path, local_config):
+    music_dir = tmp_path / 'music'
+    music_dir.mkdir()
+    touch(music_dir / 'song1 - a1.wav')
+    db_fpath = str(tmp_path / 'db.sqlite3')
+    paths, exts = [str(music_dir)], ['wav']
+
+    db = SqliteDB(db_fpath)
+    db.scan(local_config, paths, 2, exts)
+    db.after_scan()
+    db.flush()
+
+    local_config.ARTIST_SPLITTER = ['1']
+    db = SqliteDB(db_fpath)
+    db.scan(local_config, paths, 2, exts)
+    db.after_scan()
+    assert not db._lazy
+    assert sorted(artist.name for artist in db.list_artists()) == ['Unknown', 'a']
+    db.flush()
+
+    # The rebuilt models are persisted and loaded lazily next time.
+    db = SqliteDB(db_fpath)
+    db.scan(local_config, paths, 2, exts)
+    assert db._lazy
+    assert sorted(artist.name for artist in db.list_artists()) == ['Unknown', 'a']
+
+
+def test_db_add_and_remove(tmp_path, local_config):
+    music_dir = tmp_path / 'music'
+    music_dir.mkdir()
+    touch(music_dir / 'song1 - artist1.wav')
+    db = DB('')
+    db.scan(local_config, [str(music_dir)], 2, ['wav'])
+    db.after_scan()
+
+    fpath = str(music_dir / 'song2 - artist2.wav')
+    touch(fpath)
+    song = db.add(fpath)
+    assert song.title == 'song2'
+    assert db.add(fpath) is None  # not changed
+    db.after_scan()
+    assert db.get_song_fpath(song.identifier) == fpath
+    assert len(db.list_artists()) == 3  # artist1, artist2 and 'Unknown'
+
+    assert db.remove(fpath) == song
+    assert db.get_song(song.identifier) is None
+    assert sorted(artist.name for artist in db.list_artists()) == \
+        ['Unknown', 'artist1']
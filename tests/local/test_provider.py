@@ -0,0 +1,79 @@
+from unittest.mock import Mock, patch
+
+from feeluown.local import init_config
+from feeluown.local.provider import LocalProvider
+from feeluown.local.sqlite_db import SqliteDB
+from feeluown.config import Config
+from feeluown.utils.dispatch import Signal
+
+
+def test_provider_builds_search_index_lazily(tmp_path):
+    config = Config()
+    init_config(config)
+    music_dir = tmp_path / 'music'
+    music_dir.mkdir()
+    for name in ('hello - a1.wav', 'world - a2.wav'):
+        with open(music_dir / name, 'w'):
+            pass
+    db_fpath = str(tmp_path / 'db.sqlite3')
+    paths = [str(music_dir)]
+    config.MUSIC_FORMATS = ['wav']
+
+    provider = LocalProvider()
+    provider.db = SqliteDB(db_fpath)
+    provider.scan(config, paths)
+
+    provider = LocalProvider()
+    provider.db = SqliteDB(db_fpath)
+    provider.scan(config, paths)
+    # Scanning does not load the models.
+    assert provider.db._lazy and not provider.db._songs
+    songs = provider.search('hello').songs
+    assert [song.title for song in songs] == ['hello']
+
+
+def test_provider_handles_changed_files_incrementally(tmp_path):
+    config = Config()
+    init_config(config)
+    music_dir = tmp_path / 'music'
+    music_dir.mkdir()
+    with open(music_dir / 'hello - a1.wav', 'w'):
+        pass
+    config.MUSIC_FORMATS = ['wav']
+
+    provider = LocalProvider()
+    provider.db = SqliteDB(str(tmp_path / 'db.sqlite3'))
+    provider.scan(config, [str(music_dir)])
+
+    fpath = str(music_dir / 'world - a2.wav')
+    with open(fpath, 'w'):
+        pass
+    with patch.object(provider.db, 'after_scan',
+                      wraps=provider.db.after_scan) as after_scan:
+        provider._on_files_changed({fpath})
+    album_ids, artist_ids = after_scan.call_args[0]
+    assert {provider.album_get(album_id).name for album_id in album_ids} \
+        == {'Unknown'}
+    assert sorted(provider.artist_get(artist_id).name
+                  for artist_id in artist_ids) == ['Unknown', 'a2']
+    song, = [song for song in provider.songs if song.title == 'world']
+    assert provider.song_get_media(song, None).url == fpath
+
+
+def test_provider_stops_watching_when_app_shutdown(tmp_path):
+    config = Config()
+    init_config(config)
+    config.WATCH_MUSIC_FOLDERS = True
+    app = Mock()
+    app.config.local = config
+    app.about_to_shutdown = Signal()
+
+    provider = LocalProvider()
+    provider.initialize(app)
+    provider.db = SqliteDB(str(tmp_path / 'db.sqlite3'))
+    provider.scan(config, [str(tmp_path)])
+    watcher = provider._watcher
+    assert watcher is not None
+    app.about_to_shutdown.emit(app)
+    assert watcher._stopped.is_set()
+    assert provider._watcher is None
@@ -0,0 +1,26 @@
+from feeluown.local.search_index import SearchIndex
+
+
+def test_search_index_basic():
+    index = SearchIndex()
+    index.add('1', 'hello', 'Hello World')
+    index.add('2', 'world', 'World Is Mine')
+    index.add('3', 'zaijian', '再见理想 Beyond')
+
+    assert index.search('world') == ['hello', 'world']
+    assert index.search('mine') == ['world']
+    assert index.search('理想') == ['zaijian']
+    assert index.search('h', limit=1) == ['hello']
+    assert index.search('not-exist') == []
+
+
+def test_search_index_update_and_remove():
+    index = SearchIndex()
+    index.add('1', 'hello', 'Hello World')
+    index.add('1', 'hi', 'Hi')
+    assert index.search('hello') == []
+    assert index.search('hi') == ['hi']
+
+    index.remove('1')
+    assert index.search('hi') == []
+    assert len(index) == 0
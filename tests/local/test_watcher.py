@@ -0,0 +1,23 @@
+import time
+from unittest.mock import MagicMock
+
+from feeluown.local.watcher import Watcher
+
+
+def test_watcher_debounce():
+    callback = MagicMock()
+    watcher = Watcher(['/'], ['mp3'], 2, callback, debounce=0.05)
+    watcher.on_paths_changed(['/a.mp3', '/b.txt'])
+    watcher.on_paths_changed(['/b.mp3'])
+    time.sleep(0.2)
+    callback.assert_called_once_with({'/a.mp3', '/b.mp3'})
+
+
+def test_watcher_ignore_files_deeper_than_depth(tmp_path):
+    callback = MagicMock()
+    watcher = Watcher([str(tmp_path)], ['mp3'], 1, callback, debounce=0.05)
+    paths = [tmp_path / 'a.mp3', tmp_path / 'x' / 'b.mp3',
+             tmp_path / 'x' / 'y' / 'c.mp3', '/d.mp3']
+    watcher.on_paths_changed([str(path) for path in paths])
+    time.sleep(0.2)
+    callback.assert_called_once_with({str(path) for path in paths[:2]})
@@ -0,0 +1,53 @@
+import asyncio
+import threading
+
+import pytest
+
+from feeluown.player.fader import Fader
+
+
+@pytest.mark.asyncio
+async def test_fader_fade_out_and_in():
+    factors = []
+    finished = asyncio.Event()
+    fader = Fader(factors.append, 100, asyncio.get_running_loop())
+    fader.fade_out(on_finished=finished.set)
+    assert fader.is_fading
+    await asyncio.wait_for(finished.wait(), 1)
+    assert not fader.is_fading
+    assert factors[-1] == 0
+    # Volume steps are coarse-grained.
+    assert len(factors) < 100 / 1000 / Fader.interval + 3
+    assert factors == sorted(factors, reverse=True)
+
+    fader.fade_in()
+    await asyncio.sleep(0.2)
+    assert fader.factor == 1
+    finished.clear()
+    fader.fade_out(on_finished=finished.set)
+    await asyncio.sleep(0.05)
+    # The fade-out is replaced by the fade-in.
+    fader.fade_in()
+    await asyncio.sleep(0.2)
+    assert not finished.is_set()
+    assert fader.factor == 1
+
+
+@pytest.mark.asyncio
+async def test_fader_start_from_other_thread():
+    factors = []
+    fader = Fader(factors.append, 50, asyncio.get_running_loop())
+    thread = threading.Thread(target=fader.fade_out)
+    thread.start()
+    thread.join()
+    # A stale fade which is scheduled from another thread is dropped.
+    fader.reset(1)
+    await asyncio.sleep(0.1)
+    assert fader.factor == 1
+
+
+def test_fader_without_event_loop():
+    factors = []
+    fader = Fader(factors.append, 500)
+    fader.fade_out()
+    assert factors == [0]
@@ -1,8 +1,8 @@
 import asyncio
 import pytest
 
-from feeluown.player import LiveLyric, parse_lyric_text
-from feeluown.library import LyricModel
+from feeluown.player import LiveLyric, Lyric, parse_lyric_text
+from feeluown.library import BriefSongModel, LyricModel
 
 
 lyric = """[by:魏积分]
@@ -67,13 +67,15 @@ SomeoneLikeYouTrans = """
 class FakeLyric(object):
     def __init__(self):
         self.content = lyric
+        self.trans_content = ''
 
 
 @pytest.mark.asyncio
 async def test_no_song_changed(app_mock):
     app_mock.library.song_get_lyric.return_value = FakeLyric()
+    app_mock.playlist.next_song = None
     live_lyric = LiveLyric(app_mock)
-    song = object()
+    song = BriefSongModel(identifier='1', source='xxx')
     live_lyric.on_song_changed(song)
     await asyncio.sleep(0.1)
     live_lyric.on_position_changed(60)
@@ -117,3 +119,102 @@ def test_parse_ill_formed_lyric():
 ''')
     assert result[50] == ' 作曲 : シャノン'
     assert result[100] == '僕らの最後は死別にしよう'
+
+
+@pytest.mark.asyncio
+async def test_live_lyric_cache(app_mock):
+    app_mock.library.song_get_lyric.return_value = FakeLyric()
+    app_mock.playlist.next_song = None
+    live_lyric = LiveLyric(app_mock)
+    song = BriefSongModel(identifier='1', source='xxx')
+    live_lyric.on_song_changed(song)
+    await asyncio.sleep(0.1)
+    live_lyric.on_position_changed(60)
+    live_lyric.on_song_changed(None)
+    assert live_lyric.current_sentence == ''
+
+    # The lyric is not fetched again, and it starts from the beginning.
+    live_lyric.on_song_changed(song)
+    assert app_mock.library.song_get_lyric.call_count == 1
+    assert live_lyric.current_sentence == ''
+    live_lyric.on_position_changed(60)
+    assert live_lyric.current_sentence == '互いのすべてを　知りつくすまでが'
+
+
+@pytest.mark.asyncio
+async def test_live_lyric_prefetch_next_song(app_mock):
+    song = BriefSongModel(identifier='1', source='xxx')
+    next_song = BriefSongModel(identifier='2', source='xxx')
+    app_mock.library.song_get_lyric.side_effect = lambda s: \
+        FakeLyric() if s == next_song else None
+    app_mock.playlist.next_song = next_song
+    live_lyric = LiveLyric(app_mock)
+    live_lyric.on_song_changed(song)
+    await asyncio.sleep(0.1)
+    assert live_lyric.current_lyrics == (None, None)
+    assert app_mock.library.song_get_lyric.call_count == 2
+
+    # Lyrics of the next song are ready once it is changed.
+    app_mock.playlist.next_song = None
+    live_lyric.on_song_changed(next_song)
+    live_lyric.on_position_changed(60)
+    assert live_lyric.current_sentence == '互いのすべてを　知りつくすまでが'
+    assert app_mock.library.song_get_lyric.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_live_lyric_not_cache_empty_lyrics(app_mock):
+    app_mock.library.song_get_lyric.return_value = None
+    app_mock.playlist.next_song = None
+    live_lyric = LiveLyric(app_mock)
+    song = BriefSongModel(identifier='1', source='xxx')
+    live_lyric.on_song_changed(song)
+    await asyncio.sleep(0.1)
+    assert live_lyric.current_lyrics == (None, None)
+
+    # The lyric is fetched again since the empty result is not cached.
+    app_mock.library.song_get_lyric.return_value = FakeLyric()
+    live_lyric.on_song_changed(song)
+    await asyncio.sleep(0.1)
+    assert app_mock.library.song_get_lyric.call_count == 2
+    assert live_lyric.current_lyrics[0] is not None
+
+
+def test_lyric_update_position():
+    lyric_ = Lyric.from_content(lyric)
+    pos_list = lyric_._pos_list
+    assert lyric_.update_position(0) == ('', False)
+    # Forward, jump forward and seek backward.
+    for ms in (38010, 47130, 151190, 54290, 38010, 276310):
+        sentence, changed = lyric_.update_position(ms / 1000)
+        assert changed
+        assert sentence == lyric_.lines[pos_list.index(ms)]
+        assert lyric_.update_position(ms / 1000 + 0.1) == (sentence, False)
+
+
+def create_karaoke_lyric_text(num=5000):
+    return '\n'.join(
+        f'[{i // 6000:02d}:{i // 100 % 60:02d}.{i % 100:02d}]word{i}'
+        for i in range(num)
+    )
+
+
+def test_bench_parse_long_lyric(benchmark):
+    content = create_karaoke_lyric_text()
+    result = benchmark(parse_lyric_text, content)
+    assert len(result) == 5000
+
+
+def test_bench_lyric_update_position(benchmark):
+    lyric_ = Lyric.from_content(create_karaoke_lyric_text())
+
+    def play():
+        lyric_.reset()
+        # Position is changed every 10ms, and seek at the end.
+        for i in range(5000):
+            lyric_.update_position(i / 100)
+        lyric_.update_position(0)
+
+    benchmark(play)
+    # The lyric is shown 300ms in advance.
+    assert lyric_.current_s == 'word30'
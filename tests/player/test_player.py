@@ -60,6 +60,16 @@ def test_seek(mpvplayer, mocker):
     mock_seeked_emit.assert_called_once_with(100)
 
 
+@pytest.mark.parametrize('fade_tracks', [False, True])
+def test_fade_out_tail_only_when_fade_tracks_enabled(fade_tracks):
+    player = MpvPlayer(fade=True, fade_tracks=fade_tracks)
+    player.state = State.playing
+    player.duration = 100
+    player._on_position_changed(99.9)
+    assert player._fading_out_tail is fade_tracks
+    player.shutdown()
+
+
 class TestPlayer(TestCase):
 
     def setUp(self):
@@ -5,6 +5,7 @@ import pytest
 import pytest_asyncio
 
 from feeluown.library.excs import MediaNotFound
+from feeluown.media import Media
 from feeluown.player import (
     Playlist, PlaylistMode, Player, PlaybackMode,
     PlaylistRepeatMode, PlaylistShuffleMode, MetadataAssembler
@@ -37,7 +38,7 @@ async def pl_prepare_media_none(mocker, pl):
 @pytest_asyncio.fixture
 async def pl_list_standby_return_empty(mocker, pl):
     f2 = asyncio.Future()
-    f2.set_result([])
+    f2.set_result(([], True))
     mock_a_list_standby = pl._app.library.a_list_song_standby_v2
     mock_a_list_standby.return_value = f2
 
@@ -45,7 +46,7 @@ async def pl_list_standby_return_empty(mocker, pl):
 @pytest_asyncio.fixture
 async def pl_list_standby_return_song2(mocker, pl, song2):
     f2 = asyncio.Future()
-    f2.set_result([(song2, SONG2_URL)])
+    f2.set_result(([(song2, SONG2_URL)], True))
     mock_a_list_standby = pl._app.library.a_list_song_standby_v2
     mock_a_list_standby.return_value = f2
 
@@ -191,6 +192,44 @@ async def test_set_an_existing_bad_song_as_current_song(
     assert pl.list().index(song2) == 2
 
 
+@pytest.mark.asyncio
+async def test_find_and_use_standby_cached(
+        mocker, song1, song2, pl,
+        pl_list_standby_return_song2):
+    await pl.find_and_use_standby(song1)
+    assert pl._app.library.a_list_song_standby_v2.call_count == 1
+
+    f = asyncio.Future()
+    f.set_result(SONG2_URL)
+    pl._app.library.a_song_prepare_media_no_exc.return_value = f
+    standby, media = await pl.find_and_use_standby(song1)
+    # The standby is not searched again.
+    assert pl._app.library.a_list_song_standby_v2.call_count == 1
+    assert standby.identifier == song2.identifier
+    assert media == SONG2_URL
+
+
+@pytest.mark.asyncio
+async def test_find_and_use_standby_cached_negative(
+        song1, pl, pl_list_standby_return_empty):
+    assert await pl.find_and_use_standby(song1) == (song1, None)
+    assert await pl.find_and_use_standby(song1) == (song1, None)
+    assert pl._app.library.a_list_song_standby_v2.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_find_and_use_standby_not_cache_incomplete_result(song1, pl):
+    def list_standby(*_, **__):
+        f = asyncio.Future()
+        f.set_result(([], False))  # Timeout or some providers failed.
+        return f
+
+    pl._app.library.a_list_song_standby_v2.side_effect = list_standby
+    assert await pl.find_and_use_standby(song1) == (song1, None)
+    assert await pl.find_and_use_standby(song1) == (song1, None)
+    assert pl._app.library.a_list_song_standby_v2.call_count == 2
+
+
 @pytest.fixture
 def mock_a_set_cursong(mocker):
     mocker.patch.object(Playlist, 'a_set_current_song', new=mock.MagicMock)
@@ -445,3 +484,64 @@ def test_playlist_next_song(pl):
     assert pl.next_song == pl.list()[0]
     pl.playback_mode = PlaybackMode.sequential
     assert pl.next_song is None
+
+
+@pytest.mark.asyncio
+async def test_playlist_gapless_preload_next_song(
+        pl, app_mock, song1, mocker, mock_prepare_metadata):
+    media = Media('http://x.mp3')
+    mocker.patch.object(Playlist, '_prepare_media', return_value=media)
+    app_mock.config.ENABLE_GAPLESS_PLAYBACK = True
+    app_mock.player.duration = 200
+    app_mock.player.preload.return_value = True
+    tasks = []
+
+    def run_afn_preemptive(afn, *args, name):
+        tasks.append(asyncio.ensure_future(afn(*args)))
+        return tasks[-1]
+
+    app_mock.task_mgr.run_afn_preemptive.side_effect = run_afn_preemptive
+
+    # The current song is far from the end.
+    pl._on_position_changed(100)
+    assert not app_mock.task_mgr.run_afn_preemptive.called
+    pl._on_position_changed(190)
+    await tasks[-1]
+    app_mock.player.preload.assert_called_once_with(media)
+    # Only preload once.
+    pl._on_position_changed(191)
+    assert app_mock.task_mgr.run_afn_preemptive.call_count == 1
+
+    # The player plays the preloaded media when the current one is finished.
+    app_mock.player.preloaded_media = media
+    await pl._on_media_finished()
+    assert pl.current_song == song1
+    app_mock.player.play_preloaded.assert_called_once_with(media, metadata=mock.ANY)
+    assert not app_mock.player.play.called
+
+
+@pytest.mark.asyncio
+async def test_playlist_prefetch_media(pl, app_mock, song, song1, song2):
+    app_mock.config.MEDIA_PREFETCH_COUNT = 2
+    app_mock.library.song_prepare_media.side_effect = \
+        lambda s, _: Media(f'http://{s.identifier}.mp3')
+    pl.add(song2)
+    pl.playback_mode = PlaybackMode.random
+    with pl._queue_lock:
+        next_songs = pl._get_next_songs_no_lock(2)
+    # The next songs are in shuffled order.
+    index = pl._queue.index(song)
+    queue = pl._queue[index + 1:] + pl._queue[:index]
+    assert next_songs == queue[:2]
+
+    await pl._a_prefetch_media()
+    assert app_mock.library.song_prepare_media.call_count == 2
+    media = await pl._prepare_media(next_songs[0])
+    assert media.url == f'http://{next_songs[0].identifier}.mp3'
+    assert app_mock.library.song_prepare_media.call_count == 2
+
+    # Expired media is prepared again.
+    key = (next_songs[1], pl.audio_select_policy)
+    pl._media_cache.set(key, pl._media_cache.get(key), ttl=0)
+    await pl._prepare_media(next_songs[1])
+    assert app_mock.library.song_prepare_media.call_count == 3
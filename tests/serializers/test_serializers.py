@@ -1,6 +1,6 @@
 from feeluown.app import App
 from feeluown.player import Player, Playlist
-from feeluown.serializers import serialize
+from feeluown.serializers import serialize, JsonSerializer
 from feeluown.library import SongModel, SimpleSearchResult, AlbumModel
 from feeluown.player import Metadata
 
@@ -60,3 +60,40 @@ def test_serialize_search_result():
     d = serialize('python', result)
     assert d['songs'][0]['identifier'] == '1'
     serialize('plain', result)  # should not raise error
+
+
+def create_songs(count):
+    return [SongModel(identifier=str(i), title=f'song {i}', artists=[], duration=0)
+            for i in range(count)]
+
+
+def test_serialize_list_of_mixed_types():
+    song = SongModel(identifier='1', title='hello', artists=[], duration=0)
+    js = serialize('python', [song, 'x', 1])
+    assert js[0]['identifier'] == '1'
+    assert js[1:] == ['x', 1]
+
+
+def test_bench_serialize_python_song_list(benchmark):
+    songs = create_songs(5000)
+    js = benchmark(serialize, 'python', songs)
+    assert len(js) == 5000
+
+
+def test_bench_serialize_json_song_list(benchmark):
+    songs = create_songs(5000)
+    benchmark(serialize, 'json', songs)
+
+
+def test_bench_serialize_plain_song_list(benchmark):
+    songs = create_songs(5000)
+    benchmark(serialize, 'plain', songs)
+
+
+def test_json_serialize_iter():
+    songs = create_songs(100)
+    for obj in (songs, [], [songs[0], 'x', 1], {'a': 1}):
+        serializer = JsonSerializer(brief=False)
+        chunks = list(serializer.serialize_iter(obj, chunk_size=100))
+        assert ''.join(chunks) == serialize('json', obj, brief=False)
+    assert len(list(JsonSerializer().serialize_iter(songs, chunk_size=100))) > 1
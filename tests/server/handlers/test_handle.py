@@ -3,6 +3,7 @@ import json
 import pytest
 
 from feeluown.server import handle_request, Request
+from feeluown.server.data_structure import SessionOptions
 from feeluown.server.handlers.search import SearchHandler
 
 
@@ -23,3 +24,14 @@ async def test_handle_request(req, app_mock, mocker):
     resp = await handle_request(req, app_mock, mocker.Mock())
     assert resp.code == 'OK'
     assert json.loads(resp.text) == result
+
+
+@pytest.mark.asyncio
+async def test_handle_request_chunked(req, app_mock, mocker):
+    result = [1, 2]
+    mocker.patch.object(SearchHandler, 'search', return_value=result)
+    session = mocker.Mock()
+    session.options = SessionOptions(ack_framing='chunked')
+    resp = await handle_request(req, app_mock, session)
+    assert resp.code == 'OK'
+    assert json.loads(''.join(resp.iter_chunks())) == result
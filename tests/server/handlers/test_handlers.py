@@ -1,9 +1,12 @@
+import threading
 from unittest.mock import call
 
 import pytest
 
 from feeluown.server.handlers.sub import SubHandler
 from feeluown.server.handlers.help import HelpHandler
+from feeluown.server.handlers.show import ShowHandler
+from feeluown.server.handlers.cmd import Cmd
 
 
 @pytest.fixture
@@ -34,3 +37,16 @@ def test_handle_help(app_mock, session_mock):
 
     result = handler.handle_help('status')
     assert 'usage' in result
+
+
+@pytest.mark.asyncio
+async def test_handle_show_in_executor_only_for_providers(app_mock, session_mock):
+    app_mock.library.get.side_effect = lambda pid: object() if pid == 'fake' else None
+    handler = ShowHandler(app_mock, session_mock)
+    threads = []
+    handler.handle = lambda cmd: threads.append(threading.get_ident())
+    for uri in ('fuo://', 'fuo://server/sessions/me', 'fuo://fake/songs/1'):
+        await handler.a_handle(Cmd('show', uri))
+    main_thread = threading.get_ident()
+    assert threads[:2] == [main_thread, main_thread]
+    assert threads[2] != main_thread
@@ -0,0 +1,117 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+from feeluown.server.protocol import DeadSubscriber
+from feeluown.server.pubsub import Gateway
+
+
+class Subscriber:
+    def __init__(self):
+        self.msgs = []
+        self.closed = False
+
+    def write_topic_msg(self, topic, msg):
+        self.msgs.append((topic, msg))
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_gateway_publish_serialize_once():
+    gateway = Gateway()
+    gateway.add_topic('x')
+    subscribers = [Subscriber(), Subscriber()]
+    for subscriber in subscribers:
+        gateway.link('x', subscriber)
+    with mock.patch('feeluown.server.pubsub.gateway.serialize',
+                    return_value='[1]') as mock_serialize:
+        gateway.publish([1], 'x', need_serialize=True)
+    assert mock_serialize.call_count == 1
+    await asyncio.sleep(0)
+    for subscriber in subscribers:
+        assert subscriber.msgs == [('x', '[1]')]
+
+
+@pytest.mark.asyncio
+async def test_gateway_publish_coalesce():
+    gateway = Gateway()
+    gateway.add_topic('pos', coalesce=True)
+    gateway.add_topic('x')
+    subscriber = Subscriber()
+    gateway.link('pos', subscriber)
+    gateway.link('x', subscriber)
+    for i in range(3):
+        gateway.publish(str(i), 'pos')
+    gateway.publish('a', 'x')
+    await asyncio.sleep(0)
+    # Only the latest message of the coalesced topic is sent.
+    assert subscriber.msgs == [('pos', '2'), ('x', 'a')]
+
+
+class SlowSubscriber(Subscriber):
+    """The buffer of the subscriber is never drained."""
+
+    def __init__(self):
+        super().__init__()
+        self._writer = mock.Mock()
+        self._writer.drain.return_value = asyncio.get_running_loop().create_future()
+
+    @property
+    def writer(self):
+        return self._writer
+
+
+@pytest.mark.asyncio
+async def test_gateway_disconnect_slow_subscriber():
+    gateway = Gateway()
+    gateway.MAX_PENDING_MESSAGES = 2
+    gateway.add_topic('x')
+    slow, fast = SlowSubscriber(), Subscriber()
+    gateway.link('x', slow)
+    gateway.link('x', fast)
+    for i in range(4):
+        gateway.publish(str(i), 'x')
+        await asyncio.sleep(0)
+    assert slow.closed
+    assert slow not in gateway._queues
+    assert len(fast.msgs) == 4
+
+
+@pytest.mark.asyncio
+async def test_gateway_remove_dead_subscriber():
+    gateway = Gateway()
+    gateway.add_topic('x')
+    subscriber = mock.Mock()
+    subscriber.write_topic_msg.side_effect = DeadSubscriber
+    gateway.link('x', subscriber)
+    gateway.publish('0', 'x')
+    await asyncio.sleep(0)
+    assert subscriber not in gateway._relations['x']
+
+
+class ResetSubscriber(Subscriber):
+    """The connection is reset by peer when draining."""
+
+    def __init__(self):
+        super().__init__()
+        self.writer = mock.Mock()
+        self.writer.drain = mock.AsyncMock(side_effect=ConnectionResetError)
+
+
+@pytest.mark.asyncio
+async def test_gateway_remove_subscriber_when_connection_reset():
+    gateway = Gateway()
+    gateway.add_topic('x')
+    reset, subscriber = ResetSubscriber(), Subscriber()
+    gateway.link('x', reset)
+    gateway.link('x', subscriber)
+    gateway.publish('0', 'x')
+    await asyncio.sleep(0)
+    assert reset not in gateway._relations['x']
+    # Subscribers without a writer are not affected.
+    gateway.publish('1', 'x')
+    await asyncio.sleep(0)
+    assert subscriber.msgs == [('x', '0'), ('x', '1')]
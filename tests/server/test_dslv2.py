@@ -1,5 +1,6 @@
 import pytest
 from feeluown.server.excs import FuoSyntaxError
+from feeluown.server import dslv2
 from feeluown.server.dslv2 import tokenize, Parser, unparse, parse
 
 
@@ -64,3 +65,45 @@ def test_unparse():
     req = parse("search 'zjl()'")
     text = unparse(req)
     assert text == "search 'zjl()'"
+
+
+@pytest.mark.parametrize('source', [
+    'status',
+    'play fuo://local/songs/1',
+    'search zjl -s=xx --source yy --type=song --type album --format=json',
+    'search --type=song zjl',
+    'search zjl --sour=xx',
+    "search 'zjl()' --json",
+    'add',
+    'add fuo://local/songs/1 --plain',
+    'exec <<EOF',
+    'set --rpc-version 2.0 --pipeline=on',
+    'sub player.* --format json',
+])
+def test_parse_fast_parser_same_as_argparse(source, monkeypatch):
+    def to_tuple(req):
+        return (req.cmd, req.cmd_args, req.cmd_options, req.options,
+                req.has_heredoc, req.heredoc_word)
+
+    req = parse(source)
+    # Disable the fast parser.
+    monkeypatch.setattr(dslv2, '_cmd_tables', {})
+    assert to_tuple(req) == to_tuple(parse(source))
+
+
+@pytest.mark.parametrize('source', [
+    'play',
+    'status xx',
+    'search zjl --type=xx',
+    'search zjl --type',
+    'search zjl --json=1',
+    'xx yy',
+])
+def test_parse_invalid_source_with_fast_parser(source):
+    with pytest.raises(FuoSyntaxError):
+        parse(source)
+
+
+def test_bench_parse(benchmark):
+    req = benchmark(parse, 'search zjl --type=song -s=xx --format=json')
+    assert req.cmd_options['type'] == ['song']
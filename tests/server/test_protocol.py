@@ -3,14 +3,20 @@ from unittest import mock, TestCase
 
 import pytest
 
+from feeluown.server import binary_framing
 from feeluown.server.protocol import FuoServerProtocol, read_request
 from feeluown.server.dslv2 import parse
+from feeluown.server.data_structure import Response
 
 
 async def coro():
     return None
 
 
+async def coro_raise(e):
+    raise e
+
+
 @pytest.mark.asyncio
 async def test_read_request():
     reader = asyncio.StreamReader()
@@ -96,3 +102,180 @@ class TestFuoServerProtocol(TestCase):
         self.loop.close()
         self.loop = None
         self.protocol = None
+
+
+@pytest.mark.asyncio
+async def test_write_chunked_response():
+    protocol = FuoServerProtocol(handle_req=lambda: (), loop=asyncio.get_running_loop())
+    protocol.options.ack_framing = 'chunked'
+    writer = mock.Mock()
+    writer.drain = coro
+    protocol._writer = writer
+    await protocol.write_response(Response(chunks=iter(['[1', '', ', 2]'])))
+    data = b''.join(call.args[0] for call in writer.write.call_args_list)
+    assert data == b'ACK OK chunked\r\n2\r\n[1\r\n4\r\n, 2]\r\n0\r\n\r\n'
+
+
+@pytest.mark.asyncio
+async def test_write_chunked_response_failed():
+    def chunks():
+        raise ValueError('xx')
+        yield  # pylint: disable=unreachable
+
+    protocol = FuoServerProtocol(handle_req=lambda: (), loop=asyncio.get_running_loop())
+    protocol.options.ack_framing = 'chunked'
+    writer = mock.Mock()
+    writer.drain = coro
+    protocol._writer = writer
+    await protocol.write_response(Response(chunks=chunks()))
+    data = b''.join(call.args[0] for call in writer.write.call_args_list)
+    assert data.startswith(b'ACK Oops chunked\r\n')
+
+
+@pytest.mark.asyncio
+async def test_start_pipelined():
+    slow_req_started = asyncio.Event()
+
+    async def handle_req(req, _):
+        if req.cmd == 'search':
+            slow_req_started.set()
+            await asyncio.sleep(0.05)
+        return Response(text=req.cmd, req=req)
+
+    protocol = FuoServerProtocol(handle_req=handle_req,
+                                 loop=asyncio.get_running_loop())
+    protocol.options.pipeline = 'on'
+    protocol._connection_lost = False
+    writer = mock.Mock()
+    writer.drain = coro
+    protocol._writer = writer
+    protocol._reader = reader = asyncio.StreamReader()
+    reader.feed_data(b'search zjl\n')
+    reader.feed_data(b'status\n')
+    reader.feed_eof()
+    await protocol.start()
+    data = b''.join(call.args[0] for call in writer.write.call_args_list)
+    # The response of status is written before the slow one.
+    assert data.endswith(b'ACK OK 6 2\r\nstatus\r\nACK OK 6 1\r\nsearch\r\n')
+    assert slow_req_started.is_set()
+
+
+@pytest.mark.asyncio
+async def test_start_pipelined_write_failed(caplog):
+    async def handle_req(req, _):
+        return Response(text=req.cmd, req=req)
+
+    protocol = FuoServerProtocol(handle_req=handle_req,
+                                 loop=asyncio.get_running_loop())
+    protocol.options.pipeline = 'on'
+    protocol._connection_lost = False
+    writer = mock.Mock()
+    writer.drain = coro
+    protocol._writer = writer
+    protocol._reader = reader = asyncio.StreamReader()
+    reader.feed_data(b'search zjl\n')
+    reader.feed_data(b'status\n')
+    reader.feed_eof()
+    errors = {'search': BrokenPipeError(), 'status': ValueError('xx')}
+    protocol.write_response = mock.Mock(
+        side_effect=lambda resp, _: coro_raise(errors[resp.req.cmd]))
+    await protocol.start()
+    # The errors are handled in the tasks, and the semaphore is released.
+    assert not protocol._pipelined_tasks
+    assert 'handle pipelined request 2 failed' in caplog.text
+    assert 'request 1 failed' not in caplog.text
+
+
+async def _handle_req(req, session):
+    if req.cmd == 'set':
+        for key, value in req.cmd_options.items():
+            if value is not None:
+                setattr(session.options, key, value)
+    return Response(text=req.cmd, req=req)
+
+
+def _create_protocol(reader, handle_req=_handle_req):
+    protocol = FuoServerProtocol(handle_req=handle_req,
+                                 loop=asyncio.get_running_loop())
+    protocol._connection_lost = False
+    writer = mock.Mock()
+    writer.drain = coro
+    protocol._writer = writer
+    protocol._reader = reader
+    return protocol
+
+
+def _written_data(protocol):
+    return b''.join(call.args[0] for call in protocol.writer.write.call_args_list)
+
+
+def _unpack_frames(data):
+    frames = []
+    while data:
+        length, = binary_framing.HEADER.unpack(data[:binary_framing.HEADER.size])
+        data = data[binary_framing.HEADER.size:]
+        frames.append(binary_framing.unpack_payload(data[:length]))
+        data = data[length:]
+    return frames
+
+
+@pytest.mark.asyncio
+async def test_start_binary_framing():
+    pytest.importorskip('msgpack')
+
+    reader = asyncio.StreamReader()
+    reader.feed_data(b'set --wire-format msgpack\n')
+    reader.feed_data(binary_framing.pack_frame({'cmd': 'status'}))
+    reader.feed_data(binary_framing.pack_frame(['invalid']))
+    reader.feed_eof()
+    protocol = _create_protocol(reader)
+    await protocol.start()
+
+    data = _written_data(protocol)
+    # The response of set is still in the text framing.
+    prefix = b'OK rpc 2.0\r\nACK OK 3\r\nset\r\n'
+    assert data.startswith(prefix)
+    frames = _unpack_frames(data[len(prefix):])
+    assert frames[0] == {'code': 'OK', 'body': 'status'}
+    assert frames[1]['code'] == 'Oops'
+
+
+@pytest.mark.asyncio
+async def test_write_topic_msg_binary_framing():
+    pytest.importorskip('msgpack')
+
+    protocol = _create_protocol(asyncio.StreamReader())
+    protocol._wire_format = 'msgpack'
+    protocol.writer.is_closing.return_value = False
+    protocol.write_topic_msg('player.seeked', '{}')
+    assert _unpack_frames(_written_data(protocol)) == \
+        [{'topic': 'player.seeked', 'body': '{}'}]
+
+
+def _create_requests(wire_format, n):
+    if wire_format == 'msgpack':
+        payload = {'cmd': 'search', 'args': ['zjl'],
+                   'cmd_options': {'type': ['song']}, 'options': {'format': 'json'}}
+        return binary_framing.pack_frame(payload) * n
+    return b'search zjl --type=song #: format=json\n' * n
+
+
+@pytest.mark.parametrize('wire_format', ['text', 'msgpack'])
+def test_bench_framing_throughput(benchmark, wire_format):
+    if wire_format == 'msgpack':
+        pytest.importorskip('msgpack')
+    data = _create_requests(wire_format, 1000)
+
+    async def handle_req(req, _):
+        return Response(text='[]', req=req)
+
+    async def serve():
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        protocol = _create_protocol(reader, handle_req)
+        protocol._wire_format = wire_format
+        await protocol.start()
+        return protocol.writer.write.call_count
+
+    assert benchmark(lambda: asyncio.run(serve())) > 1000
@@ -1,4 +1,7 @@
+import hashlib
+
 from feeluown.library import BriefSongModel
+from feeluown.local.db import DB, add_song
 from feeluown.utils.utils import DedupList
 
 
@@ -21,3 +24,31 @@ def test_deduplist_addremove(benchmark):
         for i in range(num // 10):
             song_list.pop(0)
     benchmark(addremove)
+
+
+def test_local_db_add_song_and_after_scan(benchmark):
+    num = 50000
+    metadata_list = []
+    for i in range(num):
+        metadata_list.append({
+            'title': hashlib.md5(str(i).encode()).hexdigest(),
+            'artists_name': f'artist{i % 5000}',
+            'album_name': f'album{i % 10000}',
+            'album_artist_name': f'artist{i % 5000}',
+            'duration': 200000 + i,
+            'track': f'{i % 5 + 1}/5',
+            'disc': '1/1',
+            'date': f'{2000 + i % 20}',
+            'genre': '',
+        })
+
+    def scan():
+        db = DB('')
+        for i, data in enumerate(metadata_list):
+            add_song(f'/music/{i}.mp3', db._songs, db._artists, db._albums,
+                     db._file_song, db._album_contributors, data=data)
+        db.after_scan()
+        return db
+
+    db = benchmark.pedantic(scan, rounds=1, iterations=1)
+    assert all(artist.pic_url for artist in db.list_artists())
@@ -1,7 +1,12 @@
+import queue
+import threading
+
 import pytest
 from unittest import mock, TestCase
 
-from feeluown.utils.reader import RandomReader, RandomSequentialReader, wrap
+from feeluown.utils.reader import (
+    RandomReader, RandomSequentialReader, PagedRandomSequentialReader, wrap,
+)
 
 
 def test_sequential_reader():
@@ -118,3 +123,91 @@ class TestRandomSequentialReader(TestCase):
         with self.assertRaises(StopIteration):
             next(reader)
         self.assertEqual(reader.offset, 11)
+
+
+class TestPagedRandomSequentialReader(TestCase):
+    def create_reader(self, count=105, **kwargs):
+        self.calls = []
+
+        def read_func(start, end):
+            self.calls.append((start, end))
+            return list(range(start, end))
+
+        return PagedRandomSequentialReader(count, read_func, **kwargs)
+
+    def test_read_range(self):
+        reader = self.create_reader(max_per_read=10, prefetch=0)
+        assert reader.read_range(5, 25) == list(range(5, 25))
+        assert reader.read(15) == 15
+        assert self.calls == [(0, 10), (10, 20), (20, 30)]
+        assert reader.read_range(100, 200) == list(range(100, 105))
+        assert self.calls[-1] == (100, 105)
+        with self.assertRaises(IndexError):
+            reader.read(105)
+
+    def test_evict_cold_pages(self):
+        reader = self.create_reader(max_per_read=10, max_cached=30, prefetch=0)
+        assert list(reader) == list(range(105))
+        assert reader._cached <= 30
+        assert not reader.has_index(0)
+        assert reader.has_index(104)
+        assert reader.readall() == list(range(105))
+
+    def test_prefetch(self):
+        reader = self.create_reader(max_per_read=10, prefetch=2)
+        reader.read(0)
+        # Wait for the prefetching pages.
+        for page_no in (1, 2):
+            reader._read_page(page_no)
+        assert reader.has_index(29)
+        assert not reader.has_index(30)
+        assert sorted(self.calls) == [(0, 10), (10, 20), (20, 30)]
+
+    def test_read_page_being_prefetched(self):
+        event = threading.Event()
+        calls = []
+
+        def read_func(start, end):
+            calls.append((start, end))
+            if start > 0:
+                event.wait()
+            return list(range(start, end))
+
+        reader = PagedRandomSequentialReader(20, read_func, max_per_read=10)
+        reader.read(0)
+        threading.Timer(0.1, event.set).start()
+        # The page is being prefetched, it should not be read twice.
+        assert reader.read(10) == 10
+        assert calls == [(0, 10), (10, 20)]
+
+    def test_take_over_queued_prefetching(self):
+        reader = self.create_reader(max_per_read=10)
+        # The prefetch threads are busy, so page 1 is queued and not started.
+        prefetch_queue = queue.Queue()
+        reader._get_prefetch_queue = lambda: prefetch_queue
+        reader.read(0)
+        assert reader.read(10) == 10
+        assert self.calls == [(0, 10), (10, 20)]
+        # The prefetch thread skips the page which is taken over.
+        _, page_no, future = prefetch_queue.get_nowait()
+        reader._prefetch_page(page_no, future)
+        assert self.calls == [(0, 10), (10, 20)]
+
+
+def test_wrap_paged_random_sequential_reader():
+    def read_func(start, end):
+        return list(range(start, end))
+
+    reader = RandomSequentialReader(20, read_func, max_per_read=10)
+    # The reader is converted only when it is asked for.
+    assert wrap(reader) is reader
+    reader = wrap(reader, paged=True)
+    assert isinstance(reader, PagedRandomSequentialReader)
+    assert reader.read_range(5, 15) == list(range(5, 15))
+
+    # A reader with only one page, or a reader which is read, is kept.
+    reader = RandomSequentialReader(10, read_func, max_per_read=10)
+    assert wrap(reader, paged=True) is reader
+    reader = RandomSequentialReader(20, read_func, max_per_read=10)
+    reader.read(0)
+    assert wrap(reader, paged=True) is reader
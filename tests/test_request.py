@@ -0,0 +1,50 @@
+from http.client import HTTPMessage
+from unittest.mock import patch, MagicMock
+
+import requests
+from requests.exceptions import Timeout
+
+from feeluown.utils.request import Request
+
+
+def test_request_reuse_session_per_host():
+    request = Request()
+    with patch('requests.Session.request', return_value=MagicMock()) as mock_request:
+        request.get('https://a.com/1.jpg')
+        request.get('https://a.com/2.jpg', timeout=3)
+        request.get('https://b.com/1.jpg')
+    assert mock_request.call_count == 3
+    assert mock_request.call_args_list[1].kwargs['timeout'] == 3
+    assert len(request._sessions) == 2
+    assert request.stats['https://a.com'].count == 2
+
+
+def test_request_timeout():
+    request = Request()
+    slow = MagicMock()
+    request.slow_signal.connect(slow, weak=False)
+    with patch('requests.Session.request', side_effect=Timeout):
+        assert request.get('https://a.com/1.jpg') is None
+    assert slow.called
+    assert request.stats['https://a.com'].failed_count == 1
+
+
+def test_request_session_does_not_keep_cookies():
+    def send(_, prepared_request, **__):
+        msg = HTTPMessage()
+        msg['Set-Cookie'] = 'token=1; Path=/'
+        res = requests.Response()
+        res.status_code = 200
+        res.url = prepared_request.url
+        res.request = prepared_request
+        res.raw = MagicMock()
+        res.raw._original_response.msg = msg
+        return res
+
+    request = Request()
+    with patch('requests.adapters.HTTPAdapter.send', send):
+        assert request.get('https://a.com/1.jpg') is not None
+    assert not request._sessions['https://a.com'].cookies
+
+    request.close()
+    assert not request._sessions